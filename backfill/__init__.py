@@ -0,0 +1,2 @@
+from .framework import BackfillTask, run_backfill
+from .tasks import TASKS
@@ -0,0 +1,32 @@
+"""
+Resumable TMDB backfills.
+
+    python -m backfill series_cast
+    python -m backfill series_crew --where "first_air_date >= '2020-01-01'"
+    python -m backfill movie_taglines --limit 500
+    python -m backfill movie_taglines --reset      # forget checkpoints, start over
+"""
+
+import argparse
+
+from backfill import TASKS, run_backfill
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a resumable TMDB backfill.")
+    parser.add_argument("task", choices=sorted(TASKS))
+    parser.add_argument(
+        "--where",
+        help="SQL predicate over the task's table (default: the task's own predicate)",
+    )
+    parser.add_argument("--limit", type=int, help="process at most N targets")
+    parser.add_argument(
+        "--reset", action="store_true", help="clear this task's checkpoints first"
+    )
+    args = parser.parse_args()
+
+    run_backfill(TASKS[args.task], where=args.where, limit=args.limit, reset=args.reset)
+
+
+if __name__ == "__main__":
+    main()
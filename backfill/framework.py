@@ -0,0 +1,190 @@
+# backfill/framework.py
+
+import time
+
+from psycopg2 import sql
+
+from db.connection import get_connection, release_connection
+from services.stats import refresh_stats_snapshot
+from tmdb.client import map_concurrent
+from uploader import dimension_cache
+
+
+class BackfillTask:
+    """
+    A unit of backfill work. Subclasses describe which rows to visit and how
+    to refresh one of them:
+
+    - fetch() runs on the shared TMDB executor and must not touch the DB.
+    - apply() runs on the main thread inside a transaction that also records
+      the checkpoint, so a row is either fully applied and checkpointed or not.
+    """
+
+    name = None
+    table = None
+    id_column = None
+    label_column = None
+    default_where = "TRUE"
+
+    def fetch(self, target_id):
+        raise NotImplementedError
+
+    def apply(self, cur, target_id, label, payload):
+        raise NotImplementedError
+
+    def before_run(self, conn):
+        pass
+
+    def after_run(self, conn):
+        pass
+
+
+class ProgressReporter:
+    def __init__(self, task_name, total, every_seconds=10, every_items=50):
+        self.task_name = task_name
+        self.total = total
+        self.every_seconds = every_seconds
+        self.every_items = every_items
+        self.started = time.monotonic()
+        self.last_report = self.started
+        self.ok = 0
+        self.failed = 0
+
+    @property
+    def processed(self):
+        return self.ok + self.failed
+
+    def record(self, success):
+        if success:
+            self.ok += 1
+        else:
+            self.failed += 1
+
+        now = time.monotonic()
+        if (
+            self.processed % self.every_items == 0
+            or now - self.last_report >= self.every_seconds
+            or self.processed == self.total
+        ):
+            self.last_report = now
+            print(self.summary())
+
+    def summary(self):
+        elapsed = max(time.monotonic() - self.started, 1e-6)
+        rate = self.processed / elapsed
+        remaining = self.total - self.processed
+        eta = f"{int(remaining / rate)}s" if rate and remaining else "0s"
+        pct = 100.0 * self.processed / self.total if self.total else 100.0
+        return (
+            f"📈 [{self.task_name}] {self.processed}/{self.total} ({pct:.1f}%) · "
+            f"{rate:.1f}/s · ok {self.ok} · failed {self.failed} · ETA {eta}"
+        )
+
+
+def select_targets(conn, task, where=None, limit=None):
+    """
+    Returns [(id, label)] matching the task's predicate that have not been
+    checkpointed as done yet.
+    """
+    query = sql.SQL(
+        """
+        SELECT t.{id_col}, t.{label_col}
+        FROM {table} t
+        WHERE ({where})
+          AND NOT EXISTS (
+              SELECT 1 FROM backfill_checkpoints c
+              WHERE c.task = %s AND c.target_id = t.{id_col} AND c.status = 'done'
+          )
+        ORDER BY t.{id_col}
+        """
+    ).format(
+        id_col=sql.Identifier(task.id_column),
+        label_col=sql.Identifier(task.label_column),
+        table=sql.Identifier(task.table),
+        where=sql.SQL(where or task.default_where),
+    )
+    params = [task.name]
+    if limit:
+        query += sql.SQL(" LIMIT %s")
+        params.append(limit)
+
+    with conn.cursor() as cur:
+        cur.execute(query, params)
+        return cur.fetchall()
+
+
+def record_checkpoint(cur, task_name, target_id, status, error=None):
+    cur.execute(
+        """
+        INSERT INTO backfill_checkpoints (task, target_id, status, last_error)
+        VALUES (%s, %s, %s, %s)
+        ON CONFLICT (task, target_id) DO UPDATE
+        SET status = EXCLUDED.status,
+            attempts = backfill_checkpoints.attempts + 1,
+            last_error = EXCLUDED.last_error,
+            updated_at = NOW();
+        """,
+        (task_name, target_id, status, error),
+    )
+
+
+def reset_checkpoints(conn, task_name):
+    with conn.cursor() as cur:
+        cur.execute("DELETE FROM backfill_checkpoints WHERE task = %s;", (task_name,))
+        count = cur.rowcount
+    conn.commit()
+    return count
+
+
+def run_backfill(task, where=None, limit=None, reset=False):
+    """
+    Runs a backfill task: TMDB fetches happen concurrently on the shared
+    client, writes are applied one row per transaction on a pooled
+    connection, and each row is checkpointed so reruns skip finished IDs.
+    """
+    conn = get_connection()
+
+    try:
+        if reset:
+            print(f"🧹 Cleared {reset_checkpoints(conn, task.name)} checkpoint(s) for {task.name}")
+
+        task.before_run(conn)
+
+        targets = select_targets(conn, task, where, limit)
+        labels = dict(targets)
+        print(f"🚀 [{task.name}] {len(targets)} target(s) to process")
+
+        progress = ProgressReporter(task.name, len(targets))
+
+        for target_id, payload, error in map_concurrent(
+            task.fetch, (target_id for target_id, _ in targets)
+        ):
+            label = labels.get(target_id)
+
+            if error is None:
+                try:
+                    with conn.cursor() as cur:
+                        task.apply(cur, target_id, label, payload)
+                        record_checkpoint(cur, task.name, target_id, "done")
+                    conn.commit()
+                    dimension_cache.confirm(conn)
+                except Exception as e:
+                    conn.rollback()
+                    dimension_cache.discard(conn)
+                    error = e
+
+            if error is not None:
+                print(f"❌ [{task.name}] {label} (ID={target_id}): {error}")
+                with conn.cursor() as cur:
+                    record_checkpoint(cur, task.name, target_id, "failed", str(error))
+                conn.commit()
+
+            progress.record(error is None)
+
+        print(f"✅ {progress.summary()}")
+        print(f"🗃️ Dimension cache: {dimension_cache.cache_stats()}")
+        task.after_run(conn)
+        refresh_stats_snapshot(conn)
+
+    finally:
+        release_connection(conn)
@@ -0,0 +1,165 @@
+# backfill/tasks.py
+
+from backfill.framework import BackfillTask
+from tmdb.client import tmdb_get
+from uploader import dimension_cache
+from uploader.tv_uploader import ensure_person_exists
+
+
+class SeriesCastTask(BackfillTask):
+    """Refreshes series_cast from TMDb aggregate credits (with episode counts)."""
+
+    name = "series_cast"
+    table = "series"
+    id_column = "series_id"
+    label_column = "series_name"
+
+    def fetch(self, series_id):
+        return tmdb_get(f"/tv/{series_id}/aggregate_credits")
+
+    def apply(self, cur, series_id, series_name, credits):
+        cast_list = credits.get("cast", [])
+        dimension_cache.prefetch(cur, "people", [c.get("id") for c in cast_list])
+
+        for cast in cast_list:
+            ensure_person_exists(cur, cast)
+
+            character_name = None
+            if cast.get("roles"):
+                character_name = cast["roles"][0].get("character")
+
+            cur.execute(
+                """
+                INSERT INTO series_cast (
+                    series_id, person_id, cast_order, character_name, episode_count, last_updated
+                )
+                VALUES (%s, %s, %s, %s, %s, CURRENT_TIMESTAMP)
+                ON CONFLICT (series_id, person_id) DO UPDATE
+                SET episode_count = EXCLUDED.episode_count,
+                    character_name = COALESCE(EXCLUDED.character_name, series_cast.character_name),
+                    last_updated = CURRENT_TIMESTAMP;
+                """,
+                (
+                    series_id,
+                    cast["id"],
+                    cast.get("order", 0),
+                    character_name,
+                    cast.get("total_episode_count", 1),
+                ),
+            )
+
+
+class SeriesCrewTask(BackfillTask):
+    """Refreshes series_crew with one row per job from TMDb aggregate credits."""
+
+    name = "series_crew"
+    table = "series"
+    id_column = "series_id"
+    label_column = "series_name"
+
+    def before_run(self, conn):
+        """Remove 'Unknown' jobs where a valid job exists for the same person/series."""
+        with conn.cursor() as cur:
+            cur.execute("""
+                DELETE FROM series_crew sc_unknown
+                USING series_crew sc_real
+                WHERE sc_unknown.series_id = sc_real.series_id
+                  AND sc_unknown.person_id = sc_real.person_id
+                  AND sc_unknown.job = 'Unknown'
+                  AND sc_real.job <> 'Unknown';
+            """)
+        conn.commit()
+        print("🧹 Cleaned up duplicate 'Unknown' crew rows.")
+
+    def fetch(self, series_id):
+        return tmdb_get(f"/tv/{series_id}/aggregate_credits")
+
+    def apply(self, cur, series_id, series_name, credits):
+        crew_list = credits.get("crew", [])
+        dimension_cache.prefetch(cur, "people", [c.get("id") for c in crew_list])
+
+        for crew in crew_list:
+            ensure_person_exists(cur, crew)
+
+            department = crew.get("department")
+            jobs = [j.get("job") for j in crew.get("jobs", []) if j.get("job")]
+            if not jobs:
+                jobs = ["Unknown"]
+
+            for job in jobs:
+                cur.execute(
+                    """
+                    INSERT INTO series_crew (
+                        series_id, person_id, department, job, last_updated
+                    )
+                    VALUES (%s, %s, %s, %s, CURRENT_TIMESTAMP)
+                    ON CONFLICT (series_id, person_id, job) DO UPDATE
+                    SET department = COALESCE(EXCLUDED.department, series_crew.department),
+                        last_updated = CURRENT_TIMESTAMP;
+                    """,
+                    (series_id, crew["id"], department, job),
+                )
+
+    def after_run(self, conn):
+        """Print a summary of crew roles across all series."""
+        with conn.cursor() as cur:
+            cur.execute("""
+                SELECT job, COUNT(*) AS crew_count
+                FROM series_crew
+                GROUP BY job
+                ORDER BY crew_count DESC
+                LIMIT 20;
+            """)
+            rows = cur.fetchall()
+
+        print("\n📊 Crew role summary (top 20 jobs):")
+        for job, count in rows:
+            print(f"  {job}: {count}")
+
+
+class MovieTaglineTask(BackfillTask):
+    """Fills movies.tagline from TMDb movie details."""
+
+    name = "movie_taglines"
+    table = "movies"
+    id_column = "movie_id"
+    label_column = "movie_title"
+    default_where = "tagline IS NULL OR tagline = ''"
+
+    def fetch(self, movie_id):
+        return tmdb_get(f"/movie/{movie_id}")
+
+    def apply(self, cur, movie_id, movie_title, details):
+        tagline = (details.get("tagline") or "").strip()
+        if not tagline:
+            return
+
+        cur.execute(
+            """
+            UPDATE movies
+            SET tagline = %s,
+                last_updated = CURRENT_TIMESTAMP
+            WHERE movie_id = %s;
+            """,
+            (tagline, movie_id),
+        )
+
+    def after_run(self, conn):
+        """Print a summary of movies with and without taglines."""
+        with conn.cursor() as cur:
+            cur.execute("""
+                SELECT COUNT(*) FILTER (WHERE tagline IS NOT NULL AND tagline <> '') AS with_tagline,
+                       COUNT(*) FILTER (WHERE tagline IS NULL OR tagline = '') AS without_tagline
+                FROM movies;
+            """)
+            with_tagline, without_tagline = cur.fetchone()
+
+        print("\n📊 Movie tagline summary:")
+        print(f"  With tagline: {with_tagline}")
+        print(f"  Without tagline: {without_tagline}")
+
+
+TASKS = {
+    task.name: task
+    for task in (SeriesCastTask(), SeriesCrewTask(), MovieTaglineTask())
+}
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Measures whether concurrent requests to the web UI overlap or serialize.
+
+Sends the same request once per worker back-to-back (serial), then all at
+once (concurrent), and compares wall-clock time. If the server handles
+requests in parallel, the concurrent run takes roughly as long as the
+slowest single request; if something blocks the event loop it takes about
+as long as the serial run.
+
+    uvicorn web_ui.app:app --port 8000
+    python benchmarks/web_concurrency.py --path /title/tv/1399 -c 20
+"""
+
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+
+def timed_get(session, url):
+    started = time.perf_counter()
+    response = session.get(url, timeout=120)
+    elapsed = time.perf_counter() - started
+    return elapsed, response.status_code, response.headers.get("Server-Timing")
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(label, wall, latencies):
+    print(
+        f"{label:<11} wall {wall * 1000:8.1f} ms · "
+        f"p50 {percentile(latencies, 50) * 1000:7.1f} ms · "
+        f"p95 {percentile(latencies, 95) * 1000:7.1f} ms · "
+        f"max {max(latencies) * 1000:7.1f} ms"
+    )
+
+
+def run(base_url, path, concurrency, rounds):
+    url = base_url.rstrip("/") + path
+    session = requests.Session()
+
+    # Warm up connections, templates and caches so the first sample is fair
+    _, status, timing = timed_get(session, url)
+    print(f"GET {url} → {status} ({timing or 'no Server-Timing'})")
+
+    serial_walls, concurrent_walls = [], []
+    serial_latencies, concurrent_latencies = [], []
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        sessions = [requests.Session() for _ in range(concurrency)]
+
+        for _ in range(rounds):
+            started = time.perf_counter()
+            for s in sessions:
+                serial_latencies.append(timed_get(s, url)[0])
+            serial_walls.append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            results = list(pool.map(lambda s: timed_get(s, url), sessions))
+            concurrent_walls.append(time.perf_counter() - started)
+            concurrent_latencies.extend(r[0] for r in results)
+
+            errors = [r[1] for r in results if r[1] >= 500]
+            if errors:
+                print(f"⚠️ {len(errors)} request(s) failed with {errors[0]}")
+
+    serial_wall = statistics.median(serial_walls)
+    concurrent_wall = statistics.median(concurrent_walls)
+
+    print(f"\n{concurrency} requests × {rounds} round(s)")
+    summarize("serial", serial_wall, serial_latencies)
+    summarize("concurrent", concurrent_wall, concurrent_latencies)
+
+    speedup = serial_wall / concurrent_wall if concurrent_wall else float("inf")
+    print(f"\n📈 Speedup {speedup:.1f}× (≈{concurrency}× means fully parallel, ≈1× means serialized)")
+    return speedup
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="server base URL")
+    parser.add_argument("--path", default="/", help="path to request")
+    parser.add_argument("-c", "--concurrency", type=int, default=10)
+    parser.add_argument("-r", "--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    run(args.url, args.path, args.concurrency, args.rounds)
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Rebuilds the precomputed related titles read by the title pages
+(see services/related.py and queries/schema/title_neighbours.sql).
+
+    python build_related.py              # titles changed since the last run
+    python build_related.py --full       # every title
+    python build_related.py --type tv --method content
+"""
+
+import argparse
+
+from db.connection import get_connection, release_connection
+from services.related import MODELS, build_related
+
+
+def main(media_types, methods, full=False):
+    conn = get_connection()
+    try:
+        for method in methods:
+            for media_type in media_types:
+                scored = build_related(conn, media_type, method=method, full=full)
+                if scored is None:
+                    print("⏳ Another related-titles build is running; skipping.")
+                    return
+    finally:
+        release_connection(conn)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precompute related titles.")
+    parser.add_argument(
+        "--type", choices=("movie", "tv"), help="only rebuild movies or series"
+    )
+    parser.add_argument(
+        "--method",
+        choices=tuple(MODELS),
+        help="only rebuild one method (credits = shared people/genres, content = overviews)",
+    )
+    parser.add_argument(
+        "--full", action="store_true", help="rescore every title, not just changed ones"
+    )
+    args = parser.parse_args()
+    main(
+        [args.type] if args.type else ["movie", "tv"],
+        [args.method] if args.method else list(MODELS),
+        full=args.full,
+    )
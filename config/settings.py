@@ -26,3 +26,104 @@ DB_CONFIG = {
     "port": int(os.getenv("DB_PORT", 5432)),
 }
 DB_OPTIONS = os.getenv("DB_OPTIONS", "")
+
+# Connection pool
+DB_POOL_MINCONN = int(os.getenv("DB_POOL_MINCONN", 1))
+DB_POOL_MAXCONN = int(os.getenv("DB_POOL_MAXCONN", 10))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))
+DB_HEALTH_CHECK_INTERVAL = float(os.getenv("DB_HEALTH_CHECK_INTERVAL", 30))
+# The web tier's async (psycopg 3) pool is separate and comes on top of
+# DB_POOL_MAXCONN, so it gets a small budget of its own
+DB_ASYNC_POOL_MAXCONN = int(os.getenv("DB_ASYNC_POOL_MAXCONN", 4))
+
+# Web tier: threads available to sync routes and other blocking work. Sync
+# routes hold a pooled connection, so by default there are no more threads
+# than connections; extra threads would only wait in getconn and time out.
+WEB_THREADPOOL_SIZE = int(os.getenv("WEB_THREADPOOL_SIZE", DB_POOL_MAXCONN))
+
+# Sync job queue
+SYNC_MAX_ATTEMPTS = int(os.getenv("SYNC_MAX_ATTEMPTS", 5))
+SYNC_RETRY_BASE_SECONDS = int(os.getenv("SYNC_RETRY_BASE_SECONDS", 30))
+SYNC_RETRY_MAX_SECONDS = int(os.getenv("SYNC_RETRY_MAX_SECONDS", 3600))
+SYNC_JOB_LEASE_SECONDS = int(os.getenv("SYNC_JOB_LEASE_SECONDS", 900))
+SYNC_POLL_SECONDS = float(os.getenv("SYNC_POLL_SECONDS", 2))
+# How often a /jobs/{batch_id}/events stream checks its batch for progress
+SYNC_PROGRESS_POLL_SECONDS = float(os.getenv("SYNC_PROGRESS_POLL_SECONDS", 1))
+
+# Shared TMDB client
+TMDB_TIMEOUT = float(os.getenv("TMDB_TIMEOUT", 10))
+TMDB_MAX_WORKERS = int(os.getenv("TMDB_MAX_WORKERS", 8))
+
+# Release crawls: discover pages walked per month, certification country and
+# how long title details are reused between crawls (seconds)
+RELEASE_DISCOVER_MAX_PAGES = int(os.getenv("RELEASE_DISCOVER_MAX_PAGES", 20))
+RELEASE_REGION = os.getenv("RELEASE_REGION", "GB")
+RELEASE_DETAIL_CACHE_TTL = float(os.getenv("RELEASE_DETAIL_CACHE_TTL", 86400))
+
+# How long TMDb person details and credits are reused by person search (seconds)
+PERSON_DETAIL_CACHE_TTL = float(os.getenv("PERSON_DETAIL_CACHE_TTL", 21600))
+
+# In-process cache of known dimension keys (people, genres, ...), per dimension
+DIMENSION_CACHE_SIZE = int(os.getenv("DIMENSION_CACHE_SIZE", 50000))
+
+# Assembled title pages, keyed by (type, id) and validated against last_updated
+TITLE_PAGE_CACHE_SIZE = int(os.getenv("TITLE_PAGE_CACHE_SIZE", 2000))
+TITLE_PAGE_CACHE_TTL = float(os.getenv("TITLE_PAGE_CACHE_TTL", 600))
+
+# NewsData.io key for the news feed; that source is skipped without it
+NEWSDATA_API_KEY = os.getenv("NEWSDATA_API_KEY")
+
+# News feeds (services/news_fetcher.py): sources fetched longer than MAX_AGE
+# seconds ago are polled again by the web app's background task, which checks
+# every INTERVAL seconds. TIMEOUT caps each source's request (seconds) and
+# RETENTION_DAYS how long stored articles are kept. Set NEWS_REFRESH=0 to
+# run it elsewhere.
+NEWS_REFRESH = os.getenv("NEWS_REFRESH", "1") == "1"
+NEWS_MAX_AGE = int(os.getenv("NEWS_MAX_AGE", 900))
+NEWS_INTERVAL = float(os.getenv("NEWS_INTERVAL", 300))
+NEWS_FETCH_TIMEOUT = float(os.getenv("NEWS_FETCH_TIMEOUT", 10))
+NEWS_RETENTION_DAYS = int(os.getenv("NEWS_RETENTION_DAYS", 30))
+
+# Home-page release calendar: stored months older than MAX_AGE seconds are
+# re-fetched from TMDb by the web app's background task, which checks every
+# INTERVAL seconds. Set RELEASE_CALENDAR_REFRESH=0 to run it elsewhere.
+RELEASE_CALENDAR_REFRESH = os.getenv("RELEASE_CALENDAR_REFRESH", "1") == "1"
+RELEASE_CALENDAR_MAX_AGE = int(os.getenv("RELEASE_CALENDAR_MAX_AGE", 6 * 3600))
+RELEASE_CALENDAR_INTERVAL = float(os.getenv("RELEASE_CALENDAR_INTERVAL", 300))
+
+# Dashboard stats are served from a snapshot; it is recomputed once it is
+# older than STATS_MAX_AGE seconds, and after sync/backfill runs
+STATS_MAX_AGE = int(os.getenv("STATS_MAX_AGE", 300))
+STATS_REFRESH = os.getenv("STATS_REFRESH", "1") == "1"
+
+# Dashboard counters (queries/schema/dashboard_counters.sql): freshness
+# bucket edges in hours, how often pending deltas are folded in, and how
+# often the counters are recomputed from scratch to catch drift (seconds)
+DASHBOARD_FRESH_HOURS = int(os.getenv("DASHBOARD_FRESH_HOURS", 24))
+DASHBOARD_STALE_HOURS = int(os.getenv("DASHBOARD_STALE_HOURS", 24 * 7))
+DASHBOARD_COMPACT_INTERVAL = float(os.getenv("DASHBOARD_COMPACT_INTERVAL", 60))
+DASHBOARD_RECONCILE_INTERVAL = float(os.getenv("DASHBOARD_RECONCILE_INTERVAL", 86400))
+
+# Freshness buckets for /freshness and the result badges, as name:hours
+# pairs, newest first: a title belongs to the first bucket whose age limit
+# it is under, else "old" ("never" if it has no last_updated). Defaults to
+# the dashboard edges so every page agrees.
+FRESHNESS_BUCKETS = os.getenv(
+    "FRESHNESS_BUCKETS",
+    f"fresh:{DASHBOARD_FRESH_HOURS},stale:{DASHBOARD_STALE_HOURS}",
+)
+
+# Titles per page on the /missing/<field> and /missing_tv/<field> lists
+MISSING_PAGE_SIZE = int(os.getenv("MISSING_PAGE_SIZE", 100))
+
+# In-memory title index behind /api/suggest. Changes received over
+# LISTEN/NOTIFY are overlaid until there are more than REBUILD_THRESHOLD,
+# then the index is rebuilt from the database.
+TITLE_INDEX_ENABLED = os.getenv("TITLE_INDEX_ENABLED", "1") == "1"
+TITLE_INDEX_REBUILD_THRESHOLD = int(os.getenv("TITLE_INDEX_REBUILD_THRESHOLD", 2000))
+
+# Precomputed related titles (build_related.py): neighbours kept per title
+RELATED_TOP_K = int(os.getenv("RELATED_TOP_K", 20))
+
+# Rendered template fragments ({% cache %} blocks), LRU by total size; 0 disables
+FRAGMENT_CACHE_MAX_BYTES = int(os.getenv("FRAGMENT_CACHE_MAX_BYTES", 32 * 1024 * 1024))
@@ -0,0 +1,88 @@
+# db/aio.py
+"""
+Async counterpart of db.connection / db.helpers for the web tier, backed by
+psycopg 3. It uses the same %s placeholders, so services share their SQL
+between the sync and async versions.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+from psycopg.conninfo import make_conninfo
+from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool
+
+from config.settings import (
+    DB_ASYNC_POOL_MAXCONN,
+    DB_CONFIG,
+    DB_POOL_MINCONN,
+    DB_POOL_TIMEOUT,
+)
+
+_pool = None
+_pool_lock = asyncio.Lock()
+
+
+async def get_async_pool():
+    """Returns the async pool, opening it on first use."""
+    global _pool
+    if _pool is not None:
+        return _pool
+
+    async with _pool_lock:
+        if _pool is None:
+            conninfo = make_conninfo(
+                **{k: v for k, v in DB_CONFIG.items() if v not in (None, "")}
+            )
+            pool = AsyncConnectionPool(
+                conninfo,
+                min_size=min(DB_POOL_MINCONN, DB_ASYNC_POOL_MAXCONN),
+                max_size=DB_ASYNC_POOL_MAXCONN,
+                timeout=DB_POOL_TIMEOUT,
+                # Prepared statements stay off, as with the sync cursors
+                kwargs={"prepare_threshold": None},
+                open=False,
+            )
+            await pool.open()
+            _pool = pool
+    return _pool
+
+
+async def close_async_pool():
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
+
+
+def async_pool_stats():
+    return _pool.get_stats() if _pool is not None else None
+
+
+@asynccontextmanager
+async def connection():
+    pool = await get_async_pool()
+    async with pool.connection() as conn:
+        yield conn
+
+
+@asynccontextmanager
+async def dict_cursor(conn=None):
+    """
+    Async twin of db.helpers.dict_cursor: yields a cursor returning dicts and
+    commits on success. Without `conn` a pooled connection is used for the
+    block, so concurrent callers each get their own.
+    """
+    if conn is None:
+        async with connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cursor:
+                yield cursor
+        return
+
+    try:
+        async with conn.cursor(row_factory=dict_row) as cursor:
+            yield cursor
+        await conn.commit()
+    except Exception:
+        await conn.rollback()
+        raise
@@ -1,30 +1,262 @@
+import os
+import threading
+import time
+
 import psycopg2
+import psycopg2.extensions
 import psycopg2.extras
-from psycopg2.pool import SimpleConnectionPool
-from config.settings import DB_CONFIG
+from psycopg2.pool import PoolError
+from config.settings import (
+    DB_CONFIG,
+    DB_HEALTH_CHECK_INTERVAL,
+    DB_POOL_MAXCONN,
+    DB_POOL_MINCONN,
+    DB_POOL_TIMEOUT,
+)
 
-pool = SimpleConnectionPool(minconn=1, maxconn=10, **DB_CONFIG)
 
+class ConnectionPool:
+    """
+    Thread-safe pool of psycopg2 connections.
 
-def get_connection():
-    conn = pool.getconn()
-    try:
-        with conn.cursor() as cur:
-            cur.execute("SELECT 1;")
+    Connections are opened on demand up to maxconn; callers beyond that wait
+    (up to `timeout` seconds) for one to be returned. A connection is only
+    pinged with SELECT 1 when it has sat idle longer than the health-check
+    interval, so busy connections cost no extra round trips.
+    """
+
+    def __init__(
+        self,
+        minconn=DB_POOL_MINCONN,
+        maxconn=DB_POOL_MAXCONN,
+        timeout=DB_POOL_TIMEOUT,
+        health_check_interval=DB_HEALTH_CHECK_INTERVAL,
+        **connect_kwargs,
+    ):
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self.connect_kwargs = connect_kwargs
+        self.pid = os.getpid()
+
+        self._cond = threading.Condition()
+        self._idle = []  # [(conn, last_used)] — most recently used last
+        self._in_use = {}  # id(conn) → conn
+        self._opening = 0
+        self._closed = False
+
+        self.checkouts = 0
+        self.waits = 0
+        self.wait_time = 0.0
+        self.max_wait_time = 0.0
+        self.checkout_time = 0.0
+        self.health_checks = 0
+        self.opened = 0
+        self.discarded = 0
+
+    # ── internals ──────────────────────────────────────────────────────────
+    def _size(self):
+        return len(self._idle) + len(self._in_use) + self._opening
+
+    def _connect(self):
+        conn = psycopg2.connect(**self.connect_kwargs)
+        self.opened += 1
         return conn
-    except Exception:
-        # Bad connection → close and replace with a new pooled one
-        pool.putconn(conn, close=True)
-        return pool.getconn()
+
+    def _close_quietly(self, conn):
+        self.discarded += 1
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _healthy(self, conn, last_used):
+        if conn.closed:
+            return False
+        if time.monotonic() - last_used < self.health_check_interval:
+            return True
+        self.health_checks += 1
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1;")
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    # ── public API ─────────────────────────────────────────────────────────
+    def getconn(self, timeout=None):
+        timeout = self.timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+        waited = False
+
+        while True:
+            with self._cond:
+                if self._closed:
+                    raise PoolError("connection pool is closed")
+
+                while not self._idle and self._size() >= self.maxconn:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise PoolError(
+                            f"no connection available within {timeout:.1f}s "
+                            f"({len(self._in_use)} in use)"
+                        )
+                    waited = True
+                    self._cond.wait(remaining)
+
+                if self._idle:
+                    conn, last_used = self._idle.pop()
+                else:
+                    conn, last_used = None, None
+                    self._opening += 1
+
+            if conn is None:
+                try:
+                    conn = self._connect()
+                finally:
+                    with self._cond:
+                        self._opening -= 1
+                        self._cond.notify()
+            elif not self._healthy(conn, last_used):
+                # Stale connection → drop it and go round again for another one
+                self._close_quietly(conn)
+                with self._cond:
+                    self._cond.notify()
+                continue
+
+            elapsed = time.monotonic() - started
+            with self._cond:
+                self._in_use[id(conn)] = conn
+                self.checkouts += 1
+                self.checkout_time += elapsed
+                if waited:
+                    self.waits += 1
+                    self.wait_time += elapsed
+                    self.max_wait_time = max(self.max_wait_time, elapsed)
+            return conn
+
+    def putconn(self, conn, close=False):
+        with self._cond:
+            owned = self._in_use.pop(id(conn), None) is not None
+
+        if not owned:
+            # Not ours (e.g. opened directly) — nothing to return it to
+            if not conn.closed:
+                conn.close()
+            return
+
+        if not close and not conn.closed:
+            # Never hand the next caller a connection mid-transaction
+            status = conn.get_transaction_status()
+            if status == psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN:
+                close = True
+            elif status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                try:
+                    conn.rollback()
+                except Exception:
+                    close = True
+
+        with self._cond:
+            if close or conn.closed or self._closed or len(self._idle) >= self.maxconn:
+                self._close_quietly(conn)
+            else:
+                self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    def closeall(self):
+        with self._cond:
+            self._closed = True
+            for conn, _ in self._idle:
+                self._close_quietly(conn)
+            for conn in self._in_use.values():
+                self._close_quietly(conn)
+            self._idle.clear()
+            self._in_use.clear()
+            self._cond.notify_all()
+
+    def stats(self):
+        with self._cond:
+            return {
+                "pid": self.pid,
+                "in_use": len(self._in_use),
+                "idle": len(self._idle),
+                "size": self._size(),
+                "maxconn": self.maxconn,
+                "checkouts": self.checkouts,
+                "waits": self.waits,
+                "wait_time_ms": round(self.wait_time * 1000, 1),
+                "max_wait_ms": round(self.max_wait_time * 1000, 1),
+                "avg_checkout_ms": round(self.checkout_time * 1000 / self.checkouts, 3)
+                if self.checkouts
+                else None,
+                "health_checks": self.health_checks,
+                "opened": self.opened,
+                "discarded": self.discarded,
+            }
+
+
+_pool = None
+_pool_lock = threading.Lock()
+# Connections inherited across fork() belong to the parent's sessions.
+# Closing them from the child would terminate those sessions, so they are
+# parked here and simply never used again.
+_inherited = []
+
+
+def get_pool():
+    """
+    Returns this process's pool, creating it on first use. After a fork the
+    child gets a fresh pool instead of sharing the parent's sockets.
+    """
+    global _pool
+    pool = _pool
+    if pool is not None and pool.pid == os.getpid():
+        return pool
+
+    with _pool_lock:
+        if _pool is not None and _pool.pid != os.getpid():
+            _inherited.append(_pool)
+            _pool = None
+        if _pool is None:
+            _pool = ConnectionPool(**DB_CONFIG)
+            for conn in [_pool.getconn() for _ in range(_pool.minconn)]:
+                _pool.putconn(conn)
+        return _pool
+
+
+def close_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None and _pool.pid == os.getpid():
+            _pool.closeall()
+        _pool = None
+
+
+def pool_stats():
+    return get_pool().stats() if _pool is not None else None
+
+
+def get_connection():
+    return get_pool().getconn()
 
 
 def release_connection(conn):
-    try:
-        with conn.cursor() as cur:
-            cur.execute("SELECT 1;")
-        pool.putconn(conn)
-    except Exception:
-        pool.putconn(conn, close=True)
+    if any(id(conn) in pool._in_use for pool in _inherited):
+        return
+    get_pool().putconn(conn)
+
+
+def open_dedicated_connection(autocommit=True):
+    """
+    A connection outside the pool, for long-lived sessions such as LISTEN
+    that would otherwise hold a pooled connection forever. Close it yourself.
+    """
+    conn = psycopg2.connect(**DB_CONFIG)
+    conn.autocommit = autocommit
+    return conn
 
 
 def get_dict_cursor(conn):
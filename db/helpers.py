@@ -3,8 +3,15 @@ import psycopg2.extras
 from db.connection import get_connection, release_connection
 
 @contextmanager
-def dict_cursor():
-    conn = get_connection()
+def dict_cursor(conn=None):
+    """
+    Yields a RealDictCursor and commits on success. Pass `conn` (a connection
+    or DBSession) to run on it; otherwise a pooled connection is checked out
+    and released around the block.
+    """
+    owned = conn is None
+    if owned:
+        conn = get_connection()
     cursor = None
     try:
         cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
@@ -20,5 +27,5 @@ def dict_cursor():
                 cursor.close()
             except Exception:
                 pass
-        release_connection(conn)
-
+        if owned:
+            release_connection(conn)
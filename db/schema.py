@@ -0,0 +1,51 @@
+from pathlib import Path
+from db.helpers import dict_cursor
+
+SCHEMA_DIR = Path(__file__).parent.parent / "queries" / "schema"
+
+# Every file under queries/schema, in the order migrate.py applies them.
+# missing_fields must come before dashboard_counters (its triggers read
+# missing_mask); the rest are independent of each other.
+MIGRATIONS = (
+    "sync_jobs",
+    "backfill",
+    "season_map",
+    "release_calendar",
+    "stats_snapshot",
+    "missing_fields",
+    "dashboard_counters",
+    "title_search",
+    "person_search",
+    "title_index",
+    "title_neighbours",
+    "page_versions",
+    "api_keysets",
+    "news",
+)
+
+# CREATE OR REPLACE TRIGGER (dashboard_counters, title_index)
+MIN_SERVER_VERSION = 140000
+
+
+def apply_schema(name: str):
+    """
+    Runs queries/schema/<name>.sql against the database in one transaction.
+    Schema files only contain idempotent DDL (IF NOT EXISTS / OR REPLACE),
+    so re-running one is harmless, but several take table locks (ALTER
+    TABLE, CREATE INDEX, CREATE OR REPLACE TRIGGER): apply them from
+    migrate.py at deploy time, never from a process that is serving traffic.
+    """
+    ddl = (SCHEMA_DIR / f"{name}.sql").read_text()
+    with dict_cursor() as cursor:
+        cursor.execute(ddl)
+
+
+def check_server_version():
+    """Raises RuntimeError on servers older than PostgreSQL 14."""
+    with dict_cursor() as cursor:
+        cursor.execute("SHOW server_version_num")
+        version = int(cursor.fetchone()["server_version_num"])
+    if version < MIN_SERVER_VERSION:
+        raise RuntimeError(
+            f"PostgreSQL 14 or newer is required (server reports {version})"
+        )
@@ -0,0 +1,96 @@
+# db/session.py
+
+import threading
+import time
+
+from db.connection import get_connection, release_connection
+
+
+class TimedCursor:
+    """
+    Thin wrapper around a psycopg2 cursor that charges every execute() to
+    the owning DBSession. Everything else is passed straight through.
+    """
+
+    def __init__(self, cursor, session):
+        self._cursor = cursor
+        self._session = session
+
+    def execute(self, query, vars=None):
+        started = time.perf_counter()
+        try:
+            return self._cursor.execute(query, vars)
+        finally:
+            self._session._record(time.perf_counter() - started)
+
+    def executemany(self, query, vars_list):
+        started = time.perf_counter()
+        try:
+            return self._cursor.executemany(query, vars_list)
+        finally:
+            self._session._record(time.perf_counter() - started)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._cursor.close()
+
+
+class DBSession:
+    """
+    One pooled connection for the lifetime of a unit of work (typically a web
+    request). The connection is checked out on first use and always handed
+    back by close(). Quacks like a connection, so it can be passed anywhere
+    a service expects `conn`.
+    """
+
+    def __init__(self):
+        self._conn = None
+        self._lock = threading.Lock()
+        self.query_count = 0
+        self.db_time = 0.0
+
+    @property
+    def connection(self):
+        with self._lock:
+            if self._conn is None:
+                self._conn = get_connection()
+            return self._conn
+
+    def _record(self, elapsed):
+        with self._lock:
+            self.query_count += 1
+            self.db_time += elapsed
+
+    def cursor(self, *args, **kwargs):
+        return TimedCursor(self.connection.cursor(*args, **kwargs), self)
+
+    def commit(self):
+        if self._conn is not None:
+            self._conn.commit()
+
+    def rollback(self):
+        if self._conn is not None:
+            self._conn.rollback()
+
+    def close(self):
+        with self._lock:
+            conn, self._conn = self._conn, None
+        if conn is not None:
+            release_connection(conn)
+
+    def server_timing(self):
+        return f'db;dur={self.db_time * 1000:.1f};desc="{self.query_count} queries"'
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
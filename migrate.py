@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Applies the schema under queries/schema (tables, indexes, triggers and
+functions the app and scripts rely on). Run it on every deploy, before
+starting the web app, sync workers or scripts; none of them change the
+schema themselves.
+
+    python migrate.py                    # everything, in dependency order
+    python migrate.py news title_index   # just these files
+"""
+
+import argparse
+
+from db.schema import MIGRATIONS, apply_schema, check_server_version
+
+
+def main(names):
+    check_server_version()
+    for name in names:
+        print(f"🛠️ Applying {name}.sql")
+        apply_schema(name)
+    print(f"✅ Schema up to date ({len(names)} file(s) applied).")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Apply the database schema.")
+    parser.add_argument(
+        "names", nargs="*", metavar="name",
+        help=f"schema files to apply (default: all of {', '.join(MIGRATIONS)})",
+    )
+    args = parser.parse_args()
+    unknown = [n for n in args.names if n not in MIGRATIONS]
+    if unknown:
+        parser.error(f"unknown schema file(s): {', '.join(unknown)}")
+    main(args.names or list(MIGRATIONS))
@@ -1,18 +1,5 @@
 SELECT json_build_object(
 
-    -- Top fields
-    'top_fields',
-    (
-        SELECT json_agg(row_to_json(t))
-        FROM (
-            SELECT field_name, COUNT(*) AS freq
-            FROM update_logs
-            GROUP BY field_name
-            ORDER BY freq DESC
-            LIMIT 5
-        ) t
-    ),
-
     -- Top rated movies
     'top_rated_movies',
     (
@@ -129,44 +116,6 @@ SELECT json_build_object(
         ) t
     ),
 
-    -- Movies missing fields (correct table: movies)
-    'movies_missing_fields',
-    (
-        SELECT row_to_json(t)
-        FROM (
-            SELECT
-                SUM(CASE WHEN overview IS NULL THEN 1 ELSE 0 END) AS missing_overview,
-                SUM(CASE WHEN release_date IS NULL THEN 1 ELSE 0 END) AS missing_release_date,
-                SUM(CASE WHEN runtime IS NULL THEN 1 ELSE 0 END) AS missing_runtime,
-                SUM(CASE WHEN poster_path IS NULL THEN 1 ELSE 0 END) AS missing_poster_path,
-                SUM(CASE WHEN original_language IS NULL THEN 1 ELSE 0 END) AS missing_original_language,
-                SUM(CASE WHEN status IS NULL THEN 1 ELSE 0 END) AS missing_status,
-                SUM(CASE WHEN imdb_id IS NULL THEN 1 ELSE 0 END) AS missing_imdb,
-                SUM(CASE WHEN budget IS NULL THEN 1 ELSE 0 END) AS missing_budget,
-                SUM(CASE WHEN revenue IS NULL THEN 1 ELSE 0 END) AS missing_revenue,
-                SUM(CASE WHEN tagline IS NULL THEN 1 ELSE 0 END) AS missing_tagline
-            FROM movies
-        ) t
-    ),
-
-    -- Series missing fields
-    'series_missing_fields',
-    (
-        SELECT row_to_json(t)
-        FROM (
-            SELECT
-                SUM(CASE WHEN overview IS NULL THEN 1 ELSE 0 END) AS missing_overview,
-                SUM(CASE WHEN first_air_date IS NULL THEN 1 ELSE 0 END) AS missing_first_air_date,
-                SUM(CASE WHEN poster_path IS NULL THEN 1 ELSE 0 END) AS missing_poster_path,
-                SUM(CASE WHEN original_language IS NULL THEN 1 ELSE 0 END) AS missing_original_language,
-                SUM(CASE WHEN status IS NULL THEN 1 ELSE 0 END) AS missing_status,
-                SUM(CASE WHEN imdb_id IS NULL THEN 1 ELSE 0 END) AS missing_imdb,
-                SUM(CASE WHEN number_of_seasons IS NULL OR number_of_seasons = 0 THEN 1 ELSE 0 END) AS missing_seasons,
-                SUM(CASE WHEN number_of_episodes IS NULL OR number_of_episodes = 0 THEN 1 ELSE 0 END) AS missing_episodes
-            FROM series
-        ) t
-    ),
-
     -- Orphaned logs
     'orphaned_logs',
     (
@@ -175,56 +124,9 @@ SELECT json_build_object(
         LEFT JOIN movies m ON m.movie_id = ul.content_id
         LEFT JOIN series s ON s.series_id = ul.content_id
         WHERE m.movie_id IS NULL AND s.series_id IS NULL
-    ),
-
-    -- Movie count
-    'movie_count',
-    (SELECT COUNT(*) FROM movies),
-
-    -- Series count
-    'series_count',
-    (SELECT COUNT(*) FROM series),
-
-    -- Episode count
-    'episode_count',
-    (SELECT COUNT(*) FROM series_episodes),
-
-    -- Season count
-    'season_count',
-    (SELECT COUNT(*) FROM series_seasons),
-
-    -- Cast and people counts
-    'movie_cast_count',
-    (SELECT COUNT(*) FROM movie_cast),
-    'series_cast_count',
-    (SELECT COUNT(*) FROM series_cast),
-    'people_count',
-    (SELECT COUNT(*) FROM people),
-
-    -- Last update timestamp
-    'last_update',
-    (
-        SELECT MAX("timestamp")::timestamptz
-        FROM update_logs
-    ),
-
-    -- Freshness stats (movies + series)
-    'freshness',
-    (
-        SELECT row_to_json(t)
-        FROM (
-            SELECT
-                SUM(CASE WHEN last_updated >= NOW() - INTERVAL '1 day' THEN 1 ELSE 0 END) AS fresh,
-                SUM(CASE WHEN last_updated < NOW() - INTERVAL '1 day'
-                        AND last_updated >= NOW() - INTERVAL '7 days' THEN 1 ELSE 0 END) AS stale,
-                SUM(CASE WHEN last_updated < NOW() - INTERVAL '7 days' THEN 1 ELSE 0 END) AS old
-            FROM (
-                SELECT last_updated FROM movies
-                UNION ALL
-                SELECT last_updated FROM series
-            ) u
-        ) t
     )
 
+    -- Counts, last update, top fields, freshness and missing-field totals
+    -- are kept incrementally in dashboard_counters (services/dashboard.py)
 
 ) AS stats;
@@ -0,0 +1,22 @@
+-- Indexes behind the keyset-paginated JSON API (services/api.py). Each one
+-- matches an endpoint's ORDER BY, so every page is a single index range
+-- scan however deep the cursor is.
+
+-- /api/titles: oldest change first; titles never synced sort first
+CREATE INDEX IF NOT EXISTS movies_api_keyset_idx
+    ON movies ((COALESCE(last_updated, '-infinity'::timestamp)), movie_id);
+
+CREATE INDEX IF NOT EXISTS series_api_keyset_idx
+    ON series ((COALESCE(last_updated, '-infinity'::timestamp)), series_id);
+
+-- /api/logs, globally and per title (the per-title one also serves
+-- services/logs.py's title page lookups)
+CREATE INDEX IF NOT EXISTS update_logs_keyset_idx
+    ON update_logs ("timestamp", id);
+
+CREATE INDEX IF NOT EXISTS update_logs_content_keyset_idx
+    ON update_logs (content_type, content_id, "timestamp", id);
+
+-- /api/series/{id}/episodes needs nothing new: it walks the season_map.sql
+-- indexes, series_seasons (series_id, season_number) then series_episodes
+-- (season_id, episode_number).
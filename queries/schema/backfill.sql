@@ -0,0 +1,13 @@
+-- backfill.sql
+-- Per-ID progress for `python -m backfill`, so an interrupted run resumes
+-- where it stopped instead of starting from zero.
+
+CREATE TABLE IF NOT EXISTS backfill_checkpoints (
+    task        TEXT NOT NULL,
+    target_id   BIGINT NOT NULL,
+    status      TEXT NOT NULL CHECK (status IN ('done', 'failed')),
+    attempts    INTEGER NOT NULL DEFAULT 1,
+    last_error  TEXT,
+    updated_at  TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (task, target_id)
+);
@@ -0,0 +1,277 @@
+-- dashboard_counters.sql
+-- Dashboard numbers kept up to date incrementally, so reading them costs
+-- the same however many titles we hold.
+--
+-- Statement-level triggers append deltas to dashboard_counter_deltas rather
+-- than updating a shared row, so concurrent syncs never wait on (or deadlock
+-- over) the same counter. services/dashboard.py folds the deltas into
+-- dashboard_counters now and then and sums both when reading.
+--
+-- Metrics:
+--   count          row count per table (key = table name); the update_logs
+--                  row also carries the latest log timestamp in last_at
+--   field_changes  update_logs rows per field_name
+--   freshness      movies + series per last_updated hour ('never' for NULL)
+--   missing_movie  movies missing each field (key = field, see
+--   missing_tv     missing_fields.sql, which must be applied first)
+
+CREATE TABLE IF NOT EXISTS dashboard_counters (
+    metric   TEXT NOT NULL,
+    key      TEXT NOT NULL,
+    value    BIGINT NOT NULL DEFAULT 0,
+    last_at  TIMESTAMP,
+    PRIMARY KEY (metric, key)
+);
+
+CREATE TABLE IF NOT EXISTS dashboard_counter_deltas (
+    id       BIGSERIAL PRIMARY KEY,
+    metric   TEXT NOT NULL,
+    key      TEXT NOT NULL,
+    delta    BIGINT NOT NULL,
+    last_at  TIMESTAMP
+);
+
+CREATE OR REPLACE FUNCTION dashboard_hour_key(ts TIMESTAMP) RETURNS TEXT
+LANGUAGE sql IMMUTABLE AS $$
+    SELECT COALESCE(to_char(date_trunc('hour', ts), 'YYYY-MM-DD HH24:00'), 'never')
+$$;
+
+-- The counters computed from scratch; used to seed and to reconcile
+CREATE OR REPLACE FUNCTION dashboard_counter_truth()
+RETURNS TABLE (metric TEXT, key TEXT, value BIGINT, last_at TIMESTAMP)
+LANGUAGE sql STABLE AS $$
+    SELECT 'count', 'movies', COUNT(*), NULL::timestamp FROM movies
+    UNION ALL SELECT 'count', 'series', COUNT(*), NULL FROM series
+    UNION ALL SELECT 'count', 'series_seasons', COUNT(*), NULL FROM series_seasons
+    UNION ALL SELECT 'count', 'series_episodes', COUNT(*), NULL FROM series_episodes
+    UNION ALL SELECT 'count', 'movie_cast', COUNT(*), NULL FROM movie_cast
+    UNION ALL SELECT 'count', 'series_cast', COUNT(*), NULL FROM series_cast
+    UNION ALL SELECT 'count', 'people', COUNT(*), NULL FROM people
+    UNION ALL SELECT 'count', 'update_logs', COUNT(*), MAX("timestamp") FROM update_logs
+    UNION ALL
+    SELECT 'field_changes', field_name, COUNT(*), NULL
+    FROM update_logs
+    WHERE field_name IS NOT NULL
+    GROUP BY field_name
+    UNION ALL
+    SELECT 'freshness', dashboard_hour_key(last_updated), COUNT(*), NULL
+    FROM (
+        SELECT last_updated FROM movies
+        UNION ALL
+        SELECT last_updated FROM series
+    ) u
+    GROUP BY 2
+    UNION ALL
+    SELECT 'missing_' || b.media_type, b.field, COUNT(*), NULL
+    FROM (
+        SELECT 'movie' AS media_type, missing_mask FROM movies WHERE missing_mask <> 0
+        UNION ALL
+        SELECT 'tv', missing_mask FROM series WHERE missing_mask <> 0
+    ) t
+    JOIN missing_field_bits() b
+      ON b.media_type = t.media_type AND t.missing_mask & b.flag <> 0
+    GROUP BY 1, 2
+$$;
+
+-- Row counts: TG_ARGV[0] is the counter key
+CREATE OR REPLACE FUNCTION dashboard_count_rows() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO dashboard_counter_deltas (metric, key, delta)
+        SELECT 'count', TG_ARGV[0], COUNT(*) FROM new_rows HAVING COUNT(*) > 0;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO dashboard_counter_deltas (metric, key, delta)
+        SELECT 'count', TG_ARGV[0], -COUNT(*) FROM old_rows HAVING COUNT(*) > 0;
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+-- update_logs: row count, latest timestamp and per-field frequencies
+CREATE OR REPLACE FUNCTION dashboard_track_update_logs() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO dashboard_counter_deltas (metric, key, delta, last_at)
+        SELECT 'count', 'update_logs', COUNT(*), MAX("timestamp")
+        FROM new_rows HAVING COUNT(*) > 0;
+
+        INSERT INTO dashboard_counter_deltas (metric, key, delta)
+        SELECT 'field_changes', field_name, COUNT(*)
+        FROM new_rows
+        WHERE field_name IS NOT NULL
+        GROUP BY field_name;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO dashboard_counter_deltas (metric, key, delta)
+        SELECT 'count', 'update_logs', -COUNT(*) FROM old_rows HAVING COUNT(*) > 0;
+
+        INSERT INTO dashboard_counter_deltas (metric, key, delta)
+        SELECT 'field_changes', field_name, -COUNT(*)
+        FROM old_rows
+        WHERE field_name IS NOT NULL
+        GROUP BY field_name;
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+-- movies / series: moves titles between last_updated hours
+CREATE OR REPLACE FUNCTION dashboard_track_freshness() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO dashboard_counter_deltas (metric, key, delta)
+        SELECT 'freshness', dashboard_hour_key(last_updated), COUNT(*)
+        FROM new_rows
+        GROUP BY 2;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO dashboard_counter_deltas (metric, key, delta)
+        SELECT 'freshness', dashboard_hour_key(last_updated), -COUNT(*)
+        FROM old_rows
+        GROUP BY 2;
+    ELSE
+        INSERT INTO dashboard_counter_deltas (metric, key, delta)
+        SELECT 'freshness', hour_key, SUM(delta)
+        FROM (
+            SELECT dashboard_hour_key(last_updated) AS hour_key, 1 AS delta FROM new_rows
+            UNION ALL
+            SELECT dashboard_hour_key(last_updated), -1 FROM old_rows
+        ) moves
+        GROUP BY hour_key
+        HAVING SUM(delta) <> 0;
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+-- movies / series: per-field missing counts from missing_mask. TG_ARGV[0]
+-- is the media type.
+CREATE OR REPLACE FUNCTION dashboard_track_missing() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO dashboard_counter_deltas (metric, key, delta)
+        SELECT 'missing_' || TG_ARGV[0], b.field, COUNT(*)
+        FROM new_rows r
+        JOIN missing_field_bits() b
+          ON b.media_type = TG_ARGV[0] AND r.missing_mask & b.flag <> 0
+        GROUP BY b.field;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO dashboard_counter_deltas (metric, key, delta)
+        SELECT 'missing_' || TG_ARGV[0], b.field, -COUNT(*)
+        FROM old_rows r
+        JOIN missing_field_bits() b
+          ON b.media_type = TG_ARGV[0] AND r.missing_mask & b.flag <> 0
+        GROUP BY b.field;
+    ELSE
+        INSERT INTO dashboard_counter_deltas (metric, key, delta)
+        SELECT 'missing_' || TG_ARGV[0], b.field, SUM(r.delta)
+        FROM (
+            SELECT missing_mask, 1 AS delta FROM new_rows
+            UNION ALL
+            SELECT missing_mask, -1 FROM old_rows
+        ) r
+        JOIN missing_field_bits() b
+          ON b.media_type = TG_ARGV[0] AND r.missing_mask & b.flag <> 0
+        GROUP BY b.field
+        HAVING SUM(r.delta) <> 0;
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+-- Transition tables need one trigger per event
+DO $$
+DECLARE
+    tbl TEXT;
+BEGIN
+    FOREACH tbl IN ARRAY ARRAY[
+        'movies', 'series', 'series_seasons', 'series_episodes',
+        'movie_cast', 'series_cast', 'people'
+    ] LOOP
+        EXECUTE format(
+            'CREATE OR REPLACE TRIGGER dashboard_count_ins AFTER INSERT ON %I
+             REFERENCING NEW TABLE AS new_rows
+             FOR EACH STATEMENT EXECUTE FUNCTION dashboard_count_rows(%L)',
+            tbl, tbl
+        );
+        EXECUTE format(
+            'CREATE OR REPLACE TRIGGER dashboard_count_del AFTER DELETE ON %I
+             REFERENCING OLD TABLE AS old_rows
+             FOR EACH STATEMENT EXECUTE FUNCTION dashboard_count_rows(%L)',
+            tbl, tbl
+        );
+    END LOOP;
+
+    FOREACH tbl IN ARRAY ARRAY['movies', 'series'] LOOP
+        EXECUTE format(
+            'CREATE OR REPLACE TRIGGER dashboard_freshness_ins AFTER INSERT ON %I
+             REFERENCING NEW TABLE AS new_rows
+             FOR EACH STATEMENT EXECUTE FUNCTION dashboard_track_freshness()',
+            tbl
+        );
+        EXECUTE format(
+            'CREATE OR REPLACE TRIGGER dashboard_freshness_upd AFTER UPDATE ON %I
+             REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+             FOR EACH STATEMENT EXECUTE FUNCTION dashboard_track_freshness()',
+            tbl
+        );
+        EXECUTE format(
+            'CREATE OR REPLACE TRIGGER dashboard_freshness_del AFTER DELETE ON %I
+             REFERENCING OLD TABLE AS old_rows
+             FOR EACH STATEMENT EXECUTE FUNCTION dashboard_track_freshness()',
+            tbl
+        );
+    END LOOP;
+
+    FOREACH tbl IN ARRAY ARRAY['movies', 'series'] LOOP
+        EXECUTE format(
+            'CREATE OR REPLACE TRIGGER dashboard_missing_ins AFTER INSERT ON %I
+             REFERENCING NEW TABLE AS new_rows
+             FOR EACH STATEMENT EXECUTE FUNCTION dashboard_track_missing(%L)',
+            tbl, CASE tbl WHEN 'movies' THEN 'movie' ELSE 'tv' END
+        );
+        EXECUTE format(
+            'CREATE OR REPLACE TRIGGER dashboard_missing_upd AFTER UPDATE ON %I
+             REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+             FOR EACH STATEMENT EXECUTE FUNCTION dashboard_track_missing(%L)',
+            tbl, CASE tbl WHEN 'movies' THEN 'movie' ELSE 'tv' END
+        );
+        EXECUTE format(
+            'CREATE OR REPLACE TRIGGER dashboard_missing_del AFTER DELETE ON %I
+             REFERENCING OLD TABLE AS old_rows
+             FOR EACH STATEMENT EXECUTE FUNCTION dashboard_track_missing(%L)',
+            tbl, CASE tbl WHEN 'movies' THEN 'movie' ELSE 'tv' END
+        );
+    END LOOP;
+END;
+$$;
+
+CREATE OR REPLACE TRIGGER dashboard_update_logs_ins AFTER INSERT ON update_logs
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION dashboard_track_update_logs();
+
+CREATE OR REPLACE TRIGGER dashboard_update_logs_del AFTER DELETE ON update_logs
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION dashboard_track_update_logs();
+
+-- First install: seed from scratch. The triggers above already hold locks
+-- on every counted table, so no write can slip between the seed and them.
+INSERT INTO dashboard_counters (metric, key, value, last_at)
+SELECT metric, key, value, last_at
+FROM dashboard_counter_truth()
+WHERE NOT EXISTS (SELECT 1 FROM dashboard_counters);
+
+-- Installs that predate the missing_* metrics: seed just those, under the
+-- same locks. Once seeded, a sum of zero everywhere is also what the
+-- tables hold, so running this again adds nothing.
+INSERT INTO dashboard_counters (metric, key, value, last_at)
+SELECT metric, key, value, last_at
+FROM dashboard_counter_truth()
+WHERE metric IN ('missing_movie', 'missing_tv')
+  AND NOT EXISTS (
+      SELECT 1 FROM dashboard_counters WHERE metric IN ('missing_movie', 'missing_tv')
+      UNION ALL
+      SELECT 1 FROM dashboard_counter_deltas WHERE metric IN ('missing_movie', 'missing_tv')
+  );
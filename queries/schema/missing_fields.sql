@@ -0,0 +1,96 @@
+-- missing_fields.sql
+-- Per-title data-quality bitmask: bit N is set while the field it stands
+-- for is empty (NULL, '' for text, 0 for season/episode counts). Postgres
+-- keeps it current on every write as a stored generated column, so nothing
+-- in the uploaders has to know about it.
+--
+-- Bits, mirrored in services/missing_titles.py MISSING_FIELDS:
+--   movie  1 overview  2 release_date  4 runtime  8 poster_path
+--          16 original_language  32 status  64 imdb_id  128 budget
+--          256 revenue  512 tagline
+--   tv     1 overview  2 first_air_date  4 runtime (episode_run_time)
+--          8 poster_path  16 original_language  32 status  64 imdb_id
+--          128 network  256 seasons  512 episodes
+--
+-- Adding the column rewrites the table once; changing a bit later means
+-- dropping the column (and its indexes) so this file can add it again.
+
+ALTER TABLE movies ADD COLUMN IF NOT EXISTS missing_mask INTEGER
+    GENERATED ALWAYS AS (
+          (CASE WHEN NULLIF(overview, '') IS NULL THEN 1 ELSE 0 END)
+        | (CASE WHEN release_date IS NULL THEN 2 ELSE 0 END)
+        | (CASE WHEN runtime IS NULL THEN 4 ELSE 0 END)
+        | (CASE WHEN NULLIF(poster_path, '') IS NULL THEN 8 ELSE 0 END)
+        | (CASE WHEN NULLIF(original_language, '') IS NULL THEN 16 ELSE 0 END)
+        | (CASE WHEN NULLIF(status, '') IS NULL THEN 32 ELSE 0 END)
+        | (CASE WHEN NULLIF(imdb_id, '') IS NULL THEN 64 ELSE 0 END)
+        | (CASE WHEN budget IS NULL THEN 128 ELSE 0 END)
+        | (CASE WHEN revenue IS NULL THEN 256 ELSE 0 END)
+        | (CASE WHEN NULLIF(tagline, '') IS NULL THEN 512 ELSE 0 END)
+    ) STORED;
+
+ALTER TABLE series ADD COLUMN IF NOT EXISTS missing_mask INTEGER
+    GENERATED ALWAYS AS (
+          (CASE WHEN NULLIF(overview, '') IS NULL THEN 1 ELSE 0 END)
+        | (CASE WHEN first_air_date IS NULL THEN 2 ELSE 0 END)
+        | (CASE WHEN episode_run_time IS NULL THEN 4 ELSE 0 END)
+        | (CASE WHEN NULLIF(poster_path, '') IS NULL THEN 8 ELSE 0 END)
+        | (CASE WHEN NULLIF(original_language, '') IS NULL THEN 16 ELSE 0 END)
+        | (CASE WHEN NULLIF(status, '') IS NULL THEN 32 ELSE 0 END)
+        | (CASE WHEN NULLIF(imdb_id, '') IS NULL THEN 64 ELSE 0 END)
+        | (CASE WHEN NULLIF(network, '') IS NULL THEN 128 ELSE 0 END)
+        | (CASE WHEN COALESCE(number_of_seasons, 0) = 0 THEN 256 ELSE 0 END)
+        | (CASE WHEN COALESCE(number_of_episodes, 0) = 0 THEN 512 ELSE 0 END)
+    ) STORED;
+
+-- The bits as rows, for the summary counters in dashboard_counters.sql
+CREATE OR REPLACE FUNCTION missing_field_bits()
+RETURNS TABLE (media_type TEXT, field TEXT, flag INTEGER)
+LANGUAGE sql IMMUTABLE AS $$
+    VALUES
+        ('movie', 'missing_overview', 1),
+        ('movie', 'missing_release_date', 2),
+        ('movie', 'missing_runtime', 4),
+        ('movie', 'missing_poster_path', 8),
+        ('movie', 'missing_original_language', 16),
+        ('movie', 'missing_status', 32),
+        ('movie', 'missing_imdb', 64),
+        ('movie', 'missing_budget', 128),
+        ('movie', 'missing_revenue', 256),
+        ('movie', 'missing_tagline', 512),
+        ('tv', 'missing_overview', 1),
+        ('tv', 'missing_first_air_date', 2),
+        ('tv', 'missing_runtime', 4),
+        ('tv', 'missing_poster_path', 8),
+        ('tv', 'missing_original_language', 16),
+        ('tv', 'missing_status', 32),
+        ('tv', 'missing_imdb', 64),
+        ('tv', 'missing_network', 128),
+        ('tv', 'missing_seasons', 256),
+        ('tv', 'missing_episodes', 512)
+$$;
+
+-- One small partial index per field, holding only the titles missing it,
+-- in id order so /missing/<field> pages are index range scans. Queries
+-- must spell the predicate the same way: missing_mask & <bit> <> 0.
+DO $$
+DECLARE
+    f RECORD;
+BEGIN
+    FOR f IN SELECT * FROM missing_field_bits() LOOP
+        IF f.media_type = 'movie' THEN
+            EXECUTE format(
+                'CREATE INDEX IF NOT EXISTS %I ON movies (movie_id)
+                 WHERE missing_mask & %s <> 0',
+                'movies_' || f.field || '_idx', f.flag
+            );
+        ELSE
+            EXECUTE format(
+                'CREATE INDEX IF NOT EXISTS %I ON series (series_id)
+                 WHERE missing_mask & %s <> 0',
+                'series_' || f.field || '_idx', f.flag
+            );
+        END IF;
+    END LOOP;
+END;
+$$;
@@ -0,0 +1,29 @@
+-- news.sql
+-- Film news shown on the home page and /news. A background task in the web
+-- app (web_ui/background.py) polls the sources, so page views only read
+-- these rows.
+
+-- One row per article, whichever source or refresh it came from
+CREATE TABLE IF NOT EXISTS news_articles (
+    link        TEXT PRIMARY KEY,
+    title       TEXT NOT NULL,
+    source      TEXT NOT NULL,
+    published   TIMESTAMPTZ NOT NULL,
+    first_seen  TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS news_articles_published_idx
+    ON news_articles (published DESC);
+
+-- Per-source poll state. etag / modified are the validators from the last
+-- 200 response, sent back as If-None-Match / If-Modified-Since so an
+-- unchanged feed costs a 304.
+CREATE TABLE IF NOT EXISTS news_sources (
+    source         TEXT PRIMARY KEY,
+    etag           TEXT,
+    modified       TEXT,
+    fetched_at     TIMESTAMPTZ,
+    status         SMALLINT,
+    article_count  INTEGER NOT NULL DEFAULT 0,
+    last_error     TEXT
+);
@@ -0,0 +1,7 @@
+-- Indexes behind services/versions.py: MAX(last_updated) per table becomes
+-- a single index probe, so listing pages can answer 304 without scanning.
+CREATE INDEX IF NOT EXISTS movies_last_updated_idx
+    ON movies (last_updated);
+
+CREATE INDEX IF NOT EXISTS series_last_updated_idx
+    ON series (last_updated);
@@ -0,0 +1,14 @@
+-- person_search.sql
+-- Indexes behind services/people.py: substring name matches on people, and
+-- each credit table looked up by person, so a person's filmography is a
+-- handful of index scans rather than four table scans.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS people_name_trgm_idx
+    ON people USING GIN (name gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS movie_cast_actor_idx ON movie_cast (actor_id);
+CREATE INDEX IF NOT EXISTS series_cast_person_idx ON series_cast (person_id);
+CREATE INDEX IF NOT EXISTS movie_crew_member_idx ON movie_crew (crew_member_id);
+CREATE INDEX IF NOT EXISTS series_crew_person_idx ON series_crew (person_id);
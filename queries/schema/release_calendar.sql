@@ -0,0 +1,34 @@
+-- release_calendar.sql
+-- Cinema and TV releases shown on the home page. A background task in the
+-- web app (web_ui/background.py) refreshes them from TMDb, so page views
+-- only read these rows.
+
+CREATE TABLE IF NOT EXISTS release_calendar (
+    media_type     TEXT NOT NULL CHECK (media_type IN ('movie', 'tv')),
+    month          DATE NOT NULL,          -- first day of the release month
+    tmdb_id        INTEGER NOT NULL,
+    position       SMALLINT NOT NULL,      -- TMDb discover order
+    title          TEXT NOT NULL,
+    release_date   DATE,
+    runtime        INTEGER,
+    certification  TEXT,
+    distributor    TEXT,
+    platform       TEXT,
+    genre          TEXT,
+    poster_path    TEXT,
+    source         TEXT NOT NULL DEFAULT 'TMDb',
+    source_url     TEXT,
+    PRIMARY KEY (media_type, month, tmdb_id)
+);
+
+CREATE INDEX IF NOT EXISTS release_calendar_listing_idx
+    ON release_calendar (media_type, month, position);
+
+-- When each (media_type, month) was last fetched; missing rows are stale
+CREATE TABLE IF NOT EXISTS release_calendar_months (
+    media_type    TEXT NOT NULL CHECK (media_type IN ('movie', 'tv')),
+    month         DATE NOT NULL,
+    refreshed_at  TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    release_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (media_type, month)
+);
@@ -0,0 +1,7 @@
+-- Indexes behind services/seasons.py SEASON_MAP_QUERY: seasons by series,
+-- then episodes by season in episode order.
+CREATE INDEX IF NOT EXISTS series_seasons_series_idx
+    ON series_seasons (series_id, season_number);
+
+CREATE INDEX IF NOT EXISTS series_episodes_season_idx
+    ON series_episodes (season_id, episode_number);
@@ -0,0 +1,11 @@
+-- stats_snapshot.sql
+-- Last result of queries/all_stats.sql. services/stats.py rewrites the row
+-- on a schedule and after bulk syncs; page views only read it, so they never
+-- scan update_logs or count the big tables themselves.
+
+CREATE TABLE IF NOT EXISTS stats_snapshot (
+    snapshot_id   SMALLINT PRIMARY KEY DEFAULT 1 CHECK (snapshot_id = 1),
+    stats         JSONB NOT NULL,
+    refreshed_at  TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    refresh_ms    INTEGER
+);
@@ -0,0 +1,48 @@
+-- sync_jobs.sql
+-- Durable queue of TMDB syncs. Web routes enqueue, sync_worker.py consumes
+-- with FOR UPDATE SKIP LOCKED so any number of workers can share it.
+
+CREATE TABLE IF NOT EXISTS sync_jobs (
+    job_id        BIGSERIAL PRIMARY KEY,
+    tmdb_id       INTEGER NOT NULL,
+    media_type    TEXT NOT NULL CHECK (media_type IN ('movie', 'tv')),
+    priority      SMALLINT NOT NULL DEFAULT 100,
+    status        TEXT NOT NULL DEFAULT 'queued'
+                  CHECK (status IN ('queued', 'running', 'done', 'dead')),
+    attempts      SMALLINT NOT NULL DEFAULT 0,
+    max_attempts  SMALLINT NOT NULL DEFAULT 5,
+    run_after     TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    locked_by     TEXT,
+    locked_at     TIMESTAMPTZ,
+    last_error    TEXT,
+    result        JSONB,
+    created_at    TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at    TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- At most one live job per title, so re-enqueueing it is a no-op
+CREATE UNIQUE INDEX IF NOT EXISTS sync_jobs_live_uidx
+    ON sync_jobs (media_type, tmdb_id)
+    WHERE status IN ('queued', 'running');
+
+-- Claim order for workers
+CREATE INDEX IF NOT EXISTS sync_jobs_claim_idx
+    ON sync_jobs (priority, run_after, job_id)
+    WHERE status = 'queued';
+
+-- Lease expiry sweep
+CREATE INDEX IF NOT EXISTS sync_jobs_running_idx
+    ON sync_jobs (locked_at)
+    WHERE status = 'running';
+
+-- One row per /upload or /bulk-upload submission
+CREATE TABLE IF NOT EXISTS sync_batches (
+    batch_id    UUID PRIMARY KEY,
+    media_type  TEXT NOT NULL,
+    job_ids     BIGINT[] NOT NULL,
+    created_at  TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- Progress within the current attempt ('fetched', 'written'), streamed to
+-- the bulk upload results page
+ALTER TABLE sync_jobs ADD COLUMN IF NOT EXISTS stage TEXT;
@@ -0,0 +1,78 @@
+-- title_index.sql
+-- Notifies the web app's in-memory title index (services/title_index.py)
+-- when a title is added, renamed or removed. The payload carries everything
+-- the index stores, so listeners never query back.
+
+-- A movie's year as the index shows it: movie_metadata's release_year when
+-- there is one, else the release date's. Used by both the full load
+-- (services/title_index.py LOAD_QUERY) and the NOTIFY payload below.
+CREATE OR REPLACE FUNCTION title_index_movie_year(p_movie_id INTEGER, p_release_date DATE)
+RETURNS INTEGER
+LANGUAGE sql STABLE AS $$
+    SELECT COALESCE(
+        (SELECT release_year FROM movie_metadata WHERE movie_id = p_movie_id),
+        EXTRACT(YEAR FROM p_release_date)::int
+    )
+$$;
+
+CREATE OR REPLACE FUNCTION notify_title_change() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+    payload JSON;
+BEGIN
+    IF TG_TABLE_NAME = 'movies' THEN
+        IF TG_OP = 'DELETE' THEN
+            payload := json_build_object('op', 'delete', 'type', 'movie', 'id', OLD.movie_id);
+        ELSE
+            payload := json_build_object(
+                'op', 'upsert', 'type', 'movie', 'id', NEW.movie_id,
+                'title', NEW.movie_title, 'original_title', NEW.original_title,
+                'year', title_index_movie_year(NEW.movie_id, NEW.release_date),
+                'popularity', NEW.popularity
+            );
+        END IF;
+    ELSE
+        IF TG_OP = 'DELETE' THEN
+            payload := json_build_object('op', 'delete', 'type', 'tv', 'id', OLD.series_id);
+        ELSE
+            payload := json_build_object(
+                'op', 'upsert', 'type', 'tv', 'id', NEW.series_id,
+                'title', NEW.series_name, 'original_title', NULL,
+                'year', EXTRACT(YEAR FROM NEW.first_air_date)::int,
+                'popularity', NEW.popularity
+            );
+        END IF;
+    END IF;
+
+    PERFORM pg_notify('title_changes', payload::text);
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE TRIGGER title_index_notify_ins_del
+    AFTER INSERT OR DELETE ON movies
+    FOR EACH ROW EXECUTE FUNCTION notify_title_change();
+
+-- Uploaders rewrite every column on each sync; only real changes notify
+CREATE OR REPLACE TRIGGER title_index_notify_upd
+    AFTER UPDATE ON movies
+    FOR EACH ROW
+    WHEN (
+        OLD.movie_title IS DISTINCT FROM NEW.movie_title
+        OR OLD.original_title IS DISTINCT FROM NEW.original_title
+        OR OLD.release_date IS DISTINCT FROM NEW.release_date
+    )
+    EXECUTE FUNCTION notify_title_change();
+
+CREATE OR REPLACE TRIGGER title_index_notify_ins_del
+    AFTER INSERT OR DELETE ON series
+    FOR EACH ROW EXECUTE FUNCTION notify_title_change();
+
+CREATE OR REPLACE TRIGGER title_index_notify_upd
+    AFTER UPDATE ON series
+    FOR EACH ROW
+    WHEN (
+        OLD.series_name IS DISTINCT FROM NEW.series_name
+        OR OLD.first_air_date IS DISTINCT FROM NEW.first_air_date
+    )
+    EXECUTE FUNCTION notify_title_change();
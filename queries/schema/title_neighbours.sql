@@ -0,0 +1,32 @@
+-- title_neighbours.sql
+-- Precomputed "related titles", written by build_related.py. Each method
+-- (credits = shared cast/crew and genres, content = overview/tagline text)
+-- keeps its own ranked top-K list per title; the title page only reads
+-- these rows.
+
+CREATE TABLE IF NOT EXISTS title_neighbours (
+    media_type    TEXT NOT NULL CHECK (media_type IN ('movie', 'tv')),
+    title_id      INTEGER NOT NULL,
+    method        TEXT NOT NULL,
+    rank          SMALLINT NOT NULL,
+    neighbour_id  INTEGER NOT NULL,
+    score         REAL NOT NULL,
+    computed_at   TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (media_type, title_id, method, rank)
+);
+
+-- One row per job run; the latest successful run's started_at is the
+-- watermark for incremental runs
+CREATE TABLE IF NOT EXISTS title_neighbour_runs (
+    run_id          BIGSERIAL PRIMARY KEY,
+    media_type      TEXT NOT NULL,
+    method          TEXT NOT NULL,
+    mode            TEXT NOT NULL CHECK (mode IN ('full', 'incremental')),
+    started_at      TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    finished_at     TIMESTAMPTZ,
+    titles_scored   INTEGER
+);
+
+CREATE INDEX IF NOT EXISTS title_neighbour_runs_latest_idx
+    ON title_neighbour_runs (media_type, method, started_at DESC)
+    WHERE finished_at IS NOT NULL;
@@ -0,0 +1,38 @@
+-- title_search.sql
+-- Indexes behind services/search.py: trigram indexes for fuzzy and
+-- substring title matches, a weighted full-text document over titles and
+-- overview, and plain b-trees for year filters.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Titles weigh more than the original title, which weighs more than the
+-- overview. 'simple' keeps names intact; overviews get English stemming.
+CREATE OR REPLACE FUNCTION title_search_document(title TEXT, original_title TEXT, overview TEXT)
+RETURNS tsvector
+LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+    SELECT setweight(to_tsvector('simple'::regconfig, COALESCE(title, '')), 'A')
+        || setweight(to_tsvector('simple'::regconfig, COALESCE(original_title, '')), 'B')
+        || setweight(to_tsvector('english'::regconfig, COALESCE(overview, '')), 'C')
+$$;
+
+CREATE INDEX IF NOT EXISTS movies_search_document_idx
+    ON movies USING GIN (title_search_document(movie_title, original_title, overview));
+
+CREATE INDEX IF NOT EXISTS series_search_document_idx
+    ON series USING GIN (title_search_document(series_name, NULL, overview));
+
+CREATE INDEX IF NOT EXISTS movies_title_trgm_idx
+    ON movies USING GIN (movie_title gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS movies_original_title_trgm_idx
+    ON movies USING GIN (original_title gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS series_name_trgm_idx
+    ON series USING GIN (series_name gin_trgm_ops);
+
+-- Year filters compare the raw columns, so these apply
+CREATE INDEX IF NOT EXISTS movie_metadata_release_year_idx
+    ON movie_metadata (release_year);
+
+CREATE INDEX IF NOT EXISTS series_first_air_date_idx
+    ON series (first_air_date);
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Recomputes the dashboard counters from scratch and reports any drift from
+the incrementally maintained values (see queries/schema/dashboard_counters.sql).
+
+    python reconcile_dashboard.py              # report and fix
+    python reconcile_dashboard.py --dry-run    # report only
+"""
+
+import argparse
+
+from db.connection import get_connection, release_connection
+from services.dashboard import reconcile_dashboard_counters
+
+
+def main(dry_run=False):
+    conn = get_connection()
+    try:
+        drift = reconcile_dashboard_counters(conn, fix=not dry_run)
+    finally:
+        release_connection(conn)
+
+    if not drift:
+        print("✅ Dashboard counters match the tables.")
+        return
+
+    for d in drift:
+        print(
+            f"⚠️ {d['metric']}/{d['key']}: counted {d['actual']}, "
+            f"expected {d['expected']} ({d['drift']:+})"
+        )
+    print("🔧 Counters reset to the recomputed values." if not dry_run else "ℹ️ Dry run, nothing changed.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reconcile dashboard counters.")
+    parser.add_argument("--dry-run", action="store_true", help="report drift without fixing it")
+    args = parser.parse_args()
+    main(dry_run=args.dry_run)
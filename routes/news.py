@@ -1,19 +1,38 @@
 # routes/news.py
-from datetime import datetime
-from fastapi import APIRouter
-from services.news_fetcher import get_all_news
+from fastapi import APIRouter, Depends, Query
 
-# Now this works:
-datetime.utcnow()
+from db.session import DBSession
+from services.news_fetcher import (
+    NEWS_LIMIT,
+    get_latest_news,
+    get_news_sources,
+    last_fetched,
+)
+from web_ui.dependencies import get_db
+
+router = APIRouter(prefix="/api")
 
-router = APIRouter()
 
 @router.get("/news")
-def news_endpoint():
-    articles = get_all_news()
-    print(f"Fetched {len(articles)} articles")  # Debug line
+def news_endpoint(
+    limit: int = Query(NEWS_LIMIT, ge=1, le=200),
+    db: DBSession = Depends(get_db),
+):
+    # Served from news_articles; web_ui/background.py keeps it refreshed
+    articles = get_latest_news(limit, db)
+    sources = get_news_sources(db)
     return {
-        "fetched_at": datetime.utcnow(),
+        "fetched_at": last_fetched(sources),
         "article_count": len(articles),
-        "articles": [article.dict() for article in articles]
+        "articles": [article.dict() for article in articles],
+        "sources": [
+            {
+                "source": s["source"],
+                "fetched_at": s["fetched_at"],
+                "status": s["status"],
+                "article_count": s["article_count"],
+                "last_error": s["last_error"],
+            }
+            for s in sources
+        ],
     }
@@ -1,12 +1,7 @@
-from db.connection import get_connection, release_connection
-import psycopg2.extras
-
 from db.helpers import dict_cursor
 
-
-def get_cast_for_title(title_id: int, title_type: str):
-    if title_type == "movie":
-        query = """
+CAST_QUERIES = {
+    "movie": """
         SELECT
             mc.actor_id,
             p.name,
@@ -16,9 +11,8 @@ def get_cast_for_title(title_id: int, title_type: str):
         JOIN people p ON p.person_id = mc.actor_id
         WHERE mc.movie_id = %s
         ORDER BY mc.cast_order ASC
-        """
-    elif title_type == "tv":
-        query = """
+        """,
+    "tv": """
         SELECT
             sc.person_id,
             p.name,
@@ -28,17 +22,11 @@ def get_cast_for_title(title_id: int, title_type: str):
         JOIN people p ON p.person_id = sc.person_id
         WHERE sc.series_id = %s
         ORDER BY sc.cast_order ASC
-        """
-    else:
-        return []
+        """,
+}
 
-    with dict_cursor() as cursor:
-        cursor.execute(query, (title_id,))
-        return cursor.fetchall()
-
-def get_crew_for_title(title_id: int, title_type: str):
-    if title_type == "movie":
-        query = """
+CREW_QUERIES = {
+    "movie": """
         SELECT
             mc.crew_member_id,
             p.name,
@@ -48,9 +36,8 @@ def get_crew_for_title(title_id: int, title_type: str):
         FROM movie_crew mc
         JOIN people p ON p.person_id = mc.crew_member_id
         WHERE mc.movie_id = %s
-        """
-    elif title_type == "tv":
-        query = """
+        """,
+    "tv": """
         SELECT
             sc.person_id,
             p.name,
@@ -60,10 +47,25 @@ def get_crew_for_title(title_id: int, title_type: str):
         FROM series_crew sc
         JOIN people p ON p.person_id = sc.person_id
         WHERE sc.series_id = %s
-        """
-    else:
+        """,
+}
+
+
+def get_cast_for_title(title_id: int, title_type: str, conn=None):
+    query = CAST_QUERIES.get(title_type)
+    if query is None:
+        return []
+
+    with dict_cursor(conn) as cursor:
+        cursor.execute(query, (title_id,))
+        return cursor.fetchall()
+
+
+def get_crew_for_title(title_id: int, title_type: str, conn=None):
+    query = CREW_QUERIES.get(title_type)
+    if query is None:
         return []
 
-    with dict_cursor() as cursor:
+    with dict_cursor(conn) as cursor:
         cursor.execute(query, (title_id,))
         return cursor.fetchall()
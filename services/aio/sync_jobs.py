@@ -0,0 +1,21 @@
+# services/aio/sync_jobs.py
+
+from db.aio import dict_cursor
+from services.sync_jobs import BATCH_JOBS_QUERY, BATCH_QUERY, count_pending
+
+
+async def get_batch(batch_id, conn=None):
+    """
+    Returns the batch with its jobs in submission order, or None.
+    """
+    async with dict_cursor(conn) as cursor:
+        await cursor.execute(BATCH_QUERY, (str(batch_id),))
+        batch = await cursor.fetchone()
+        if not batch:
+            return None
+
+        await cursor.execute(BATCH_JOBS_QUERY, (batch["job_ids"],))
+        batch["jobs"] = await cursor.fetchall()
+
+    batch["pending"] = count_pending(batch["jobs"])
+    return batch
@@ -0,0 +1,47 @@
+# services/aio/title_page.py
+
+from db.aio import dict_cursor
+from services.title_page import (
+    PAGE_QUERIES,
+    VERSION_QUERIES,
+    page_cache,
+    page_params,
+    shape_title_page,
+)
+
+
+async def get_title_version(title_type, title_id, conn=None):
+    """Cheap PK lookup of the title's last_updated, as a string."""
+    async with dict_cursor(conn) as cursor:
+        await cursor.execute(VERSION_QUERIES[title_type], (title_id,))
+        row = await cursor.fetchone()
+    return row["version"] if row else None
+
+
+async def get_title_page(title_type: str, title_id: int, conn=None):
+    """
+    Returns the full title page model, from cache when the title hasn't
+    changed since it was assembled. Raises ValueError for unknown types.
+    """
+    if title_type not in PAGE_QUERIES:
+        raise ValueError(f"Invalid title type: {title_type}")
+
+    key = (title_type, title_id)
+    async with dict_cursor(conn) as cursor:
+        await cursor.execute(VERSION_QUERIES[title_type], (title_id,))
+        row = await cursor.fetchone()
+        version = row["version"] if row else None
+
+        if version is not None:
+            cached = page_cache.get(key, version)
+            if cached is not None:
+                return {**cached, "cached": True}
+
+        await cursor.execute(
+            PAGE_QUERIES[title_type][0], page_params(title_type, title_id)
+        )
+        page = shape_title_page(title_type, (await cursor.fetchone())["page"])
+
+    if page["title"] is not None and page["version"] is not None:
+        page_cache.put(key, page["version"], page)
+    return {**page, "cached": False}
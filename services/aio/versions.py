@@ -0,0 +1,12 @@
+# services/aio/versions.py
+
+from db.aio import dict_cursor
+from services.versions import TITLE_VERSION_QUERIES, epoch
+
+
+async def get_title_version(title_type, title_id, conn=None):
+    """(updated, related) for one title, or None if it doesn't exist."""
+    async with dict_cursor(conn) as cursor:
+        await cursor.execute(TITLE_VERSION_QUERIES[title_type], (title_id,))
+        row = await cursor.fetchone()
+    return (epoch(row["updated"]), epoch(row["related"])) if row else None
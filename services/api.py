@@ -0,0 +1,383 @@
+# services/api.py
+"""
+Keyset-paginated JSON feeds for downstream tools: titles, a series'
+episodes and update logs.
+
+Each feed declares the fields clients may project (name → SQL expression)
+and the sort key it pages on. A cursor is the sort key of the last row
+served, so page N costs the same as page 1, and rows are streamed from a
+server-side cursor so a large page never sits in memory.
+"""
+
+import base64
+import itertools
+import json
+import re
+from datetime import date, datetime
+from decimal import Decimal
+
+import psycopg2.extras
+
+from db.connection import get_connection, release_connection
+from db.helpers import dict_cursor
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 5000
+
+NEVER = "'-infinity'::timestamp"
+
+# Both title branches expose the same names, so one feed can mix them
+TITLE_FIELDS = {
+    "movie": {
+        "id": "m.movie_id",
+        "type": "'movie'",
+        "title": "m.movie_title",
+        "original_title": "m.original_title",
+        "overview": "m.overview",
+        "tagline": "m.tagline",
+        "release_date": "m.release_date",
+        "runtime": "m.runtime",
+        "status": "m.status",
+        "original_language": "m.original_language",
+        "popularity": "m.popularity",
+        "vote_average": "m.vote_average",
+        "vote_count": "m.vote_count",
+        "poster_path": "m.poster_path",
+        "backdrop_path": "m.backdrop_path",
+        "imdb_id": "m.imdb_id",
+        "last_updated": "m.last_updated",
+    },
+    "tv": {
+        "id": "s.series_id",
+        "type": "'tv'",
+        "title": "s.series_name",
+        "original_title": "NULL::text",
+        "overview": "s.overview",
+        "tagline": "NULL::text",
+        "release_date": "s.first_air_date",
+        "runtime": "s.episode_run_time",
+        "status": "s.status",
+        "original_language": "s.original_language",
+        "popularity": "s.popularity",
+        "vote_average": "s.vote_average",
+        "vote_count": "s.vote_count",
+        "poster_path": "s.poster_path",
+        "backdrop_path": "s.backdrop_path",
+        "imdb_id": "s.imdb_id",
+        "last_updated": "s.last_updated",
+    },
+}
+TITLE_DEFAULT_FIELDS = ("id", "type", "title", "release_date", "last_updated")
+
+# Sort keys match the expression indexes in queries/schema/api_keysets.sql
+TITLE_SOURCES = {
+    "movie": {
+        "from": "movies m",
+        "keys": (f"COALESCE(m.last_updated, {NEVER})", "'movie'", "m.movie_id"),
+        "index": (f"COALESCE(m.last_updated, {NEVER})", "m.movie_id"),
+        "since": f"COALESCE(m.last_updated, {NEVER}) >= %(since)s",
+    },
+    "tv": {
+        "from": "series s",
+        "keys": (f"COALESCE(s.last_updated, {NEVER})", "'tv'", "s.series_id"),
+        "index": (f"COALESCE(s.last_updated, {NEVER})", "s.series_id"),
+        "since": f"COALESCE(s.last_updated, {NEVER}) >= %(since)s",
+    },
+}
+TITLE_KEY_TYPES = ("timestamp", "text", "int")
+
+EPISODE_FIELDS = {
+    "episode_id": "se.episode_id",
+    "season_number": "ss.season_number",
+    "episode_number": "se.episode_number",
+    "episode_name": "se.episode_name",
+    "overview": "se.overview",
+    "air_date": "se.air_date",
+    "runtime": "se.runtime",
+    "still_path": "se.still_path",
+    "vote_average": "se.vote_average",
+    "vote_count": "se.vote_count",
+    "last_updated": "se.last_updated",
+}
+EPISODE_DEFAULT_FIELDS = (
+    "episode_id",
+    "season_number",
+    "episode_number",
+    "episode_name",
+    "air_date",
+)
+EPISODE_KEYS = ("ss.season_number", "se.episode_number", "se.episode_id")
+EPISODE_KEY_TYPES = ("int", "int", "int")
+
+LOG_FIELDS = {
+    "id": "l.id",
+    "timestamp": 'l."timestamp"',
+    "content_type": "l.content_type",
+    "content_id": "l.content_id",
+    "content_title": "l.content_title",
+    "update_type": "l.update_type",
+    "field_name": "l.field_name",
+    "previous_value": "l.previous_value",
+    "current_value": "l.current_value",
+    "source": "l.source",
+    "context": "l.context",
+}
+LOG_DEFAULT_FIELDS = (
+    "id",
+    "timestamp",
+    "content_type",
+    "content_id",
+    "update_type",
+    "field_name",
+    "previous_value",
+    "current_value",
+)
+LOG_KEYS = ('l."timestamp"', "l.id")
+LOG_KEY_TYPES = ("timestamp", "int")
+
+
+def encode_cursor(values):
+    payload = json.dumps(list(values))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+# Keys arrive as Postgres text (see _select_list); int keys are int4 columns
+INT4_RANGE = range(-(2**31), 2**31)
+
+
+def _check_key(value, key_type):
+    """A cursor value if it is valid for `key_type`, else ValueError."""
+    if key_type == "int":
+        if isinstance(value, str) and re.fullmatch(r"-?\d{1,10}", value):
+            value = int(value)
+        if isinstance(value, int) and not isinstance(value, bool) and value in INT4_RANGE:
+            return value
+        raise ValueError("Invalid cursor")
+    if not isinstance(value, str):
+        raise ValueError("Invalid cursor")
+    if key_type == "timestamp" and value not in ("-infinity", "infinity"):
+        datetime.fromisoformat(value)
+    return value
+
+
+def decode_cursor(cursor, key_types):
+    """
+    Raises ValueError for anything that isn't a cursor we issued: every
+    value must fit its key type, so the SQL casts can't fail.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(values, list) or len(values) != len(key_types):
+        raise ValueError("Invalid cursor")
+    try:
+        return [_check_key(value, t) for value, t in zip(values, key_types)]
+    except ValueError as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def parse_fields(fields, available, default):
+    """Comma-separated field names → tuple; raises ValueError for unknown ones."""
+    if not fields:
+        return default
+    names = tuple(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+    unknown = [name for name in names if name not in available]
+    if unknown:
+        raise ValueError(
+            f"Unknown field(s): {', '.join(unknown)}. "
+            f"Available: {', '.join(available)}"
+        )
+    return names or default
+
+
+def clamp_limit(limit):
+    return max(1, min(int(limit or DEFAULT_LIMIT), MAX_LIMIT))
+
+
+def _keyset_condition(keys, key_types):
+    row = ", ".join(keys)
+    values = ", ".join(f"%(after_{i})s::{t}" for i, t in enumerate(key_types))
+    return f"({row}) > ({values})"
+
+
+def _select_list(fields, expressions, keys):
+    # Keys travel as text so '-infinity' survives the trip through a cursor
+    columns = [f'{expressions[name]} AS "{name}"' for name in fields]
+    columns += [f"({key})::text AS _k{i}" for i, key in enumerate(keys)]
+    return ", ".join(columns)
+
+
+def _after_params(cursor, key_types):
+    if not cursor:
+        return {}
+    values = decode_cursor(cursor, key_types)
+    return {f"after_{i}": value for i, value in enumerate(values)}
+
+
+def _title_after(type_name, after_type):
+    """
+    The keyset condition for one branch of /api/titles. The type in the
+    cursor is settled here, so Postgres sees a plain (last_updated, id)
+    range on the branch's index.
+    """
+    last_updated, title_id = TITLE_SOURCES[type_name]["index"]
+    if type_name == after_type:
+        return f"({last_updated}, {title_id}) > (%(after_0)s::timestamp, %(after_2)s::int)"
+    if type_name > after_type:
+        return f"{last_updated} >= %(after_0)s::timestamp"
+    return f"{last_updated} > %(after_0)s::timestamp"
+
+
+def titles_query(fields, media_type=None, since=None, cursor=None, limit=DEFAULT_LIMIT):
+    """SQL and params for one page of /api/titles, oldest change first."""
+    if media_type not in (None, "movie", "tv"):
+        raise ValueError(f"Invalid title type: {media_type}")
+
+    params = {"since": since, "limit": clamp_limit(limit) + 1}
+    params.update(_after_params(cursor, TITLE_KEY_TYPES))
+
+    branches = []
+    for type_name in (media_type,) if media_type else ("movie", "tv"):
+        source = TITLE_SOURCES[type_name]
+        conditions = []
+        if since is not None:
+            conditions.append(source["since"])
+        if cursor:
+            conditions.append(_title_after(type_name, params["after_1"]))
+        keys = ", ".join(source["index"])
+        branches.append(
+            f"""(
+            SELECT {_select_list(fields, TITLE_FIELDS[type_name], source["keys"])}
+            FROM {source["from"]}
+            WHERE {" AND ".join(conditions) or "TRUE"}
+            ORDER BY {keys}
+            LIMIT %(limit)s
+            )"""
+        )
+
+    sql = f"""
+        SELECT *
+        FROM ({" UNION ALL ".join(branches)}) page
+        ORDER BY _k0::timestamp, _k1, _k2::int
+        LIMIT %(limit)s
+    """
+    return sql, params
+
+
+def episodes_query(series_id, fields, cursor=None, limit=DEFAULT_LIMIT):
+    """SQL and params for one page of a series' episodes, in airing order."""
+    params = {"series_id": series_id, "limit": clamp_limit(limit) + 1}
+    params.update(_after_params(cursor, EPISODE_KEY_TYPES))
+
+    conditions = ["ss.series_id = %(series_id)s"]
+    if cursor:
+        conditions.append(_keyset_condition(EPISODE_KEYS, EPISODE_KEY_TYPES))
+
+    sql = f"""
+        SELECT {_select_list(fields, EPISODE_FIELDS, EPISODE_KEYS)}
+        FROM series_seasons ss
+        JOIN series_episodes se ON se.season_id = ss.season_id
+        WHERE {" AND ".join(conditions)}
+        ORDER BY {", ".join(EPISODE_KEYS)}
+        LIMIT %(limit)s
+    """
+    return sql, params
+
+
+def logs_query(
+    fields, content_type=None, content_id=None, since=None, cursor=None, limit=DEFAULT_LIMIT
+):
+    """SQL and params for one page of update_logs, oldest first."""
+    if content_id is not None and content_type is None:
+        raise ValueError("content_id needs content_type")
+
+    params = {
+        "content_type": content_type,
+        "content_id": content_id,
+        "since": since,
+        "limit": clamp_limit(limit) + 1,
+    }
+    params.update(_after_params(cursor, LOG_KEY_TYPES))
+
+    conditions = []
+    if content_type is not None:
+        conditions.append("l.content_type = %(content_type)s")
+    if content_id is not None:
+        conditions.append("l.content_id = %(content_id)s")
+    if since is not None:
+        conditions.append('l."timestamp" >= %(since)s')
+    if cursor:
+        conditions.append(_keyset_condition(LOG_KEYS, LOG_KEY_TYPES))
+
+    sql = f"""
+        SELECT {_select_list(fields, LOG_FIELDS, LOG_KEYS)}
+        FROM update_logs l
+        WHERE {" AND ".join(conditions) or "TRUE"}
+        ORDER BY {", ".join(LOG_KEYS)}
+        LIMIT %(limit)s
+    """
+    return sql, params
+
+
+def series_exists(series_id, conn=None):
+    with dict_cursor(conn) as cur:
+        cur.execute("SELECT 1 FROM series WHERE series_id = %s", (series_id,))
+        return cur.fetchone() is not None
+
+
+def _json_default(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+def _page_chunks(sql, params, fields, limit, cursor, fetch_size):
+    conn = get_connection()
+    try:
+        with conn.cursor(
+            name="api_page", cursor_factory=psycopg2.extras.RealDictCursor
+        ) as cur:
+            cur.itersize = fetch_size
+            cur.execute(sql, params)
+            first_rows = cur.fetchmany(fetch_size)
+
+            yield '{"results": ['
+            served, last_keys, has_more = 0, None, False
+            for row in itertools.chain(first_rows, cur):
+                if served == limit:
+                    has_more = True
+                    break
+                item = {name: row[name] for name in fields}
+                yield ("," if served else "") + json.dumps(item, default=_json_default)
+                served += 1
+                last_keys = [value for key, value in row.items() if key.startswith("_k")]
+
+            next_cursor = encode_cursor(last_keys) if last_keys else cursor
+            yield f'], "next_cursor": {json.dumps(next_cursor)}, "has_more": {json.dumps(has_more)}}}'
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        release_connection(conn)
+
+
+def stream_page(sql, params, fields, limit, cursor=None, fetch_size=500):
+    """
+    Returns the chunks of one JSON document, {"results": [...],
+    "next_cursor": ..., "has_more": ...}. Rows come from a named
+    (server-side) cursor on a connection of its own, so memory stays flat
+    and the request's session can close. next_cursor is always the position
+    after the last row served (or the one passed in), so a client that has
+    caught up can keep polling with it.
+
+    The query runs, and its first rows are fetched, before this returns: a
+    failing query raises here, while the route can still answer with an
+    error, instead of cutting off a response already sent as 200.
+    """
+    chunks = _page_chunks(sql, params, fields, clamp_limit(limit), cursor, fetch_size)
+    return itertools.chain([next(chunks)], chunks)
@@ -0,0 +1,117 @@
+# services/content_similarity.py
+"""
+"More like this" from what titles are about: movie overviews and taglines,
+series overviews.
+
+Text is turned into hashed TF-IDF vectors (words and word pairs hashed into
+N_FEATURES columns, so there is no vocabulary to build or store), rows are
+L2-normalised and cosine similarity is one sparse product per batch.
+Terms in a single document or in more than MAX_DF of them carry no signal
+and are dropped, which also keeps the products sparse at 100k+ titles.
+"""
+
+import re
+import zlib
+
+import numpy as np
+from scipy import sparse
+
+from services.neighbours import NeighbourModel, fetch_rows, normalize_rows
+
+N_FEATURES = 2**20
+MAX_DF = 0.2
+# Cosine below this is shared filler words, not shared subject matter
+MIN_SIMILARITY = 0.05
+POPULARITY_WEIGHT = 0.001
+
+TEXT_QUERIES = {
+    "movie": """
+        SELECT movie_id, CONCAT_WS(' ', overview, tagline), COALESCE(popularity, 0)
+        FROM movies
+    """,
+    "tv": "SELECT series_id, COALESCE(overview, ''), COALESCE(popularity, 0) FROM series",
+}
+
+STOP_WORDS = frozenset(
+    """
+    a about after again against all also an and any are as at be because been
+    before being between both but by can could did do does doing down during
+    each few for from further had has have having he her here hers him his how
+    i if in into is it its itself just me more most my no nor not now of off on
+    once only or other our out over own same she should so some such than that
+    the their them then there these they this those through to too under until
+    up very was we were what when where which while who whom why will with
+    would you your
+    """.split()
+)
+
+_WORD = re.compile(r"[^\W_]+(?:'[^\W_]+)?")
+
+
+def tokenize(text):
+    """Lower-cased words, minus stop words and single letters."""
+    return [
+        word
+        for word in _WORD.findall((text or "").casefold())
+        if len(word) > 1 and word not in STOP_WORDS
+    ]
+
+
+def hashed_features(text):
+    """Column numbers for the words and adjacent word pairs of `text`."""
+    words = tokenize(text)
+    terms = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+    return [zlib.crc32(term.encode()) & (N_FEATURES - 1) for term in terms]
+
+
+def tfidf_matrix(texts):
+    """Row-normalised hashed TF-IDF (sublinear tf) for a list of texts."""
+    indptr, indices = [0], []
+    for text in texts:
+        indices.extend(hashed_features(text))
+        indptr.append(len(indices))
+
+    counts = sparse.csr_matrix(
+        (
+            np.ones(len(indices), dtype=np.float32),
+            np.asarray(indices, dtype=np.int32),
+            np.asarray(indptr, dtype=np.int64),
+        ),
+        shape=(len(texts), N_FEATURES),
+    )
+    counts.sum_duplicates()
+    counts.data = 1 + np.log(counts.data)
+
+    documents = max(len(texts), 1)
+    document_frequency = np.bincount(counts.indices, minlength=N_FEATURES)
+    idf = np.log((1 + documents) / (1 + document_frequency)) + 1
+    idf[(document_frequency < 2) | (document_frequency > MAX_DF * documents)] = 0
+
+    weighted = counts @ sparse.diags(idf.astype(np.float32))
+    weighted.eliminate_zeros()
+    return normalize_rows(weighted)
+
+
+class ContentModel(NeighbourModel):
+    """Hashed TF-IDF vectors of every title's text for one media type."""
+
+    def __init__(self, conn, media_type):
+        titles = fetch_rows(conn, TEXT_QUERIES[media_type])
+        super().__init__([t[0] for t in titles], [float(t[2]) for t in titles])
+        self.vectors = tfidf_matrix([t[1] for t in titles])
+        self.vectors_t = self.vectors.T.tocsr()
+
+    def affected(self, rows):
+        """`rows` plus every title similar enough to one of them to list it."""
+        linked = [rows]
+        for offset in range(0, len(rows), 1000):
+            linked.append(np.unique(self.score(rows[offset : offset + 1000]).indices))
+        return np.unique(np.concatenate(linked)).astype(np.int64)
+
+    def score(self, rows):
+        """Sparse (len(rows) × titles) cosine similarities above MIN_SIMILARITY."""
+        scores = (self.vectors[rows] @ self.vectors_t).tocsr()
+        scores.data[scores.data < MIN_SIMILARITY] = 0
+        scores.eliminate_zeros()
+        scores.data += POPULARITY_WEIGHT * self.popularity[scores.indices]
+        return scores
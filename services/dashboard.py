@@ -0,0 +1,216 @@
+# services/dashboard.py
+
+from config.settings import DASHBOARD_FRESH_HOURS, DASHBOARD_STALE_HOURS
+from db.helpers import dict_cursor
+from services.missing_titles import MISSING_FIELDS
+
+# Advisory lock serializing compaction and reconciliation
+LOCK_KEY = 7_314_003
+
+# count keys → the names the stats templates use
+COUNT_FIELDS = {
+    "movies": "movie_count",
+    "series": "series_count",
+    "series_seasons": "season_count",
+    "series_episodes": "episode_count",
+    "movie_cast": "movie_cast_count",
+    "series_cast": "series_cast_count",
+    "people": "people_count",
+}
+
+# missing_* metrics → the all_stats.sql keys the stats templates use
+MISSING_METRICS = {
+    "missing_movie": ("movies_missing_fields", MISSING_FIELDS["movie"]),
+    "missing_tv": ("series_missing_fields", MISSING_FIELDS["tv"]),
+}
+
+TOP_FIELDS_LIMIT = 5
+
+# Base counters plus deltas not folded in yet
+COUNTERS_QUERY = """
+    SELECT metric, key, SUM(value) AS value, MAX(last_at) AS last_at
+    FROM (
+        SELECT metric, key, value, last_at FROM dashboard_counters
+        WHERE metric IN ('count', 'field_changes', 'missing_movie', 'missing_tv')
+        UNION ALL
+        SELECT metric, key, delta, last_at FROM dashboard_counter_deltas
+        WHERE metric IN ('count', 'field_changes', 'missing_movie', 'missing_tv')
+    ) c
+    GROUP BY metric, key
+"""
+
+FRESHNESS_QUERY = """
+    WITH hours AS (
+        SELECT key::timestamp AS hour, SUM(value) AS titles
+        FROM (
+            SELECT key, value FROM dashboard_counters WHERE metric = 'freshness'
+            UNION ALL
+            SELECT key, delta FROM dashboard_counter_deltas WHERE metric = 'freshness'
+        ) f
+        WHERE key <> 'never'
+        GROUP BY key
+    ),
+    edges AS (
+        SELECT
+            LOCALTIMESTAMP - make_interval(hours => %(fresh)s) AS fresh_after,
+            LOCALTIMESTAMP - make_interval(hours => %(stale)s) AS stale_after
+    )
+    SELECT
+        COALESCE(SUM(titles) FILTER (WHERE hour >= fresh_after), 0) AS fresh,
+        COALESCE(
+            SUM(titles) FILTER (WHERE hour < fresh_after AND hour >= stale_after), 0
+        ) AS stale,
+        COALESCE(SUM(titles) FILTER (WHERE hour < stale_after), 0) AS old
+    FROM hours, edges
+"""
+
+# Folds every visible delta into the base rows in one statement. Deltas
+# from transactions still in flight aren't visible, so they stay behind.
+COMPACT_QUERY = """
+    WITH moved AS (
+        DELETE FROM dashboard_counter_deltas
+        RETURNING metric, key, delta, last_at
+    )
+    INSERT INTO dashboard_counters AS c (metric, key, value, last_at)
+    SELECT metric, key, SUM(delta), MAX(last_at)
+    FROM moved
+    GROUP BY metric, key
+    ON CONFLICT (metric, key) DO UPDATE
+    SET value = c.value + EXCLUDED.value,
+        last_at = GREATEST(c.last_at, EXCLUDED.last_at)
+"""
+
+DRIFT_QUERY = """
+    WITH current AS (
+        SELECT metric, key, SUM(value) AS value
+        FROM (
+            SELECT metric, key, value FROM dashboard_counters
+            UNION ALL
+            SELECT metric, key, delta FROM dashboard_counter_deltas
+        ) c
+        GROUP BY metric, key
+    )
+    SELECT
+        COALESCE(t.metric, c.metric) AS metric,
+        COALESCE(t.key, c.key) AS key,
+        COALESCE(t.value, 0) AS expected,
+        COALESCE(c.value, 0) AS actual
+    FROM dashboard_counter_truth() t
+    FULL JOIN current c ON c.metric = t.metric AND c.key = t.key
+    WHERE COALESCE(t.value, 0) <> COALESCE(c.value, 0)
+    ORDER BY 1, 2
+"""
+
+
+def get_dashboard_counters(conn=None):
+    """
+    Counts, last update, top changed fields, freshness buckets and missing
+    field totals, shaped like the matching keys of all_stats.sql.
+    """
+    with dict_cursor(conn) as cursor:
+        cursor.execute(COUNTERS_QUERY)
+        rows = cursor.fetchall()
+        cursor.execute(
+            FRESHNESS_QUERY,
+            {"fresh": DASHBOARD_FRESH_HOURS, "stale": DASHBOARD_STALE_HOURS},
+        )
+        freshness = cursor.fetchone()
+
+    counters = {field: 0 for field in COUNT_FIELDS.values()}
+    missing = {
+        name: {field: 0 for field in fields}
+        for name, fields in MISSING_METRICS.values()
+    }
+    field_changes = []
+    last_update = None
+
+    for row in rows:
+        if row["metric"] == "count":
+            if row["key"] in COUNT_FIELDS:
+                counters[COUNT_FIELDS[row["key"]]] = int(row["value"])
+            elif row["key"] == "update_logs":
+                last_update = row["last_at"]
+        elif row["metric"] in MISSING_METRICS:
+            name, fields = MISSING_METRICS[row["metric"]]
+            if row["key"] in fields:
+                missing[name][row["key"]] = int(row["value"])
+        elif row["value"] > 0:
+            field_changes.append({"field_name": row["key"], "freq": int(row["value"])})
+
+    field_changes.sort(key=lambda f: (-f["freq"], f["field_name"]))
+
+    return {
+        **counters,
+        **missing,
+        "last_update": last_update,
+        "top_fields": field_changes[:TOP_FIELDS_LIMIT],
+        "freshness": {k: int(v) for k, v in freshness.items()},
+    }
+
+
+def compact_counter_deltas(conn):
+    """
+    Moves pending deltas into dashboard_counters. Returns False if a
+    compaction or reconciliation is already running.
+    """
+    with conn.cursor() as cur:
+        cur.execute("SELECT pg_try_advisory_xact_lock(%s)", (LOCK_KEY,))
+        if not cur.fetchone()[0]:
+            conn.rollback()
+            return False
+        cur.execute(COMPACT_QUERY)
+        cur.execute(
+            "DELETE FROM dashboard_counters WHERE value = 0 AND metric <> 'count'"
+        )
+    conn.commit()
+    return True
+
+
+def reconcile_dashboard_counters(conn, fix=True):
+    """
+    Recomputes every counter from scratch and returns the ones that drifted
+    as dicts of metric, key, expected, actual and drift. With fix=True the
+    base counters are replaced by the recomputed values.
+
+    Everything runs in one REPEATABLE READ snapshot: the deltas it folds
+    away are exactly those whose rows it counted, and deltas committed
+    meanwhile stay queued on top of the new base.
+    """
+    with conn.cursor() as cur:
+        cur.execute("SELECT pg_advisory_lock(%s)", (LOCK_KEY,))
+    conn.commit()
+
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+            cur.execute(DRIFT_QUERY)
+            drift = [
+                {
+                    "metric": metric,
+                    "key": key,
+                    "expected": int(expected),
+                    "actual": int(actual),
+                    "drift": int(actual) - int(expected),
+                }
+                for metric, key, expected, actual in cur.fetchall()
+            ]
+
+            if fix:
+                cur.execute("DELETE FROM dashboard_counter_deltas")
+                cur.execute("DELETE FROM dashboard_counters")
+                cur.execute(
+                    """
+                    INSERT INTO dashboard_counters (metric, key, value, last_at)
+                    SELECT metric, key, value, last_at
+                    FROM dashboard_counter_truth()
+                    """
+                )
+        conn.commit()
+        return drift
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        with conn.cursor() as cur:
+            cur.execute("SELECT pg_advisory_unlock(%s)", (LOCK_KEY,))
+        conn.commit()
@@ -12,46 +12,70 @@ def wrap_query(name: str, query_fn):
 
     try:
         result = query_fn()
-        duration = round((time.time() - start) * 1000, 2)  # ms
-
-        diagnostics.update(
-            {
-                "data": result,
-                "record_count": len(result),
-                "duration_ms": duration,
-                "status": "ok",
-            }
-        )
-
-        # Optional freshness check
-        if result and isinstance(result[0], dict) and "updated_at" in result[0]:
-            updated_times = [r["updated_at"] for r in result if r.get("updated_at")]
-            if updated_times:
-                diagnostics["freshness"] = max(updated_times)
-
-        # Optional volatility check
-        if result and isinstance(result[0], dict):
-            diagnostics["volatility"] = compute_volatility(result)
-
-        # Optional SQL string if query_fn exposes it
-        if hasattr(query_fn, "__name__"):
-            diagnostics["query_name"] = query_fn.__name__
+        record_result(diagnostics, result, start, query_fn)
+    except Exception as e:
+        record_error(diagnostics, e)
+
+    return diagnostics
+
+
+async def wrap_query_async(name: str, query_fn):
+    """Same as wrap_query, for a query_fn returning an awaitable."""
+    start = time.time()
+    diagnostics = {
+        "label": name,
+        "last_fetched": datetime.utcnow().isoformat(),
+    }
 
+    try:
+        result = await query_fn()
+        record_result(diagnostics, result, start, query_fn)
     except Exception as e:
-        diagnostics.update(
-            {
-                "data": [],
-                "record_count": 0,
-                "duration_ms": None,
-                "status": "error",
-                "error": str(e),
-                "traceback": traceback.format_exc(),
-            }
-        )
+        record_error(diagnostics, e)
 
     return diagnostics
 
 
+def record_result(diagnostics, result, start, query_fn):
+    duration = round((time.time() - start) * 1000, 2)  # ms
+
+    diagnostics.update(
+        {
+            "data": result,
+            "record_count": len(result),
+            "duration_ms": duration,
+            "status": "ok",
+        }
+    )
+
+    # Optional freshness check
+    if result and isinstance(result[0], dict) and "updated_at" in result[0]:
+        updated_times = [r["updated_at"] for r in result if r.get("updated_at")]
+        if updated_times:
+            diagnostics["freshness"] = max(updated_times)
+
+    # Optional volatility check
+    if result and isinstance(result[0], dict):
+        diagnostics["volatility"] = compute_volatility(result)
+
+    # Optional SQL string if query_fn exposes it
+    if hasattr(query_fn, "__name__"):
+        diagnostics["query_name"] = query_fn.__name__
+
+
+def record_error(diagnostics, e):
+    diagnostics.update(
+        {
+            "data": [],
+            "record_count": 0,
+            "duration_ms": None,
+            "status": "error",
+            "error": str(e),
+            "traceback": traceback.format_exc(),
+        }
+    )
+
+
 def compute_volatility(rows):
     from statistics import stdev, mean
 
@@ -1,42 +1,194 @@
-from db.connection import get_connection, release_connection
-from datetime import datetime, timedelta
-from zoneinfo import ZoneInfo
+# services/freshness.py
+"""
+How recently titles were synced, bucketed by the age of last_updated.
+
+Buckets come from FRESHNESS_BUCKETS and every classification happens in
+SQL against LOCALTIMESTAMP, the clock the uploaders stamp last_updated
+with. Totals are one range count per bucket on the last_updated indexes
+(page_versions.sql); the stalest-first listing and the CSV export walk the
+(last_updated, id) indexes from api_keysets.sql.
+"""
+
+import csv
+import io
+import re
+
 import psycopg2.extras
 
+from config.settings import FRESHNESS_BUCKETS
+from db.connection import get_connection, release_connection
 from db.helpers import dict_cursor
+from services.api import clamp_limit, encode_cursor, titles_query
+
+PAGE_SIZE = 100
+
+TABLES = {"movie": "movies", "tv": "series"}
+
+LISTING_FIELDS = ("id", "type", "title", "last_updated")
+
+EXPORT_COLUMNS = ("type", "id", "title", "last_updated", "bucket")
+
+
+def parse_buckets(spec):
+    """'fresh:24,stale:168' → [("fresh", 24), ("stale", 168)], newest first."""
+    buckets = []
+    for part in spec.split(","):
+        name, _, hours = part.strip().partition(":")
+        if not re.fullmatch(r"[a-z_]+", name) or not hours.isdigit():
+            raise ValueError(f"Invalid freshness bucket: {part!r}")
+        buckets.append((name, int(hours)))
+    return sorted(buckets, key=lambda b: b[1])
+
+
+BUCKETS = parse_buckets(FRESHNESS_BUCKETS)
+
+# Every bucket a title can land in, newest first
+BUCKET_NAMES = [name for name, _ in BUCKETS] + ["old", "never"]
+
+
+def _edge(hours):
+    return f"LOCALTIMESTAMP - make_interval(hours => {hours})"
+
+
+def bucket_sql(column):
+    """A CASE expression naming the bucket of timestamp `column`."""
+    whens = " ".join(
+        f"WHEN {column} >= {_edge(hours)} THEN '{name}'" for name, hours in BUCKETS
+    )
+    return f"CASE WHEN {column} IS NULL THEN 'never' {whens} ELSE 'old' END"
+
+
+def _bucket_ranges():
+    """(name, WHERE clause) per bucket, as index range conditions."""
+    ranges, newer = [], None
+    for name, hours in BUCKETS:
+        condition = f"last_updated >= {_edge(hours)}"
+        if newer:
+            condition += f" AND last_updated < {newer}"
+        ranges.append((name, condition))
+        newer = _edge(hours)
+    ranges.append(("old", f"last_updated < {newer}"))
+    ranges.append(("never", "last_updated IS NULL"))
+    return ranges
 
-def classify_freshness(last_updated):
-    if not last_updated:
-        return "stale"
-    now = datetime.utcnow()
-    delta = now - last_updated
-    if delta <= timedelta(days=7):
-        return "fresh"
-    elif delta <= timedelta(days=30):
-        return "moderate"
-    else:
-        return "stale"
-
-def format_local(dt, fmt="%d %b %Y, %H:%M"):
-    if not isinstance(dt, datetime):
-        return "Unknown"
-    return dt.astimezone(ZoneInfo("Europe/London")).strftime(fmt)
-
-def get_freshness_summary():
-    query = """
-        SELECT movie_title, last_updated FROM movies WHERE last_updated IS NOT NULL;
+
+def summary_query():
+    counts = [
+        f"SELECT '{media_type}' AS media_type, '{name}' AS bucket, COUNT(*) AS titles "
+        f"FROM {table} WHERE {condition}"
+        for media_type, table in TABLES.items()
+        for name, condition in _bucket_ranges()
+    ]
+    return "\nUNION ALL\n".join(counts)
+
+
+def get_freshness_summary(conn=None):
+    """
+    Titles per bucket for movies, series and both, as
+    {"movie": {bucket: n}, "tv": {...}, "total": {...}}, buckets newest first.
+    """
+    summary = {
+        key: {name: 0 for name in BUCKET_NAMES} for key in (*TABLES, "total")
+    }
+    with dict_cursor(conn) as cursor:
+        cursor.execute(summary_query())
+        for row in cursor.fetchall():
+            summary[row["media_type"]][row["bucket"]] = row["titles"]
+            summary["total"][row["bucket"]] += row["titles"]
+    return summary
+
+
+def get_stalest_titles(media_type=None, cursor=None, limit=PAGE_SIZE, conn=None):
+    """
+    One page of titles, least recently synced first (never-synced ones
+    lead). Returns (rows, next_cursor); raises ValueError for a bad type or
+    cursor.
     """
-    with dict_cursor() as cursor:
-        cursor.execute(query)
-        rows = cursor.fetchall()
+    limit = clamp_limit(limit)
+    sql, params = titles_query(
+        LISTING_FIELDS, media_type=media_type, cursor=cursor, limit=limit
+    )
+    with dict_cursor(conn) as cur:
+        cur.execute(
+            f"""
+            SELECT page.*, {bucket_sql("page.last_updated")} AS bucket
+            FROM ({sql}) page
+            ORDER BY _k0::timestamp, _k1, _k2::int
+            """,
+            params,
+        )
+        rows = cur.fetchall()
 
-    results = []
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([rows[-1][f"_k{i}"] for i in range(3)])
     for row in rows:
-        category = classify_freshness(row["last_updated"])
-        results.append({
-            "title": row["movie_title"],
-            "freshness": category,
-            "last_updated": format_local(row["last_updated"])
-        })
-
-    return results
+        for i in range(3):
+            del row[f"_k{i}"]
+    return rows, next_cursor
+
+
+EXPORT_BRANCHES = {
+    "movie": "SELECT 'movie'::text AS type, movie_id AS id, movie_title AS title, "
+    "last_updated FROM movies",
+    "tv": "SELECT 'tv'::text AS type, series_id AS id, series_name AS title, "
+    "last_updated FROM series",
+}
+
+
+def export_query(media_type=None):
+    # Typed constants and no per-branch filters keep this a merge of two
+    # index scans rather than a sort of every title
+    branches = [EXPORT_BRANCHES[media_type]] if media_type else EXPORT_BRANCHES.values()
+    return f"""
+        SELECT type, id, title, last_updated, {bucket_sql("last_updated")} AS bucket
+        FROM ({" UNION ALL ".join(branches)}) t
+        ORDER BY COALESCE(last_updated, '-infinity'::timestamp), type, id
+    """
+
+
+def stream_freshness_csv(media_type=None, fetch_size=1000):
+    """
+    Yields the freshness report as CSV, stalest first, a chunk of lines at
+    a time. Like services.api.stream_page it reads through a named cursor
+    on its own connection, so the export never sits in memory.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush():
+        chunk = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return chunk
+
+    conn = get_connection()
+    try:
+        with conn.cursor(
+            name="freshness_export", cursor_factory=psycopg2.extras.DictCursor
+        ) as cur:
+            cur.itersize = fetch_size
+            cur.execute(export_query(media_type))
+
+            writer.writerow(EXPORT_COLUMNS)
+            for count, row in enumerate(cur, 1):
+                last_updated = row["last_updated"]
+                writer.writerow(
+                    (
+                        row["type"],
+                        row["id"],
+                        row["title"],
+                        last_updated.isoformat() if last_updated else "",
+                        row["bucket"],
+                    )
+                )
+                if count % fetch_size == 0:
+                    yield flush()
+            yield flush()
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        release_connection(conn)
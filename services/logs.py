@@ -2,34 +2,36 @@
 
 from datetime import datetime
 
+PREVIOUS_LOG_TIMESTAMP_QUERY = """
+    SELECT MAX(timestamp)
+    FROM update_logs
+    WHERE content_id = %s AND content_type = %s;
+"""
+
+NEW_UPDATE_LOGS_QUERY = """
+    SELECT timestamp, update_type, field_name, previous_value, current_value
+    FROM update_logs
+    WHERE content_id = %s AND content_type = %s AND timestamp > %s
+    ORDER BY timestamp DESC;
+"""
+
 
 def get_previous_log_timestamp(conn, content_id, content_type):
     with conn.cursor() as cur:
-        cur.execute(
-            """
-            SELECT MAX(timestamp)
-            FROM update_logs
-            WHERE content_id = %s AND content_type = %s;
-            """,
-            (content_id, content_type),
-        )
+        cur.execute(PREVIOUS_LOG_TIMESTAMP_QUERY, (content_id, content_type))
         result = cur.fetchone()
         return result[0] or datetime.min
 
 
 def fetch_new_update_logs(conn, content_id, content_type, since):
     with conn.cursor() as cur:
-        cur.execute(
-            """
-            SELECT timestamp, update_type, field_name, previous_value, current_value
-            FROM update_logs
-            WHERE content_id = %s AND content_type = %s AND timestamp > %s
-            ORDER BY timestamp DESC;
-            """,
-            (content_id, content_type, since),
-        )
+        cur.execute(NEW_UPDATE_LOGS_QUERY, (content_id, content_type, since))
         logs = cur.fetchall()
 
+    return shape_update_logs(logs)
+
+
+def shape_update_logs(logs):
     return [
         {
             "timestamp": log[0],
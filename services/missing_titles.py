@@ -1,13 +1,56 @@
-from db.connection import get_connection, release_connection
-import psycopg2.extras
-
+from config.settings import MISSING_PAGE_SIZE
 from db.helpers import dict_cursor
 
-def get_titles_missing(field: str):
-    column = FIELD_MAP.get(field)
-    if not column:
+# field → missing_mask bit, as in queries/schema/missing_fields.sql
+MISSING_FIELDS = {
+    "movie": {
+        "missing_overview": 1,
+        "missing_release_date": 2,
+        "missing_runtime": 4,
+        "missing_poster_path": 8,
+        "missing_original_language": 16,
+        "missing_status": 32,
+        "missing_imdb": 64,
+        "missing_budget": 128,
+        "missing_revenue": 256,
+        "missing_tagline": 512,
+    },
+    "tv": {
+        "missing_overview": 1,
+        "missing_first_air_date": 2,
+        "missing_runtime": 4,
+        "missing_poster_path": 8,
+        "missing_original_language": 16,
+        "missing_status": 32,
+        "missing_imdb": 64,
+        "missing_network": 128,
+        "missing_seasons": 256,
+        "missing_episodes": 512,
+    },
+}
+
+# Older /missing_tv links
+MISSING_FIELD_ALIASES = {
+    "tv": {
+        "missing_number_of_seasons": "missing_seasons",
+        "missing_number_of_episodes": "missing_episodes",
+    },
+}
+
+
+def missing_condition(media_type: str, field: str, alias: str):
+    """
+    The WHERE clause for titles missing `field`. The bit is inlined so the
+    planner can match the field's partial index.
+    """
+    field = MISSING_FIELD_ALIASES.get(media_type, {}).get(field, field)
+    bit = MISSING_FIELDS[media_type].get(field)
+    if not bit:
         raise ValueError(f"Invalid field: {field}")
+    return f"{alias}.missing_mask & {bit} <> 0"
+
 
+def missing_query(field: str):
     query = f"""
         SELECT
             m.movie_id,
@@ -23,21 +66,25 @@ def get_titles_missing(field: str):
             m.tagline
         FROM movies m
         LEFT JOIN movie_metadata mm ON mm.movie_id = m.movie_id
-        WHERE m.{column} IS NULL OR m.{column} = ''
+        WHERE {missing_condition("movie", field, "m")}
+          AND m.movie_id > %(after)s
+        ORDER BY m.movie_id
+        LIMIT %(limit)s
     """
-    with dict_cursor() as cursor:
-        cursor.execute(query)
-        return cursor.fetchall()
-
-FIELD_MAP = {
-    "missing_overview": "overview",
-    "missing_release_date": "release_date",
-    "missing_runtime": "runtime",
-    "missing_poster_path": "poster_path",
-    "missing_original_language": "original_language",
-    "missing_status": "status",
-    "missing_imdb": "imdb_id",
-    "missing_budget": "budget",
-    "missing_revenue": "revenue",
-    "missing_tagline": "tagline"
-}
+    return query
+
+
+def next_page(rows, limit, id_key):
+    """Trims the look-ahead row; returns (rows, id to continue after or None)."""
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, rows[-1][id_key]
+    return rows, None
+
+
+def get_titles_missing(field: str, conn=None, after=0, limit=MISSING_PAGE_SIZE):
+    """One page of movies missing `field`, by id. Returns (rows, next_after)."""
+    query = missing_query(field)
+    with dict_cursor(conn) as cursor:
+        cursor.execute(query, {"after": after, "limit": limit + 1})
+        return next_page(cursor.fetchall(), limit, "movie_id")
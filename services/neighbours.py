@@ -0,0 +1,198 @@
+# services/neighbours.py
+"""
+Storage and bookkeeping shared by the offline related-title jobs
+(services/related.py and friends): run watermarks, which titles changed
+since the last run, top-K selection and writing title_neighbours.
+"""
+
+import numpy as np
+import psycopg2.extras
+from scipy import sparse
+
+TITLE_TABLES = {
+    "movie": ("movies", "movie_id"),
+    "tv": ("series", "series_id"),
+}
+
+
+def start_run(conn, media_type, method, mode):
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            INSERT INTO title_neighbour_runs (media_type, method, mode)
+            VALUES (%s, %s, %s)
+            RETURNING run_id, started_at
+            """,
+            (media_type, method, mode),
+        )
+        run_id, started_at = cur.fetchone()
+    conn.commit()
+    return run_id, started_at
+
+
+def finish_run(conn, run_id, titles_scored):
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            UPDATE title_neighbour_runs
+            SET finished_at = NOW(), titles_scored = %s
+            WHERE run_id = %s
+            """,
+            (titles_scored, run_id),
+        )
+    conn.commit()
+
+
+def last_watermark(conn, media_type, method):
+    """started_at of the latest finished run, or None if there wasn't one."""
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            SELECT started_at
+            FROM title_neighbour_runs
+            WHERE media_type = %s AND method = %s AND finished_at IS NOT NULL
+            ORDER BY started_at DESC
+            LIMIT 1
+            """,
+            (media_type, method),
+        )
+        row = cur.fetchone()
+    return row[0] if row else None
+
+
+def touched_since(conn, media_type, since):
+    """IDs of titles synced (last_updated) after `since`."""
+    table, id_column = TITLE_TABLES[media_type]
+    with conn.cursor() as cur:
+        cur.execute(
+            f"SELECT {id_column} FROM {table} WHERE last_updated >= %s::timestamptz",
+            (since,),
+        )
+        return [row[0] for row in cur.fetchall()]
+
+
+def prune_missing(conn, media_type, method):
+    """Drops neighbour lists of titles that no longer exist."""
+    table, id_column = TITLE_TABLES[media_type]
+    with conn.cursor() as cur:
+        cur.execute(
+            f"""
+            DELETE FROM title_neighbours n
+            WHERE n.media_type = %s AND n.method = %s
+              AND NOT EXISTS (SELECT 1 FROM {table} t WHERE t.{id_column} = n.title_id)
+            """,
+            (media_type, method),
+        )
+        removed = cur.rowcount
+    conn.commit()
+    return removed
+
+
+def normalize_rows(matrix):
+    """Scales each row of a sparse matrix to unit length (empty rows stay empty)."""
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return (sparse.diags(1.0 / norms) @ matrix).tocsr()
+
+
+def scale_popularity(values):
+    """log1p popularity scaled to 0..1, for breaking ties between equal scores."""
+    popularity = np.log1p(np.asarray(values, dtype=np.float64))
+    if len(popularity) and popularity.max() > 0:
+        popularity /= popularity.max()
+    return popularity
+
+
+def fetch_rows(conn, query, params=None):
+    with conn.cursor() as cur:
+        cur.execute(query, params)
+        return cur.fetchall()
+
+
+class NeighbourModel:
+    """
+    Base for the scoring models: one row per title (`ids`), `score(rows)`
+    returning a sparse rows × titles matrix and `affected(rows)` naming the
+    rows whose lists may change when `rows` change.
+    """
+
+    def __init__(self, ids, popularity):
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.row_of = {int(title_id): row for row, title_id in enumerate(self.ids)}
+        self.popularity = scale_popularity(popularity)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def rows_for(self, title_ids):
+        return np.asarray(
+            sorted(self.row_of[t] for t in set(title_ids) if t in self.row_of),
+            dtype=np.int64,
+        )
+
+    def affected(self, rows):
+        return rows
+
+    def score(self, rows):
+        raise NotImplementedError
+
+    def neighbours(self, rows, k):
+        ranked = top_k_rows(self.score(rows), k, exclude=rows)
+        return [(self.ids[columns], scores) for columns, scores in ranked]
+
+
+def top_k_rows(scores, k, exclude=None):
+    """
+    For each row of a CSR score matrix, the column indexes and scores of its
+    k best entries, best first. exclude[row] is a column to leave out (the
+    title itself). Rows with no positive score give empty arrays.
+    """
+    results = []
+    indptr, indices, data = scores.indptr, scores.indices, scores.data
+    for row in range(scores.shape[0]):
+        start, end = indptr[row], indptr[row + 1]
+        row_data = data[start:end]
+        row_cols = indices[start:end]
+        keep = row_data > 0
+        if exclude is not None:
+            keep &= row_cols != exclude[row]
+        row_data, row_cols = row_data[keep], row_cols[keep]
+        if len(row_data) > k:
+            best = np.argpartition(-row_data, k - 1)[:k]
+            row_data, row_cols = row_data[best], row_cols[best]
+        order = np.lexsort((row_cols, -row_data))
+        results.append((row_cols[order], row_data[order]))
+    return results
+
+
+def store_neighbours(conn, media_type, method, title_ids, neighbours, page_size=5000):
+    """
+    Replaces the stored neighbour lists for `title_ids` in one transaction.
+    `neighbours` is parallel to title_ids: (neighbour_ids, scores) each.
+    """
+    rows = [
+        (media_type, int(title_id), method, rank, int(neighbour_id), float(score))
+        for title_id, (neighbour_ids, scores) in zip(title_ids, neighbours)
+        for rank, (neighbour_id, score) in enumerate(zip(neighbour_ids, scores), start=1)
+    ]
+
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            DELETE FROM title_neighbours
+            WHERE media_type = %s AND method = %s AND title_id = ANY(%s)
+            """,
+            (media_type, method, [int(t) for t in title_ids]),
+        )
+        psycopg2.extras.execute_values(
+            cur,
+            """
+            INSERT INTO title_neighbours
+                (media_type, title_id, method, rank, neighbour_id, score)
+            VALUES %s
+            """,
+            rows,
+            page_size=page_size,
+        )
+    conn.commit()
+    return len(rows)
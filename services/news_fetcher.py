@@ -1,10 +1,47 @@
+# services/news_fetcher.py
+"""
+Film news from RSS feeds and NewsData.io, kept in news_articles.
+
+refresh_news polls every source whose last fetch is older than
+NEWS_MAX_AGE, all at once, each with its own timeout. Feeds are fetched
+with the validators of their last response, so an unchanged feed answers
+304 and is not parsed again. Articles are upserted by link, so the same
+story seen twice (or from two refreshes) is stored once. Pages read the
+store with get_latest_news and never wait on a source.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import List, Optional
+
 import feedparser
+import psycopg2.extras
 import requests
-from datetime import datetime, timezone
 from dateutil import parser
 from pydantic import BaseModel
-from typing import List, Callable, Optional
-from typing import Optional, List, Callable
+
+from config.settings import (
+    NEWS_FETCH_TIMEOUT,
+    NEWS_MAX_AGE,
+    NEWS_RETENTION_DAYS,
+    NEWSDATA_API_KEY,
+)
+from db.helpers import dict_cursor
+
+# pg_try_advisory_lock key, so only one web worker polls the sources
+REFRESH_LOCK_KEY = 7_314_005
+
+# Articles shown on the home page and /news
+NEWS_LIMIT = 15
+
+FEEDS = {
+    "Empire Online": "https://www.empireonline.com/movies/news/rss/",
+    "Screen Rant": "https://screenrant.com/feed/",
+}
+
+NEWSDATA_SOURCE = "NewsData.io"
+NEWSDATA_URL = "https://newsdata.io/api/1/news"
+
 
 class NewsArticle(BaseModel):
     title: str
@@ -13,72 +50,298 @@ class NewsArticle(BaseModel):
     source: str
 
 
-def parse_feed(url: str, source: str, limit: int = 5) -> List[NewsArticle]:
+LATEST_QUERY = """
+    SELECT title, link, published, source
+    FROM news_articles
+    ORDER BY published DESC
+    LIMIT %s
+"""
+
+SOURCES_QUERY = """
+    SELECT source, etag, modified, fetched_at, status, article_count, last_error
+    FROM news_sources
+    ORDER BY source
+"""
+
+
+def parse_published(value) -> datetime:
+    """Any feed date → aware UTC datetime; now if missing or unreadable."""
     try:
-        feed = feedparser.parse(url)
-        return [
-            NewsArticle(
-                title=entry.title,
-                link=entry.link,
-                published=parser.parse(entry.published),
-                source=source,
-            )
-            for entry in feed.entries[:limit]
-        ]
-    except Exception as e:
-        print(f"{source} fetch error: {e}")
-        return []
+        published = parser.parse(value) if value else None
+    except (ValueError, OverflowError):
+        published = None
+    if published is None:
+        return datetime.now(timezone.utc)
+    if published.tzinfo is None:
+        return published.replace(tzinfo=timezone.utc)
+    return published.astimezone(timezone.utc)
+
+
+def conditional_headers(etag=None, modified=None):
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if modified:
+        headers["If-Modified-Since"] = modified
+    return headers
+
+
+def fetch_feed(source, url, etag=None, modified=None, timeout=NEWS_FETCH_TIMEOUT):
+    """
+    One conditional GET of an RSS feed. Returns a fetch result: the HTTP
+    status, the articles (None on 304) and the validators to send next time.
+    """
+    response = requests.get(
+        url, headers=conditional_headers(etag, modified), timeout=timeout
+    )
+    if response.status_code == 304:
+        return {"source": source, "status": 304, "articles": None,
+                "etag": etag, "modified": modified}
+    response.raise_for_status()
+
+    feed = feedparser.parse(response.content)
+    articles = [
+        NewsArticle(
+            title=entry.get("title") or "Untitled",
+            link=entry.link,
+            published=parse_published(entry.get("published") or entry.get("updated")),
+            source=source,
+        )
+        for entry in feed.entries
+        if entry.get("link")
+    ]
+    return {
+        "source": source,
+        "status": response.status_code,
+        "articles": articles,
+        "etag": response.headers.get("ETag"),
+        "modified": response.headers.get("Last-Modified"),
+    }
 
 
-def fetch_empire_news() -> List[NewsArticle]:
-    return parse_feed("https://www.empireonline.com/movies/news/rss/", "Empire Online")
+def fetch_newsdata_io(api_key, etag=None, modified=None, timeout=NEWS_FETCH_TIMEOUT):
+    # The key goes in a header: request URLs end up in exception messages
+    response = requests.get(
+        NEWSDATA_URL,
+        params={"q": "movies", "language": "en"},
+        headers={"X-ACCESS-KEY": api_key, **conditional_headers(etag, modified)},
+        timeout=timeout,
+    )
+    if response.status_code == 304:
+        return {"source": NEWSDATA_SOURCE, "status": 304, "articles": None,
+                "etag": etag, "modified": modified}
+    response.raise_for_status()
 
+    raw_results = response.json().get("results", [])
+    if not isinstance(raw_results, list):
+        raise ValueError("Unexpected format from NewsData.io")
+
+    articles = [
+        NewsArticle(
+            title=item.get("title") or "Untitled",
+            link=item["link"],
+            published=parse_published(item.get("pubDate")),
+            source=NEWSDATA_SOURCE,
+        )
+        for item in raw_results
+        if item.get("link")
+    ]
+    return {
+        "source": NEWSDATA_SOURCE,
+        "status": response.status_code,
+        "articles": articles,
+        "etag": response.headers.get("ETag"),
+        "modified": response.headers.get("Last-Modified"),
+    }
+
+
+def source_fetchers(api_key=NEWSDATA_API_KEY):
+    """source → fetch(etag, modified) for every configured source."""
+    fetchers = {
+        source: (lambda etag, modified, source=source, url=url:
+                 fetch_feed(source, url, etag, modified))
+        for source, url in FEEDS.items()
+    }
+    if api_key:
+        fetchers[NEWSDATA_SOURCE] = (
+            lambda etag, modified: fetch_newsdata_io(api_key, etag, modified)
+        )
+    return fetchers
+
+
+def describe_error(e):
+    """
+    Exception class and HTTP status only. This text is logged, stored and
+    served by /api/news, and requests' own messages carry the request URL.
+    """
+    response = getattr(e, "response", None)
+    if response is not None:
+        return f"{type(e).__name__}: HTTP {response.status_code}"
+    return type(e).__name__
 
-def fetch_screenrant_news() -> List[NewsArticle]:
-    return parse_feed("https://screenrant.com/feed/", "Screen Rant")
 
+def fetch_sources(fetchers, validators):
+    """
+    Runs the fetchers concurrently. `validators` maps source → (etag,
+    modified). A source that fails comes back as {"source", "error"}
+    rather than holding up or sinking the others.
+    """
+    def run(source):
+        try:
+            return fetchers[source](*validators.get(source, (None, None)))
+        except Exception as e:
+            return {"source": source, "error": describe_error(e)}
 
-def fetch_newsdata_io(api_key: Optional[str] = None, limit: int = 5) -> List[NewsArticle]:
-    if not api_key:
-        print("NewsData.io API key missing")
+    if not fetchers:
         return []
+    with ThreadPoolExecutor(max_workers=len(fetchers)) as pool:
+        return list(pool.map(run, fetchers))
 
-    url = f"https://newsdata.io/api/1/news?apikey={api_key}&q=movies&language=en"
-    try:
-        response = requests.get(url).json()
-        raw_results = response.get("results", [])
-        if not isinstance(raw_results, list):
-            print("Unexpected format from NewsData.io")
-            return []
-
-        return [
-            NewsArticle(
-                title=item.get("title", "Untitled"),
-                link=item.get("link", "#"),
-                published=parser.parse(item.get("pubDate", datetime.utcnow().isoformat())),
-                source="NewsData.io"
+
+def due_sources(conn, sources, max_age=NEWS_MAX_AGE):
+    """The sources to poll now, with their stored validators."""
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            SELECT wanted.source, ns.etag, ns.modified
+            FROM unnest(%s::text[]) AS wanted (source)
+            LEFT JOIN news_sources ns ON ns.source = wanted.source
+            WHERE ns.fetched_at IS NULL
+               OR ns.fetched_at < NOW() - make_interval(secs => %s)
+            """,
+            (list(sources), max_age),
+        )
+        return {source: (etag, modified) for source, etag, modified in cur.fetchall()}
+
+
+def store_articles(conn, articles):
+    """
+    Upserts articles by link. A known link only takes a new title: its
+    published time stays as first stored, since undated entries are
+    stamped with the time they were fetched.
+    """
+    by_link = {article.link: article for article in articles}
+    rows = [(a.link, a.title, a.source, a.published) for a in by_link.values()]
+    if not rows:
+        return 0
+    with conn.cursor() as cur:
+        psycopg2.extras.execute_values(
+            cur,
+            """
+            INSERT INTO news_articles (link, title, source, published)
+            VALUES %s
+            ON CONFLICT (link) DO UPDATE
+            SET title = EXCLUDED.title
+            WHERE news_articles.title IS DISTINCT FROM EXCLUDED.title
+            """,
+            rows,
+        )
+    return len(rows)
+
+
+def record_fetch(conn, result):
+    with conn.cursor() as cur:
+        if "error" in result:
+            cur.execute(
+                """
+                INSERT INTO news_sources (source, fetched_at, last_error)
+                VALUES (%s, NOW(), %s)
+                ON CONFLICT (source)
+                DO UPDATE SET fetched_at = NOW(), last_error = EXCLUDED.last_error
+                """,
+                (result["source"], result["error"]),
             )
-            for item in raw_results[:limit]
-        ]
-    except Exception as e:
-        print(f"NewsData fetch error: {e}")
-        return []
+            return
+        cur.execute(
+            """
+            INSERT INTO news_sources
+                (source, etag, modified, fetched_at, status, article_count, last_error)
+            VALUES (%s, %s, %s, NOW(), %s, %s, NULL)
+            ON CONFLICT (source) DO UPDATE
+            SET etag = EXCLUDED.etag,
+                modified = EXCLUDED.modified,
+                fetched_at = NOW(),
+                status = EXCLUDED.status,
+                article_count = CASE WHEN EXCLUDED.status = 304
+                                     THEN news_sources.article_count
+                                     ELSE EXCLUDED.article_count END,
+                last_error = NULL
+            """,
+            (
+                result["source"],
+                result["etag"],
+                result["modified"],
+                result["status"],
+                len(result["articles"] or []),
+            ),
+        )
 
 
-def get_all_news(api_key: Optional[str] = None) -> List[NewsArticle]:
-    sources: List[Callable[[], List[NewsArticle]]] = [
-        fetch_empire_news,
-        fetch_screenrant_news,
-        lambda: fetch_newsdata_io(api_key)
-    ]
+def prune_articles(conn, days=NEWS_RETENTION_DAYS):
+    with conn.cursor() as cur:
+        cur.execute(
+            "DELETE FROM news_articles WHERE published < NOW() - make_interval(days => %s)",
+            (days,),
+        )
+
+
+def refresh_news(conn, force=False, api_key=NEWSDATA_API_KEY):
+    """
+    Polls every due source and stores what changed. Returns the number of
+    sources polled, or None if another process holds the refresh lock.
+    Failed sources keep their stored articles and are retried once
+    NEWS_MAX_AGE has passed again.
+    """
+    with conn.cursor() as cur:
+        cur.execute("SELECT pg_try_advisory_lock(%s)", (REFRESH_LOCK_KEY,))
+        locked = cur.fetchone()[0]
+    conn.commit()
+    if not locked:
+        return None
+
+    try:
+        fetchers = source_fetchers(api_key)
+        validators = due_sources(conn, fetchers, max_age=0 if force else NEWS_MAX_AGE)
+        conn.commit()
+        if not validators:
+            return 0
+
+        # No transaction is held open while the sources answer
+        results = fetch_sources(
+            {source: fetchers[source] for source in validators}, validators
+        )
+        for result in results:
+            if "error" in result:
+                print(f"⚠️ News source {result['source']} failed: {result['error']}")
+            elif result["articles"] is not None:
+                count = store_articles(conn, result["articles"])
+                print(f"📰 Stored {count} article(s) from {result['source']}")
+            record_fetch(conn, result)
+        prune_articles(conn)
+        conn.commit()
+        return len(results)
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        with conn.cursor() as cur:
+            cur.execute("SELECT pg_advisory_unlock(%s)", (REFRESH_LOCK_KEY,))
+        conn.commit()
+
+
+def get_latest_news(limit: int = NEWS_LIMIT, conn=None) -> List[NewsArticle]:
+    """Stored articles, newest first."""
+    with dict_cursor(conn) as cursor:
+        cursor.execute(LATEST_QUERY, (limit,))
+        return [NewsArticle(**row) for row in cursor.fetchall()]
+
 
-    articles: List[NewsArticle] = []
-    for fetch in sources:
-        articles.extend(fetch())
+def get_news_sources(conn=None):
+    """Poll state per source, for the news API."""
+    with dict_cursor(conn) as cursor:
+        cursor.execute(SOURCES_QUERY)
+        return cursor.fetchall()
 
-    # Normalize all published timestamps to UTC
-    for article in articles:
-        if article.published and article.published.tzinfo is None:
-            article.published = article.published.replace(tzinfo=timezone.utc)
 
-    return sorted(articles, key=lambda x: x.published, reverse=True)
+def last_fetched(sources) -> Optional[datetime]:
+    return max((s["fetched_at"] for s in sources if s["fetched_at"]), default=None)
@@ -0,0 +1,218 @@
+# services/people.py
+"""
+Person search, answered from people and the four credit tables.
+
+Local matches come back with their filmography as stored, two queries in
+all. TMDb is only asked when the caller wants it (or nothing matched
+locally): one /person call per hit, run concurrently and cached, after
+which every credit's "in DB" flag and IMDb id come from a single lookup.
+"""
+
+from config.settings import PERSON_DETAIL_CACHE_TTL, TMDB_API_KEY
+from db.helpers import dict_cursor
+from services.releases import DetailCache
+from services.search import escape_like
+from tmdb.client import map_concurrent
+from tmdb.person_api import get_person_tmdb, search_person_tmdb
+
+SEARCH_LIMIT = 10
+
+PEOPLE_QUERY = """
+    SELECT person_id AS id, name, profile_path, known_for_department
+    FROM people
+    WHERE name ILIKE %(pattern)s
+    ORDER BY lower(name) = lower(%(term)s) DESC,
+             popularity DESC NULLS LAST,
+             person_id
+    LIMIT %(limit)s
+"""
+
+# Every stored credit of the given people; each branch is an index scan on
+# the person column (queries/schema/person_search.sql)
+CREDITS_QUERY = """
+    SELECT mc.actor_id AS person_id, 'movie' AS media_type, m.movie_id AS id,
+           m.movie_title AS title, m.release_date AS date, m.imdb_id,
+           mc.character_name AS character, NULL AS job
+    FROM movie_cast mc
+    JOIN movies m ON m.movie_id = mc.movie_id
+    WHERE mc.actor_id = ANY(%(ids)s)
+    UNION ALL
+    SELECT sc.person_id, 'tv', s.series_id, s.series_name, s.first_air_date,
+           s.imdb_id, sc.character_name, NULL
+    FROM series_cast sc
+    JOIN series s ON s.series_id = sc.series_id
+    WHERE sc.person_id = ANY(%(ids)s)
+    UNION ALL
+    SELECT mc.crew_member_id, 'movie', m.movie_id, m.movie_title, m.release_date,
+           m.imdb_id, NULL, mc.job
+    FROM movie_crew mc
+    JOIN movies m ON m.movie_id = mc.movie_id
+    WHERE mc.crew_member_id = ANY(%(ids)s)
+    UNION ALL
+    SELECT sc.person_id, 'tv', s.series_id, s.series_name, s.first_air_date,
+           s.imdb_id, NULL, sc.job
+    FROM series_crew sc
+    JOIN series s ON s.series_id = sc.series_id
+    WHERE sc.person_id = ANY(%(ids)s)
+"""
+
+EXISTING_QUERY = """
+    SELECT 'movie' AS media_type, movie_id AS id, imdb_id
+    FROM movies WHERE movie_id = ANY(%(movie_ids)s)
+    UNION ALL
+    SELECT 'tv', series_id, imdb_id
+    FROM series WHERE series_id = ANY(%(tv_ids)s)
+"""
+
+person_cache = DetailCache(ttl=PERSON_DETAIL_CACHE_TTL)
+
+
+def sort_credits(credits):
+    """Newest first, credits without a year last."""
+    credits.sort(
+        key=lambda c: (c["release_year"] is not None, c["release_year"] or ""),
+        reverse=True,
+    )
+    return credits
+
+
+def search_local_people(name, limit=SEARCH_LIMIT, conn=None):
+    """People whose name contains `name`, each with their stored credits."""
+    with dict_cursor(conn) as cursor:
+        cursor.execute(
+            PEOPLE_QUERY,
+            {"term": name, "pattern": f"%{escape_like(name)}%", "limit": limit},
+        )
+        people = cursor.fetchall()
+        if not people:
+            return []
+
+        by_id = {person["id"]: {**person, "credits": []} for person in people}
+        cursor.execute(CREDITS_QUERY, {"ids": list(by_id)})
+        for row in cursor.fetchall():
+            credit_date = row.pop("date")
+            by_id[row.pop("person_id")]["credits"].append(
+                {
+                    **row,
+                    "release_year": str(credit_date.year) if credit_date else None,
+                    "exists": True,
+                }
+            )
+
+    for person in by_id.values():
+        sort_credits(person["credits"])
+    return list(by_id.values())
+
+
+def get_person_details(person_id):
+    """Cached TMDb person details with combined_credits; {} on error."""
+    details = person_cache.get(person_id)
+    if details is not None:
+        return details
+
+    try:
+        details = get_person_tmdb(person_id)
+    except Exception as e:
+        print(f"Error fetching TMDb person {person_id}: {e}")
+        return {}
+
+    person_cache.put(person_id, details)
+    return details
+
+
+def tmdb_credits(details):
+    """combined_credits (cast and crew) in the shape of stored credits."""
+    combined = details.get("combined_credits") or {}
+    credits = []
+    for credit in (combined.get("cast") or []) + (combined.get("crew") or []):
+        media_type = credit.get("media_type")
+        if media_type not in ("movie", "tv"):
+            continue
+        date_str = credit.get("release_date" if media_type == "movie" else "first_air_date")
+        credits.append(
+            {
+                "media_type": media_type,
+                "id": credit.get("id"),
+                "title": credit.get("title") or credit.get("name"),
+                "release_year": date_str[:4] if date_str else None,
+                "character": credit.get("character"),
+                "job": credit.get("job"),
+                "imdb_id": None,
+                "exists": False,
+            }
+        )
+    return credits
+
+
+def mark_existing(credits, conn=None):
+    """Sets exists / imdb_id on every credit from one lookup of both tables."""
+    if not credits:
+        return
+    ids = {"movie": set(), "tv": set()}
+    for credit in credits:
+        ids[credit["media_type"]].add(credit["id"])
+
+    with dict_cursor(conn) as cursor:
+        cursor.execute(
+            EXISTING_QUERY,
+            {"movie_ids": list(ids["movie"]), "tv_ids": list(ids["tv"])},
+        )
+        existing = {(r["media_type"], r["id"]): r["imdb_id"] for r in cursor.fetchall()}
+
+    for credit in credits:
+        key = (credit["media_type"], credit["id"])
+        credit["exists"] = key in existing
+        credit["imdb_id"] = existing.get(key)
+
+
+def enrich_from_tmdb(name, people, limit=SEARCH_LIMIT, conn=None):
+    """
+    Adds TMDb search hits missing locally and, for every person, TMDb's
+    biography and full filmography. A failed TMDb call leaves the local
+    result as it was.
+    """
+    try:
+        hits = search_person_tmdb(name)[:limit]
+    except Exception as e:
+        print(f"⚠️ TMDb person search failed for {name!r}: {e}")
+        hits = []
+
+    by_id = {person["id"]: person for person in people}
+    for hit in hits:
+        if hit.get("id") not in by_id:
+            by_id[hit["id"]] = {
+                "id": hit["id"],
+                "name": hit.get("name"),
+                "profile_path": hit.get("profile_path"),
+                "known_for_department": hit.get("known_for_department"),
+                "credits": [],
+            }
+
+    enriched = []
+    for person_id, details, _ in map_concurrent(get_person_details, list(by_id)):
+        if not details:
+            continue
+        person = by_id[person_id]
+        person["biography"] = details.get("biography")
+        person["birthday"] = details.get("birthday")
+        person["place_of_birth"] = details.get("place_of_birth")
+        person["also_known_as"] = details.get("also_known_as")
+        if details.get("combined_credits"):
+            person["credits"] = tmdb_credits(details)
+            enriched.append(person)
+
+    mark_existing([c for person in enriched for c in person["credits"]], conn)
+    for person in enriched:
+        sort_credits(person["credits"])
+    return list(by_id.values())
+
+
+def search_people(name, tmdb=False, limit=SEARCH_LIMIT, conn=None):
+    """
+    People matching `name`, local matches first. TMDb is consulted when
+    `tmdb` is set, or when nothing matched locally and a TMDb key is set.
+    """
+    people = search_local_people(name, limit, conn)
+    if tmdb or (not people and TMDB_API_KEY):
+        people = enrich_from_tmdb(name, people, limit, conn)
+    return people
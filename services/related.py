@@ -0,0 +1,208 @@
+# services/related.py
+"""
+Offline "related titles" scoring from shared people and genres.
+
+Each title becomes a row in two sparse matrices:
+
+- title × person: cast weighted by billing (1 / (1 + 0.1 * cast_order)),
+  directors and writers at CREW_WEIGHT, scaled by IDF so a prolific
+  character actor counts for less than a rarely seen one
+- title × genre
+
+Rows are L2-normalised, so P @ P.T and G @ G.T are cosine similarities.
+Scores are blended, a small popularity term breaks ties, and the top K per
+title are written to title_neighbours (method "credits"). Scoring runs in
+batches of rows so memory stays bounded.
+
+build_related() runs this model or the overview/tagline one in
+services/content_similarity.py (method "content").
+"""
+
+import time
+
+import numpy as np
+from scipy import sparse
+
+from config.settings import RELATED_TOP_K
+from services.content_similarity import ContentModel
+from services.neighbours import (
+    TITLE_TABLES,
+    NeighbourModel,
+    fetch_rows,
+    finish_run,
+    last_watermark,
+    normalize_rows,
+    prune_missing,
+    start_run,
+    store_neighbours,
+    touched_since,
+)
+
+# pg_try_advisory_lock key, so two builds don't write the same lists
+BUILD_LOCK_KEY = 7_314_004
+
+PERSON_WEIGHT = 0.8
+GENRE_WEIGHT = 0.2
+POPULARITY_WEIGHT = 0.001
+CREW_WEIGHT = 0.7
+BATCH_SIZE = 250
+
+SOURCES = {
+    "movie": {
+        "titles": "SELECT movie_id, COALESCE(popularity, 0) FROM movies",
+        "people": """
+            SELECT title_id, person_id, MAX(weight)
+            FROM (
+                SELECT movie_id AS title_id, actor_id AS person_id,
+                       1.0 / (1 + 0.1 * COALESCE(cast_order, 50)) AS weight
+                FROM movie_cast
+                UNION ALL
+                SELECT movie_id, crew_member_id, %(crew_weight)s
+                FROM movie_crew
+                WHERE department IN ('Directing', 'Writing')
+            ) p
+            GROUP BY title_id, person_id
+        """,
+        "genres": "SELECT movie_id, genre_id FROM movie_genres",
+    },
+    "tv": {
+        "titles": "SELECT series_id, COALESCE(popularity, 0) FROM series",
+        "people": """
+            SELECT title_id, person_id, MAX(weight)
+            FROM (
+                SELECT series_id AS title_id, person_id,
+                       1.0 / (1 + 0.1 * COALESCE(cast_order, 50)) AS weight
+                FROM series_cast
+                UNION ALL
+                SELECT series_id, person_id, %(crew_weight)s
+                FROM series_crew
+                WHERE department IN ('Directing', 'Writing')
+            ) p
+            GROUP BY title_id, person_id
+        """,
+        "genres": "SELECT series_id, genre_id FROM series_genres",
+    },
+}
+
+
+def _incidence(pairs, row_of, with_weights=False):
+    """CSR title × key matrix from (title_id, key[, weight]) rows."""
+    rows, keys, weights = [], [], []
+    for pair in pairs:
+        row = row_of.get(pair[0])
+        if row is None:
+            continue
+        rows.append(row)
+        keys.append(pair[1])
+        weights.append(float(pair[2]) if with_weights else 1.0)
+
+    _, columns = np.unique(np.asarray(keys, dtype=np.int64), return_inverse=True)
+    width = int(columns.max()) + 1 if len(columns) else 0
+    return sparse.csr_matrix(
+        (np.asarray(weights, dtype=np.float32), (np.asarray(rows), columns)),
+        shape=(len(row_of), width),
+    )
+
+
+class CreditsModel(NeighbourModel):
+    """The normalised people and genre matrices for one media type."""
+
+    def __init__(self, conn, media_type):
+        source = SOURCES[media_type]
+        titles = fetch_rows(conn, source["titles"])
+        super().__init__([t[0] for t in titles], [float(t[1]) for t in titles])
+
+        people = _incidence(
+            fetch_rows(conn, source["people"], {"crew_weight": CREW_WEIGHT}),
+            self.row_of,
+            with_weights=True,
+        )
+        # A person credited on one title can't link it to anything
+        document_frequency = np.bincount(people.indices, minlength=people.shape[1])
+        shared = document_frequency > 1
+        idf = np.log(max(len(titles), 1) / np.maximum(document_frequency, 1))
+        people = people[:, shared] @ sparse.diags(idf[shared].astype(np.float32))
+        self.people = normalize_rows(people)
+        self.people_binary = (self.people > 0).astype(np.float32).tocsr()
+
+        self.genres = normalize_rows(
+            _incidence(fetch_rows(conn, source["genres"]), self.row_of)
+        )
+        self.people_t = self.people.T.tocsr()
+        self.genres_t = self.genres.T.tocsr()
+
+    def affected(self, rows):
+        """`rows` plus every row sharing at least one person with them."""
+        if not len(rows):
+            return rows
+        linked = self.people_binary[rows] @ self.people_binary.T
+        return np.union1d(rows, np.unique(linked.indices))
+
+    def score(self, rows):
+        """Sparse (len(rows) × titles) blended similarity scores."""
+        scores = (
+            PERSON_WEIGHT * (self.people[rows] @ self.people_t)
+            + GENRE_WEIGHT * (self.genres[rows] @ self.genres_t)
+        ).tocsr()
+        scores.data += POPULARITY_WEIGHT * self.popularity[scores.indices]
+        return scores
+
+
+MODELS = {
+    "credits": CreditsModel,
+    "content": ContentModel,
+}
+
+
+def build_related(
+    conn, media_type, method="credits", full=False, k=RELATED_TOP_K, batch_size=BATCH_SIZE
+):
+    """
+    Recomputes stored neighbours for one media type and method. Incremental
+    runs (the default once a full run has finished) only rescore titles
+    synced since the last run plus the rows the model says they affect.
+    Returns the number of titles scored, or None if another build holds
+    the lock.
+    """
+    with conn.cursor() as cur:
+        cur.execute("SELECT pg_try_advisory_lock(%s)", (BUILD_LOCK_KEY,))
+        locked = cur.fetchone()[0]
+    conn.commit()
+    if not locked:
+        return None
+
+    try:
+        since = None if full else last_watermark(conn, media_type, method)
+        mode = "full" if since is None else "incremental"
+        run_id, _ = start_run(conn, media_type, method, mode)
+
+        started = time.perf_counter()
+        model = MODELS[method](conn, media_type)
+        if mode == "full":
+            rows = np.arange(len(model), dtype=np.int64)
+        else:
+            rows = model.affected(model.rows_for(touched_since(conn, media_type, since)))
+
+        for offset in range(0, len(rows), batch_size):
+            batch = rows[offset : offset + batch_size]
+            store_neighbours(
+                conn, media_type, method, model.ids[batch], model.neighbours(batch, k)
+            )
+
+        if mode == "full":
+            prune_missing(conn, media_type, method)
+        finish_run(conn, run_id, len(rows))
+
+        table = TITLE_TABLES[media_type][0]
+        print(
+            f"🔗 Related {table} ({method}): {mode} run scored {len(rows)} of "
+            f"{len(model)} title(s) in {time.perf_counter() - started:.1f}s"
+        )
+        return len(rows)
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        with conn.cursor() as cur:
+            cur.execute("SELECT pg_advisory_unlock(%s)", (BUILD_LOCK_KEY,))
+        conn.commit()
@@ -0,0 +1,174 @@
+# services/release_calendar.py
+
+from datetime import date, timedelta
+
+import psycopg2.extras
+
+from config.settings import RELEASE_CALENDAR_MAX_AGE
+from db.helpers import dict_cursor
+from services.releases import get_cinema_releases, get_tv_releases
+
+# pg_try_advisory_lock key, so only one web worker refreshes at a time
+REFRESH_LOCK_KEY = 7_314_001
+
+FETCHERS = {
+    "movie": get_cinema_releases,
+    "tv": get_tv_releases,
+}
+
+COLUMNS = (
+    "title",
+    "release_date",
+    "runtime",
+    "certification",
+    "distributor",
+    "platform",
+    "genre",
+    "poster_path",
+    "source",
+    "source_url",
+)
+
+RELEASES_QUERY = f"""
+    SELECT {", ".join(COLUMNS)}
+    FROM release_calendar
+    WHERE media_type = %s AND month = %s
+    ORDER BY position
+"""
+
+STALE_MONTHS_QUERY = """
+    SELECT wanted.media_type, wanted.month
+    FROM unnest(%s::text[], %s::date[]) AS wanted (media_type, month)
+    LEFT JOIN release_calendar_months rcm
+        ON rcm.media_type = wanted.media_type AND rcm.month = wanted.month
+    WHERE rcm.refreshed_at IS NULL
+       OR rcm.refreshed_at < NOW() - make_interval(secs => %s)
+"""
+
+
+def month_start(year: int, month: int) -> date:
+    return date(year, month, 1)
+
+
+def calendar_months(today: date = None):
+    """The months the home page shows: this one and the next."""
+    today = today or date.today()
+    this_month = today.replace(day=1)
+    next_month = (this_month + timedelta(days=32)).replace(day=1)
+    return [this_month, next_month]
+
+
+def get_release_calendar(media_type: str, year: int, month: int, conn=None):
+    """Stored releases for one month, in TMDb popularity/air-date order."""
+    with dict_cursor(conn) as cursor:
+        cursor.execute(RELEASES_QUERY, (media_type, month_start(year, month)))
+        return cursor.fetchall()
+
+
+def stale_months(conn, max_age=RELEASE_CALENDAR_MAX_AGE, today: date = None):
+    wanted = [(media_type, m) for media_type in FETCHERS for m in calendar_months(today)]
+    with conn.cursor() as cur:
+        cur.execute(
+            STALE_MONTHS_QUERY,
+            ([w[0] for w in wanted], [w[1] for w in wanted], max_age),
+        )
+        return cur.fetchall()
+
+
+def store_releases(conn, media_type: str, month: date, releases):
+    """Replaces one month's releases in a single transaction."""
+    rows = [
+        (
+            media_type,
+            month,
+            release["tmdb_id"],
+            position,
+            *(_column_value(release, column) for column in COLUMNS),
+        )
+        for position, release in enumerate(releases)
+    ]
+
+    with conn.cursor() as cur:
+        cur.execute(
+            "DELETE FROM release_calendar WHERE media_type = %s AND month = %s",
+            (media_type, month),
+        )
+        psycopg2.extras.execute_values(
+            cur,
+            f"""
+            INSERT INTO release_calendar
+                (media_type, month, tmdb_id, position, {", ".join(COLUMNS)})
+            VALUES %s
+            ON CONFLICT (media_type, month, tmdb_id) DO NOTHING
+            """,
+            rows,
+        )
+        cur.execute(
+            """
+            INSERT INTO release_calendar_months (media_type, month, refreshed_at, release_count)
+            VALUES (%s, %s, NOW(), %s)
+            ON CONFLICT (media_type, month)
+            DO UPDATE SET refreshed_at = NOW(), release_count = EXCLUDED.release_count
+            """,
+            (media_type, month, len(rows)),
+        )
+    conn.commit()
+    return len(rows)
+
+
+def prune_past_months(conn, before: date):
+    with conn.cursor() as cur:
+        cur.execute("DELETE FROM release_calendar WHERE month < %s", (before,))
+        cur.execute("DELETE FROM release_calendar_months WHERE month < %s", (before,))
+    conn.commit()
+
+
+def _column_value(release, column):
+    value = release.get(column)
+    if column == "release_date" and value is not None:
+        return value.date() if hasattr(value, "date") else value
+    if column == "runtime" and not isinstance(value, int):
+        return None
+    return value
+
+
+def refresh_release_calendar(conn, force=False, today: date = None):
+    """
+    Re-fetches every stale calendar month from TMDb. Returns the number of
+    months refreshed, or None if another process holds the refresh lock.
+    An empty fetch keeps the stored rows (TMDb errors also come back empty)
+    and is retried on the next run.
+    """
+    with conn.cursor() as cur:
+        cur.execute("SELECT pg_try_advisory_lock(%s)", (REFRESH_LOCK_KEY,))
+        locked = cur.fetchone()[0]
+    conn.commit()
+    if not locked:
+        return None
+
+    try:
+        months = stale_months(
+            conn, max_age=0 if force else RELEASE_CALENDAR_MAX_AGE, today=today
+        )
+        prune_past_months(conn, calendar_months(today)[0])
+
+        refreshed = 0
+        for media_type, month in months:
+            releases = FETCHERS[media_type](month=month.month, year=month.year)
+            if not releases:
+                print(
+                    f"⚠️ No {media_type} releases fetched for {month:%Y-%m}; "
+                    "keeping stored rows"
+                )
+                continue
+            count = store_releases(conn, media_type, month, releases)
+            print(f"📅 Stored {count} {media_type} release(s) for {month:%Y-%m}")
+            refreshed += 1
+        return refreshed
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        with conn.cursor() as cur:
+            cur.execute("SELECT pg_advisory_unlock(%s)", (REFRESH_LOCK_KEY,))
+        conn.commit()
@@ -1,25 +1,160 @@
 # services/releases.py
 
-import requests
-from datetime import datetime, timedelta
+import calendar
+import threading
+import time
+from datetime import date, datetime, timedelta
 from typing import List, Dict
-from config.settings import TMDB_API_KEY
+
+from config.settings import (
+    RELEASE_DETAIL_CACHE_TTL,
+    RELEASE_DISCOVER_MAX_PAGES,
+    RELEASE_REGION,
+)
 from services.genres import get_genre_map
+from tmdb.client import map_concurrent, tmdb_get
+
+# TMDb refuses discover pages beyond this
+TMDB_MAX_PAGES = 500
+
+# release_dates types in order of preference: theatrical, limited, premiere
+CERTIFICATION_TYPES = (3, 2, 1)
+
+
+class DetailCache:
+    """
+    Small TTL cache of TMDb detail responses keyed by (media_type, id), so a
+    title that appears in several months or crawls is only fetched once.
+    """
+
+    def __init__(self, ttl=RELEASE_DETAIL_CACHE_TTL):
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and time.monotonic() - entry[0] < self.ttl:
+                return entry[1]
+            self._entries.pop(key, None)
+            return None
+
+    def put(self, key, value):
+        with self._lock:
+            now = time.monotonic()
+            self._entries[key] = (now, value)
+            # Drop expired entries now and then so the dict can't grow forever
+            if len(self._entries) % 500 == 0:
+                self._entries = {
+                    k: v for k, v in self._entries.items() if now - v[0] < self.ttl
+                }
+
+
+detail_cache = DetailCache()
+
+DETAIL_PARAMS = {
+    "movie": {"language": "en-GB", "append_to_response": "release_dates"},
+    "tv": {"language": "en-GB"},
+}
+
+
+def get_details(media_type: str, tmdb_id: int) -> Dict:
+    """Cached /movie/{id} (with release_dates) or /tv/{id}; {} on error."""
+    key = (media_type, tmdb_id)
+    details = detail_cache.get(key)
+    if details is not None:
+        return details
+
+    try:
+        details = tmdb_get(f"/{media_type}/{tmdb_id}", DETAIL_PARAMS[media_type])
+    except Exception as e:
+        print(f"Error fetching {media_type} details for {tmdb_id}: {e}")
+        return {}
 
-TMDB_BASE = "https://api.themoviedb.org/3"
+    detail_cache.put(key, details)
+    return details
 
 
 def get_movie_details(movie_id: int) -> Dict:
     """Fetch full movie details from TMDb."""
-    url = f"{TMDB_BASE}/movie/{movie_id}"
-    params = {"api_key": TMDB_API_KEY, "language": "en-GB"}
+    return get_details("movie", movie_id)
+
+
+def fetch_details(media_type: str, tmdb_ids) -> Dict[int, Dict]:
+    """Fetches details for many titles concurrently, reusing cached ones."""
+    return {
+        tmdb_id: details or {}
+        for tmdb_id, details, _ in map_concurrent(
+            lambda tmdb_id: get_details(media_type, tmdb_id), set(tmdb_ids)
+        )
+    }
+
+
+def discover_all(media_type: str, params: Dict) -> List[Dict]:
+    """
+    Walks every /discover page for the query: page 1 gives total_pages, the
+    rest are fetched concurrently. Results keep TMDb's order, deduplicated
+    by id (discover pages can overlap while popularity shifts).
+    """
+    path = f"/discover/{media_type}"
+    first = tmdb_get(path, {**params, "page": 1})
+    total_pages = min(
+        first.get("total_pages") or 1, RELEASE_DISCOVER_MAX_PAGES, TMDB_MAX_PAGES
+    )
+
+    pages = {1: first.get("results", [])}
+    for page, data, error in map_concurrent(
+        lambda page: tmdb_get(path, {**params, "page": page}),
+        range(2, total_pages + 1),
+    ):
+        if error:
+            print(f"Error fetching {path} page {page}: {error}")
+            continue
+        pages[page] = data.get("results", [])
+
+    results, seen = [], set()
+    for page in sorted(pages):
+        for item in pages[page]:
+            if item["id"] not in seen:
+                seen.add(item["id"])
+                results.append(item)
+    return results
+
+
+def month_window(year: int, month: int):
+    """First and last day of the month, as TMDb date filters."""
+    last_day = calendar.monthrange(year, month)[1]
+    return date(year, month, 1).isoformat(), date(year, month, last_day).isoformat()
+
+
+def get_certification(details: Dict, region: str = RELEASE_REGION) -> str:
+    """
+    Certification from append_to_response=release_dates: the region's
+    theatrical rating if it has one, else its first non-empty rating.
+    """
+    for country in details.get("release_dates", {}).get("results", []):
+        if country.get("iso_3166_1") != region:
+            continue
+        dates = [d for d in country.get("release_dates", []) if d.get("certification")]
+        for release_type in CERTIFICATION_TYPES:
+            for d in dates:
+                if d.get("type") == release_type:
+                    return d["certification"]
+        if dates:
+            return dates[0]["certification"]
+    return None
+
 
+def _parse_date(value):
     try:
-        response = requests.get(url, params=params, timeout=5)
-        response.raise_for_status()
-        return response.json()
-    except Exception:
-        return {}
+        return datetime.fromisoformat(value) if value else None
+    except ValueError:
+        return None
+
+
+def _genres(genre_map, genre_ids):
+    return " / ".join(genre_map.get(gid, "Unknown") for gid in genre_ids or [])
 
 
 def get_cinema_releases(month: int = None, year: int = None) -> List[Dict]:
@@ -28,64 +163,58 @@ def get_cinema_releases(month: int = None, year: int = None) -> List[Dict]:
 
     for ym in get_month_range(month, year):
         y, m = map(int, ym.split("-"))
+        first_day, last_day = month_window(y, m)
 
-        url = f"{TMDB_BASE}/discover/movie"
-        params = {
-            "api_key": TMDB_API_KEY,
-            "sort_by": "popularity.desc",
-            "release_date.gte": f"{y}-{m:02d}-01",
-            "release_date.lte": f"{y}-{m:02d}-31",
-            "with_original_language": "en",
-        }
+        try:
+            movies = discover_all(
+                "movie",
+                {
+                    "sort_by": "popularity.desc",
+                    "release_date.gte": first_day,
+                    "release_date.lte": last_day,
+                    "with_original_language": "en",
+                },
+            )
+        except Exception as e:
+            print(f"Error fetching cinema releases for {ym}: {e}")
+            continue
 
-        response = requests.get(url, params=params)
-        movies = response.json().get("results", [])
+        movies = [
+            movie
+            for movie in movies
+            if isinstance(movie.get("release_date"), str)
+            and movie["release_date"].startswith(ym)
+        ]
+        details_by_id = fetch_details("movie", (movie["id"] for movie in movies))
 
         for movie in movies:
-            release_date = movie.get("release_date", "")
-
-            if isinstance(release_date, str) and release_date.startswith(f"{y}-{m:02d}"):
-                details = get_movie_details(movie["id"])
-
-                distributor = ""
-                if details.get("production_companies"):
-                    distributor = details["production_companies"][0].get("name", "")
-
-                releases.append(
-                    {
-                        "title": movie["title"],
-                        "release_date": (
-                            datetime.fromisoformat(release_date)
-                            if release_date
-                            else None
-                        ),
-                        "runtime": details.get("runtime", "Unknown"),
-                        "certification": details.get("certification", "Unrated"),
-                        "distributor": distributor or "Unknown",
-                        "genre": " / ".join(
-                            genre_map.get(gid, "Unknown")
-                            for gid in movie.get("genre_ids", [])
-                        ),
-                        "poster_path": movie.get("poster_path"),
-                        "source": "TMDb",
-                        "source_url": f"https://www.themoviedb.org/movie/{movie['id']}",
-                    }
-                )
+            details = details_by_id.get(movie["id"], {})
+
+            distributor = ""
+            if details.get("production_companies"):
+                distributor = details["production_companies"][0].get("name", "")
+
+            releases.append(
+                {
+                    "tmdb_id": movie["id"],
+                    "title": movie["title"],
+                    "release_date": _parse_date(movie["release_date"]),
+                    "runtime": details.get("runtime") or None,
+                    "certification": get_certification(details) or "Unrated",
+                    "distributor": distributor or "Unknown",
+                    "genre": _genres(genre_map, movie.get("genre_ids")),
+                    "poster_path": movie.get("poster_path"),
+                    "source": "TMDb",
+                    "source_url": f"https://www.themoviedb.org/movie/{movie['id']}",
+                }
+            )
 
     return releases
 
 
 def get_tv_platform(tv_id: int) -> str:
-    url = f"{TMDB_BASE}/tv/{tv_id}"
-    params = {"api_key": TMDB_API_KEY, "language": "en-GB"}
-
-    try:
-        response = requests.get(url, params=params, timeout=5)
-        data = response.json()
-        networks = data.get("networks", [])
-        return networks[0]["name"] if networks else "Unknown"
-    except Exception:
-        return "Unknown"
+    networks = get_details("tv", tv_id).get("networks", [])
+    return networks[0]["name"] if networks else "Unknown"
 
 
 def get_tv_releases(month: int = None, year: int = None) -> List[Dict]:
@@ -94,66 +223,46 @@ def get_tv_releases(month: int = None, year: int = None) -> List[Dict]:
 
     for ym in get_month_range(month, year):
         y, m = map(int, ym.split("-"))
-
-        url = f"{TMDB_BASE}/discover/tv"
-        params = {
-            "api_key": TMDB_API_KEY,
-            "sort_by": "first_air_date.asc",
-            "first_air_date.gte": f"{y}-{m:02d}-01",
-            "first_air_date.lte": f"{y}-{m:02d}-31",
-            "with_original_language": "en",
-        }
+        first_day, last_day = month_window(y, m)
 
         try:
-            response = requests.get(url, params=params, timeout=5)
-            response.raise_for_status()
-            shows = response.json().get("results", [])
+            shows = discover_all(
+                "tv",
+                {
+                    "sort_by": "first_air_date.asc",
+                    "first_air_date.gte": first_day,
+                    "first_air_date.lte": last_day,
+                    "with_original_language": "en",
+                },
+            )
         except Exception as e:
-            print(f"Error fetching TV releases for {y}-{m:02d}: {e}")
+            print(f"Error fetching TV releases for {ym}: {e}")
             continue
 
+        dated_shows = []
         for s in shows:
-            air_date_str = s.get("first_air_date", "")
-
-            try:
-                air_date = (
-                    datetime.fromisoformat(air_date_str) if air_date_str else None
-                )
-            except ValueError:
-                air_date = None
-
-            if not air_date or air_date.strftime("%Y-%m") != f"{y}-{m:02d}":
-                continue
-
-            # Fetch broadcaster info
-            detail_url = f"{TMDB_BASE}/tv/{s['id']}"
-            detail_params = {"api_key": TMDB_API_KEY}
-
-            try:
-                detail_response = requests.get(
-                    detail_url, params=detail_params, timeout=5
-                )
-                detail_response.raise_for_status()
-                detail_data = detail_response.json()
-            except Exception as e:
-                print(f"Error fetching TV details for {s['id']}: {e}")
-                continue
-
-            broadcasters = detail_data.get("networks", [])
-            broadcaster_names = [b.get("name") for b in broadcasters if b.get("name")]
-            broadcaster = (
-                ", ".join(broadcaster_names) if broadcaster_names else "Unknown"
-            )
+            air_date = _parse_date(s.get("first_air_date"))
+            if air_date and air_date.strftime("%Y-%m") == ym:
+                dated_shows.append((s, air_date))
+
+        details_by_id = fetch_details("tv", (s["id"] for s, _ in dated_shows))
+
+        for s, air_date in dated_shows:
+            details = details_by_id.get(s["id"], {})
+
+            broadcaster_names = [
+                b.get("name") for b in details.get("networks", []) if b.get("name")
+            ]
+            run_times = details.get("episode_run_time") or []
 
             releases.append(
                 {
+                    "tmdb_id": s["id"],
                     "title": s.get("name", "Untitled"),
                     "release_date": air_date,
-                    "platform": broadcaster,
-                    "genre": " / ".join(
-                        genre_map.get(gid, "Unknown")
-                        for gid in s.get("genre_ids", [])
-                    ),
+                    "runtime": run_times[0] if run_times else None,
+                    "platform": ", ".join(broadcaster_names) or "Unknown",
+                    "genre": _genres(genre_map, s.get("genre_ids")),
                     "poster_path": s.get("poster_path"),
                     "source": "TMDb",
                     "source_url": f"https://www.themoviedb.org/tv/{s['id']}",
@@ -162,6 +271,7 @@ def get_tv_releases(month: int = None, year: int = None) -> List[Dict]:
 
     return releases
 
+
 def get_month_range(month: int = None, year: int = None):
     if month and year:
         return [f"{year}-{month:02d}"]
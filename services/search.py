@@ -0,0 +1,169 @@
+# services/search.py
+
+import base64
+import json
+from decimal import Decimal
+
+from db.helpers import dict_cursor
+
+MAX_LIMIT = 100
+
+# Relevance: full-text rank over title/original title/overview plus the best
+# trigram similarity of the titles. Rounded so keyset comparisons are exact.
+MOVIE_SCORE = """
+    ROUND((
+        ts_rank(title_search_document(m.movie_title, m.original_title, m.overview), {tsquery})
+        + GREATEST(
+            similarity(m.movie_title, %(term)s),
+            similarity(COALESCE(m.original_title, ''), %(term)s)
+        )
+    )::numeric, 6)
+"""
+
+SERIES_SCORE = """
+    ROUND((
+        ts_rank(title_search_document(s.series_name, NULL, s.overview), {tsquery})
+        + similarity(s.series_name, %(term)s)
+    )::numeric, 6)
+"""
+
+# Names match as typed; overviews are stemmed, so query both ways
+TSQUERY = (
+    "(websearch_to_tsquery('simple', %(term)s)"
+    " || websearch_to_tsquery('english', %(term)s))"
+)
+
+# Each condition is served by an index in queries/schema/title_search.sql
+MOVIE_MATCH = f"""(
+    title_search_document(m.movie_title, m.original_title, m.overview) @@ {TSQUERY}
+    OR m.movie_title ILIKE %(pattern)s
+    OR m.original_title ILIKE %(pattern)s
+    OR m.movie_title %% %(term)s
+)"""
+
+SERIES_MATCH = f"""(
+    title_search_document(s.series_name, NULL, s.overview) @@ {TSQUERY}
+    OR s.series_name ILIKE %(pattern)s
+    OR s.series_name %% %(term)s
+)"""
+
+# Range on the raw column instead of DATE_PART, so the b-tree applies
+SERIES_YEAR = (
+    "s.first_air_date >= make_date(%(year)s, 1, 1)"
+    " AND s.first_air_date < make_date(%(year)s + 1, 1, 1)"
+)
+
+
+def encode_cursor(row):
+    payload = json.dumps([str(row["score"]), row["type"], row["id"]])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """Raises ValueError for anything that isn't a cursor we issued."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        score, title_type, title_id = json.loads(base64.urlsafe_b64decode(padded))
+        return Decimal(score), str(title_type), int(title_id)
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def escape_like(term):
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def build_search_query(term, year=None, media_type=None, after=None):
+    """
+    Returns the SQL for one page of results, best first. Without a search
+    term titles are listed by popularity instead of relevance.
+    """
+    branches = []
+
+    if media_type in (None, "movie"):
+        conditions = []
+        if term:
+            conditions.append(MOVIE_MATCH)
+        if year is not None:
+            conditions.append("mm.release_year = %(year)s")
+        score = (
+            MOVIE_SCORE.format(tsquery=TSQUERY)
+            if term
+            else "ROUND(COALESCE(m.popularity, 0)::numeric, 6)"
+        )
+        branches.append(
+            f"""
+            SELECT m.movie_id AS id, m.movie_title AS title, mm.release_year,
+                   'movie' AS type, m.poster_path, {score} AS score
+            FROM movies m
+            JOIN movie_metadata mm ON mm.movie_id = m.movie_id
+            WHERE {" AND ".join(conditions) or "TRUE"}
+            """
+        )
+
+    if media_type in (None, "tv"):
+        conditions = []
+        if term:
+            conditions.append(SERIES_MATCH)
+        if year is not None:
+            conditions.append(SERIES_YEAR)
+        score = (
+            SERIES_SCORE.format(tsquery=TSQUERY)
+            if term
+            else "ROUND(COALESCE(s.popularity, 0)::numeric, 6)"
+        )
+        branches.append(
+            f"""
+            SELECT s.series_id AS id, s.series_name AS title,
+                   EXTRACT(YEAR FROM s.first_air_date)::int AS release_year,
+                   'tv' AS type, s.poster_path, {score} AS score
+            FROM series s
+            WHERE {" AND ".join(conditions) or "TRUE"}
+            """
+        )
+
+    keyset = (
+        "WHERE (r.score, r.type, r.id) < (%(after_score)s, %(after_type)s, %(after_id)s)"
+        if after
+        else ""
+    )
+
+    return f"""
+        SELECT r.*
+        FROM ({" UNION ALL ".join(branches)}) r
+        {keyset}
+        ORDER BY r.score DESC, r.type DESC, r.id DESC
+        LIMIT %(limit)s
+    """
+
+
+def search_titles(
+    term="", year=None, media_type=None, limit=20, cursor=None, conn=None
+):
+    """
+    Ranked movie + series search with keyset pagination.
+    Returns (results, next_cursor); next_cursor is None on the last page.
+    Raises ValueError for a bad media type or cursor.
+    """
+    term = (term or "").strip()
+    if media_type not in (None, "movie", "tv"):
+        raise ValueError(f"Invalid title type: {media_type}")
+
+    limit = max(1, min(int(limit), MAX_LIMIT))
+    after = decode_cursor(cursor) if cursor else None
+
+    params = {
+        "term": term,
+        "pattern": f"%{escape_like(term)}%",
+        "year": year,
+        "limit": limit + 1,
+    }
+    if after:
+        params.update(after_score=after[0], after_type=after[1], after_id=after[2])
+
+    with dict_cursor(conn) as cur:
+        cur.execute(build_search_query(term, year, media_type, after), params)
+        rows = cur.fetchall()
+
+    next_cursor = encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+    return rows[:limit], next_cursor
@@ -0,0 +1,79 @@
+# services/seasons.py
+
+from db.helpers import dict_cursor
+from utils import format_local
+
+# One row per season with its episodes aggregated in episode order, plus
+# per-season and series-wide average ratings. The series average is a
+# window over the per-season sums/counts, so every row carries it.
+SEASON_MAP_QUERY = """
+    SELECT
+        s.season_id,
+        s.season_number,
+        s.air_date,
+        s.poster_path,
+        s.season_name,
+        s.overview,
+        COALESCE(
+            json_agg(
+                json_build_object(
+                    'episode_id', e.episode_id,
+                    'episode_number', e.episode_number,
+                    'episode_name', e.episode_name,
+                    'overview', e.overview,
+                    'air_date', e.air_date,
+                    'rating', m.rating,
+                    'watched_date', m.watched_date
+                )
+                ORDER BY e.episode_number
+            ) FILTER (WHERE e.episode_id IS NOT NULL),
+            '[]'
+        ) AS episodes,
+        MIN(e.air_date) AS date_from,
+        MAX(e.air_date) AS date_to,
+        ROUND(AVG(m.rating)::numeric, 2) AS average_rating,
+        ROUND(
+            (SUM(SUM(m.rating)) OVER () / NULLIF(SUM(COUNT(m.rating)) OVER (), 0))::numeric,
+            2
+        ) AS series_average_rating
+    FROM series_seasons s
+    LEFT JOIN series_episodes e ON e.season_id = s.season_id
+    LEFT JOIN episode_metadata m ON m.episode_id = e.episode_id
+    WHERE s.series_id = %s
+    GROUP BY
+        s.season_id, s.season_number, s.air_date, s.poster_path, s.season_name, s.overview
+    ORDER BY s.season_number
+"""
+
+
+def shape_season_map(rows):
+    """
+    Turns SEASON_MAP_QUERY rows into (season_map, series_average_rating),
+    with the display dates _season_episodes.html expects.
+    """
+    series_rating = rows[0]["series_average_rating"] if rows else None
+
+    for season in rows:
+        season.pop("series_average_rating", None)
+        season["air_date_formatted"] = format_local(season.get("air_date"), "%-d %B %Y")
+
+        for ep in season["episodes"]:
+            ep["air_date_formatted"] = format_local(ep.get("air_date"), "%-d %B %Y")
+            ep["watched_date_formatted"] = format_local(
+                ep.get("watched_date"), "%-d %B %Y"
+            )
+
+        if season["date_from"]:
+            season["date_from"] = format_local(season["date_from"], "%-d %B %Y")
+            season["date_to"] = format_local(season["date_to"], "%-d %B %Y")
+
+    return rows, series_rating
+
+
+def get_season_map(series_id: int, conn=None):
+    """
+    Returns (season_map, series_average_rating) for a series in one query.
+    """
+    with dict_cursor(conn) as cur:
+        cur.execute(SEASON_MAP_QUERY, (series_id,))
+        return shape_season_map(cur.fetchall())
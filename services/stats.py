@@ -1,12 +1,99 @@
+import time
 from pathlib import Path
+
+from config.settings import STATS_MAX_AGE
 from db.helpers import dict_cursor
 
 QUERIES_DIR = Path(__file__).parent.parent / "queries"
 
-def get_all_stats():
-    query = (QUERIES_DIR / "all_stats.sql").read_text()
-    with dict_cursor() as cursor:
-        cursor.execute(query)
+# pg_try_advisory_lock key, so concurrent refreshes don't run the query twice
+REFRESH_LOCK_KEY = 7_314_002
+
+SNAPSHOT_QUERY = """
+    SELECT stats, refreshed_at, EXTRACT(EPOCH FROM NOW() - refreshed_at) AS age_seconds
+    FROM stats_snapshot
+    WHERE snapshot_id = 1
+"""
+
+
+def all_stats_query():
+    return (QUERIES_DIR / "all_stats.sql").read_text()
+
+
+def refresh_stats_query():
+    # Readers keep seeing the previous row until this commits
+    stats_query = all_stats_query().strip().rstrip(";")
+    return f"""
+        INSERT INTO stats_snapshot (snapshot_id, stats, refreshed_at)
+        SELECT 1, s.stats::jsonb, NOW()
+        FROM ({stats_query}) s
+        ON CONFLICT (snapshot_id) DO UPDATE
+        SET stats = EXCLUDED.stats, refreshed_at = EXCLUDED.refreshed_at
+    """
+
+
+def get_all_stats(conn=None):
+    """Runs all_stats.sql live. Prefer get_stats_snapshot for page views."""
+    with dict_cursor(conn) as cursor:
+        cursor.execute(all_stats_query())
         row = cursor.fetchone()
         return row["stats"]
-    
\ No newline at end of file
+
+
+def write_stats_snapshot(cur):
+    started = time.perf_counter()
+    cur.execute(refresh_stats_query())
+    refresh_ms = round((time.perf_counter() - started) * 1000)
+    cur.execute(
+        "UPDATE stats_snapshot SET refresh_ms = %s WHERE snapshot_id = 1",
+        (refresh_ms,),
+    )
+    return refresh_ms
+
+
+def refresh_stats_snapshot(conn, max_age=None):
+    """
+    Recomputes the stats snapshot. With `max_age` (seconds) a snapshot that
+    is younger is left alone, so several schedulers can share the job.
+    Returns False if skipped (fresh enough, or another refresh is running).
+    """
+    with conn.cursor() as cur:
+        cur.execute("SELECT pg_try_advisory_xact_lock(%s)", (REFRESH_LOCK_KEY,))
+        if not cur.fetchone()[0]:
+            conn.rollback()
+            return False
+
+        if max_age is not None:
+            cur.execute(
+                "SELECT refreshed_at > NOW() - make_interval(secs => %s) "
+                "FROM stats_snapshot WHERE snapshot_id = 1",
+                (max_age,),
+            )
+            row = cur.fetchone()
+            if row and row[0]:
+                conn.rollback()
+                return False
+
+        refresh_ms = write_stats_snapshot(cur)
+    conn.commit()
+    print(f"📊 Stats snapshot refreshed in {refresh_ms} ms")
+    return True
+
+
+def get_stats_snapshot(conn=None):
+    """
+    Returns (stats, refreshed_at, age_seconds) from the last snapshot. The
+    snapshot is only built on the spot if none exists yet.
+    """
+    with dict_cursor(conn) as cursor:
+        cursor.execute(SNAPSHOT_QUERY)
+        row = cursor.fetchone()
+        if row is None:
+            write_stats_snapshot(cursor)
+            cursor.execute(SNAPSHOT_QUERY)
+            row = cursor.fetchone()
+    return row["stats"], row["refreshed_at"], float(row["age_seconds"])
+
+
+def refresh_if_stale(conn):
+    return refresh_stats_snapshot(conn, max_age=STATS_MAX_AGE)
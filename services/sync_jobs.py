@@ -0,0 +1,234 @@
+# services/sync_jobs.py
+
+import json
+import uuid
+import psycopg2.extras
+from psycopg2.extras import Json
+
+from config.settings import (
+    SYNC_MAX_ATTEMPTS,
+    SYNC_RETRY_BASE_SECONDS,
+    SYNC_RETRY_MAX_SECONDS,
+    SYNC_JOB_LEASE_SECONDS,
+)
+
+PRIORITY_INTERACTIVE = 10
+PRIORITY_BULK = 100
+
+TERMINAL_STATUSES = {"done", "dead"}
+
+
+def parse_id_list(id_list):
+    """
+    Splits a comma/newline separated list of TMDb IDs into unique ints,
+    keeping the submitted order. Non-numeric entries are returned separately.
+    """
+    ids, invalid, seen = [], [], set()
+    for raw in id_list.replace(",", "\n").splitlines():
+        raw = raw.strip()
+        if not raw:
+            continue
+        if not raw.isdigit():
+            invalid.append(raw)
+            continue
+        tmdb_id = int(raw)
+        if tmdb_id not in seen:
+            seen.add(tmdb_id)
+            ids.append(tmdb_id)
+    return ids, invalid
+
+
+def enqueue_titles(conn, tmdb_ids, media_type, priority=PRIORITY_BULK):
+    """
+    Queues a sync job per TMDb ID and records them as one batch.
+    Enqueueing is idempotent: a title that already has a queued or running
+    job reuses it (taking the more urgent priority) instead of duplicating it.
+    Returns (batch_id, job_ids).
+    """
+    if media_type not in ("movie", "tv"):
+        raise ValueError(f"Unsupported media type: {media_type}")
+
+    batch_id = str(uuid.uuid4())
+    job_ids = []
+
+    with conn.cursor() as cur:
+        if tmdb_ids:
+            rows = psycopg2.extras.execute_values(
+                cur,
+                """
+                INSERT INTO sync_jobs (tmdb_id, media_type, priority, max_attempts)
+                VALUES %s
+                ON CONFLICT (media_type, tmdb_id) WHERE status IN ('queued', 'running')
+                DO UPDATE SET priority = LEAST(sync_jobs.priority, EXCLUDED.priority),
+                              updated_at = NOW()
+                RETURNING job_id, tmdb_id;
+                """,
+                [(int(i), media_type, priority, SYNC_MAX_ATTEMPTS) for i in tmdb_ids],
+                fetch=True,
+            )
+            # RETURNING order is not guaranteed, keep the submitted order
+            by_tmdb_id = {tmdb_id: job_id for job_id, tmdb_id in rows}
+            job_ids = [by_tmdb_id[int(i)] for i in tmdb_ids]
+
+        cur.execute(
+            """
+            INSERT INTO sync_batches (batch_id, media_type, job_ids)
+            VALUES (%s::uuid, %s, %s);
+            """,
+            (batch_id, media_type, job_ids),
+        )
+
+    conn.commit()
+    return batch_id, job_ids
+
+
+def claim_job(conn, worker_id):
+    """
+    Atomically takes the most urgent runnable job and marks it running.
+    Returns the job as a dict, or None when the queue is empty.
+    """
+    with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+        cur.execute(
+            """
+            UPDATE sync_jobs
+            SET status = 'running',
+                attempts = attempts + 1,
+                stage = NULL,
+                locked_by = %s,
+                locked_at = NOW(),
+                updated_at = NOW()
+            WHERE job_id = (
+                SELECT job_id
+                FROM sync_jobs
+                WHERE status = 'queued' AND run_after <= NOW()
+                ORDER BY priority, run_after, job_id
+                FOR UPDATE SKIP LOCKED
+                LIMIT 1
+            )
+            RETURNING job_id, tmdb_id, media_type, attempts, max_attempts;
+            """,
+            (worker_id,),
+        )
+        job = cur.fetchone()
+
+    conn.commit()
+    return job
+
+
+def set_job_stage(conn, job_id, stage):
+    """Records how far the running attempt has got, for progress pages."""
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            UPDATE sync_jobs
+            SET stage = %s, updated_at = NOW()
+            WHERE job_id = %s AND status = 'running';
+            """,
+            (stage, job_id),
+        )
+    conn.commit()
+
+
+def complete_job(conn, job_id, result):
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            UPDATE sync_jobs
+            SET status = 'done',
+                result = %s,
+                last_error = NULL,
+                locked_by = NULL,
+                locked_at = NULL,
+                updated_at = NOW()
+            WHERE job_id = %s;
+            """,
+            (Json(result, dumps=lambda o: json.dumps(o, default=str)), job_id),
+        )
+    conn.commit()
+
+
+def fail_job(conn, job_id, error):
+    """
+    Schedules a retry with exponential backoff, or moves the job to the
+    dead-letter state once it has used up its attempts.
+    """
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            UPDATE sync_jobs
+            SET status = CASE WHEN attempts >= max_attempts THEN 'dead' ELSE 'queued' END,
+                run_after = NOW() + make_interval(
+                    secs => LEAST(%s * power(2, attempts - 1), %s)
+                ),
+                last_error = %s,
+                locked_by = NULL,
+                locked_at = NULL,
+                updated_at = NOW()
+            WHERE job_id = %s
+            RETURNING status;
+            """,
+            (SYNC_RETRY_BASE_SECONDS, SYNC_RETRY_MAX_SECONDS, str(error), job_id),
+        )
+        row = cur.fetchone()
+    conn.commit()
+    return row[0] if row else None
+
+
+def requeue_expired_jobs(conn):
+    """
+    Returns jobs whose worker died mid-sync to the queue (or the dead-letter
+    state if that was their last attempt).
+    """
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            UPDATE sync_jobs
+            SET status = CASE WHEN attempts >= max_attempts THEN 'dead' ELSE 'queued' END,
+                last_error = 'Worker lease expired (' || COALESCE(locked_by, '?') || ')',
+                locked_by = NULL,
+                locked_at = NULL,
+                updated_at = NOW()
+            WHERE status = 'running'
+              AND locked_at < NOW() - make_interval(secs => %s);
+            """,
+            (SYNC_JOB_LEASE_SECONDS,),
+        )
+        count = cur.rowcount
+    conn.commit()
+    return count
+
+
+BATCH_QUERY = """
+    SELECT batch_id, media_type, job_ids, created_at
+    FROM sync_batches
+    WHERE batch_id = %s::uuid;
+"""
+
+BATCH_JOBS_QUERY = """
+    SELECT j.job_id, j.tmdb_id, j.media_type, j.status, j.stage, j.attempts,
+           j.max_attempts, j.run_after, j.last_error, j.result, j.updated_at
+    FROM unnest(%s::bigint[]) WITH ORDINALITY AS b(job_id, position)
+    JOIN sync_jobs j ON j.job_id = b.job_id
+    ORDER BY b.position;
+"""
+
+
+def count_pending(jobs):
+    return sum(1 for job in jobs if job["status"] not in TERMINAL_STATUSES)
+
+
+def get_batch(conn, batch_id):
+    """
+    Returns the batch with its jobs in submission order, or None.
+    """
+    with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+        cur.execute(BATCH_QUERY, (str(batch_id),))
+        batch = cur.fetchone()
+        if not batch:
+            return None
+
+        cur.execute(BATCH_JOBS_QUERY, (batch["job_ids"],))
+        batch["jobs"] = cur.fetchall()
+
+    batch["pending"] = count_pending(batch["jobs"])
+    return batch
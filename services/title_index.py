@@ -0,0 +1,377 @@
+# services/title_index.py
+"""
+In-process typeahead index over every movie and series title.
+
+The index is built from one streaming query and then kept current from
+NOTIFY messages sent by queries/schema/title_index.sql. Lookups never touch
+Postgres:
+
+- prefix: a sorted array of every word-suffix of every normalised name
+  ("dark knight", "knight" for "The Dark Knight" → "the dark knight", ...),
+  searched with bisect
+- fuzzy: trigram → posting list of entry numbers, scored like pg_trgm's
+  similarity()
+
+Per-title columns are kept in parallel array.array columns rather than one
+object per title. Changes land in a small overlay that shadows the base
+arrays until the next rebuild.
+"""
+
+import json
+import re
+import select
+import threading
+import time
+import traceback
+import unicodedata
+from array import array
+from bisect import bisect_left
+from collections import Counter
+
+from config.settings import TITLE_INDEX_REBUILD_THRESHOLD
+from db.connection import get_connection, open_dedicated_connection, release_connection
+
+CHANNEL = "title_changes"
+
+TYPE_CODES = {"movie": 0, "tv": 1}
+TYPE_NAMES = ("movie", "tv")
+
+# pg_trgm's default similarity_threshold
+FUZZY_THRESHOLD = 0.3
+# Stop walking prefix matches after this many, so one-letter queries stay fast
+MAX_PREFIX_SCAN = 2000
+
+LOAD_QUERY = """
+    SELECT 'movie' AS type, m.movie_id AS id, m.movie_title AS title, m.original_title,
+           title_index_movie_year(m.movie_id, m.release_date) AS year,
+           m.popularity
+    FROM movies m
+    UNION ALL
+    SELECT 'tv', s.series_id, s.series_name, NULL,
+           EXTRACT(YEAR FROM s.first_air_date)::int, s.popularity
+    FROM series s
+"""
+
+_NON_WORD = re.compile(r"[^\w]+")
+
+
+def normalize(text):
+    """Lower-cased, accent-free, punctuation collapsed to single spaces."""
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(c for c in text if not unicodedata.combining(c)).casefold()
+    return " ".join(_NON_WORD.sub(" ", text).split())
+
+
+def trigrams(normalized):
+    """pg_trgm-style trigrams: each word padded with two spaces before, one after."""
+    grams = set()
+    for word in normalized.split():
+        padded = f"  {word} "
+        grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def _names(title, original_title):
+    names = []
+    for name in (normalize(title), normalize(original_title)):
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+def _suggestion(type_name, title_id, title, year, score):
+    return {
+        "type": type_name,
+        "id": title_id,
+        "title": title,
+        "year": year,
+        "score": round(score, 4),
+    }
+
+
+class TitleIndex:
+    """Immutable snapshot of all titles. Build with TitleIndex(rows)."""
+
+    def __init__(self, rows):
+        self.types = array("b")
+        self.ids = array("i")
+        self.years = array("h")
+        self.popularity = array("f")
+        self.titles = []
+
+        keys = []
+        postings = {}
+        self.trigram_counts = array("H")
+
+        for type_name, title_id, title, original_title, year, popularity in rows:
+            entry = len(self.ids)
+            self.types.append(TYPE_CODES[type_name])
+            self.ids.append(title_id)
+            self.years.append(year or 0)
+            self.popularity.append(float(popularity or 0))
+            self.titles.append(title or original_title or "")
+
+            grams = set()
+            for name in _names(title, original_title):
+                keys.append((name, entry, 1))
+                for i, char in enumerate(name):
+                    if char == " ":
+                        keys.append((name[i + 1 :], entry, 0))
+                grams |= trigrams(name)
+
+            self.trigram_counts.append(min(len(grams), 65535))
+            for gram in grams:
+                postings.setdefault(gram, array("i")).append(entry)
+
+        keys.sort()
+        self.prefix_keys = [k for k, _, _ in keys]
+        self.prefix_entries = array("i", (e for _, e, _ in keys))
+        self.prefix_is_start = array("b", (s for _, _, s in keys))
+        self.postings = postings
+
+    def __len__(self):
+        return len(self.ids)
+
+    def prefix_matches(self, query):
+        """{entry: rank}; rank 2 when the whole title starts with the query."""
+        found = {}
+        i = bisect_left(self.prefix_keys, query)
+        end = min(len(self.prefix_keys), i + MAX_PREFIX_SCAN)
+        while i < end and self.prefix_keys[i].startswith(query):
+            entry = self.prefix_entries[i]
+            rank = 2 if self.prefix_is_start[i] else 1
+            if found.get(entry, 0) < rank:
+                found[entry] = rank
+            i += 1
+        return found
+
+    def fuzzy_matches(self, query_grams):
+        """{entry: similarity} for entries at or above FUZZY_THRESHOLD."""
+        shared = Counter()
+        for gram in query_grams:
+            postings = self.postings.get(gram)
+            if postings:
+                shared.update(postings)
+
+        wanted = len(query_grams)
+        found = {}
+        for entry, common in shared.items():
+            similarity = common / (wanted + self.trigram_counts[entry] - common)
+            if similarity >= FUZZY_THRESHOLD:
+                found[entry] = similarity
+        return found
+
+    def describe(self, entry, score):
+        return _suggestion(
+            TYPE_NAMES[self.types[entry]],
+            self.ids[entry],
+            self.titles[entry],
+            self.years[entry] or None,
+            score,
+        )
+
+
+def _overlay_score(query, query_grams, names):
+    best = 0.0
+    for name in names:
+        if name.startswith(query):
+            best = max(best, 2.0)
+        elif f" {query}" in f" {name}":
+            best = max(best, 1.0)
+        else:
+            grams = trigrams(name)
+            common = len(grams & query_grams)
+            union = len(grams) + len(query_grams) - common
+            if union and common / union >= FUZZY_THRESHOLD:
+                best = max(best, common / union)
+    return best
+
+
+class LiveTitleIndex:
+    """
+    A TitleIndex plus the changes seen since it was built. Changed or
+    deleted titles live in `overlay` and hide their base entries; once the
+    overlay passes `rebuild_threshold` the base is rebuilt from Postgres.
+    """
+
+    def __init__(self, rebuild_threshold=TITLE_INDEX_REBUILD_THRESHOLD):
+        self.base = None
+        self.overlay = {}  # (type, id) → (seq, row or None)
+        self.rebuild_threshold = rebuild_threshold
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._rebuilding = False
+        self.loaded_at = None
+        self.load_seconds = None
+        self.changes_applied = 0
+
+    @property
+    def ready(self):
+        return self.base is not None
+
+    def load(self, conn=None):
+        """Builds a fresh base from one streaming query and swaps it in."""
+        with self._lock:
+            started_seq = self._seq
+
+        started = time.perf_counter()
+        owned = conn is None
+        conn = conn or get_connection()
+        try:
+            # Named cursor: rows stream from the server instead of all at once
+            with conn.cursor(name="title_index_load") as cur:
+                cur.itersize = 5000
+                cur.execute(LOAD_QUERY)
+                base = TitleIndex(cur)
+            conn.commit()
+        finally:
+            if owned:
+                release_connection(conn)
+
+        with self._lock:
+            self.base = base
+            # Changes seen before the load began are in the new base
+            self.overlay = {
+                key: value for key, value in self.overlay.items() if value[0] > started_seq
+            }
+            self._rebuilding = False
+        self.loaded_at = time.time()
+        self.load_seconds = time.perf_counter() - started
+        print(f"🔎 Title index loaded: {len(base)} titles in {self.load_seconds:.2f}s")
+        return base
+
+    def apply_change(self, change):
+        """Applies one NOTIFY payload from notify_title_change()."""
+        key = (change["type"], change["id"])
+        row = None
+        if change["op"] != "delete":
+            row = (
+                change["type"],
+                change["id"],
+                change.get("title"),
+                change.get("original_title"),
+                change.get("year"),
+                change.get("popularity"),
+            )
+
+        with self._lock:
+            self._seq += 1
+            self.overlay[key] = (self._seq, row)
+            self.changes_applied += 1
+            needs_rebuild = (
+                len(self.overlay) > self.rebuild_threshold and not self._rebuilding
+            )
+            if needs_rebuild:
+                self._rebuilding = True
+
+        if needs_rebuild:
+            threading.Thread(target=self._rebuild, daemon=True).start()
+
+    def _rebuild(self):
+        try:
+            self.load()
+        except Exception:
+            traceback.print_exc()
+            with self._lock:
+                self._rebuilding = False
+
+    def suggest(self, query, limit=10, media_type=None):
+        """
+        Best matches for a partial title: whole-title prefixes first, then
+        word prefixes, then fuzzy matches; ties go to the more popular title.
+        """
+        query = normalize(query)
+        base = self.base
+        if not query or base is None:
+            return []
+
+        with self._lock:
+            overlay = dict(self.overlay)
+
+        wanted_type = TYPE_CODES.get(media_type) if media_type else None
+        candidates = {}
+
+        def consider(key, item, popularity):
+            if key not in candidates or candidates[key][0] < (item["score"], popularity):
+                candidates[key] = ((item["score"], popularity), item)
+
+        query_grams = trigrams(query)
+        matches = base.prefix_matches(query)
+        if len(matches) < limit:
+            for entry, similarity in base.fuzzy_matches(query_grams).items():
+                matches.setdefault(entry, similarity)
+
+        for entry, score in matches.items():
+            if wanted_type is not None and base.types[entry] != wanted_type:
+                continue
+            key = (TYPE_NAMES[base.types[entry]], base.ids[entry])
+            if key in overlay:
+                continue
+            consider(key, base.describe(entry, score), base.popularity[entry])
+
+        for key, (_, row) in overlay.items():
+            if row is None or (media_type and key[0] != media_type):
+                continue
+            type_name, title_id, title, original_title, year, popularity = row
+            score = _overlay_score(query, query_grams, _names(title, original_title))
+            if score:
+                item = _suggestion(type_name, title_id, title or original_title, year, score)
+                consider(key, item, float(popularity or 0))
+
+        ranked = sorted(candidates.values(), key=lambda c: c[0], reverse=True)
+        return [item for _, item in ranked[:limit]]
+
+    def stats(self):
+        return {
+            "ready": self.ready,
+            "titles": len(self.base) if self.base is not None else 0,
+            "pending_changes": len(self.overlay),
+            "changes_applied": self.changes_applied,
+            "load_seconds": round(self.load_seconds, 3) if self.load_seconds else None,
+            "loaded_at": self.loaded_at,
+        }
+
+
+title_index = LiveTitleIndex()
+
+
+def run_listener(index, stop_event, poll_seconds=1.0):
+    """
+    LISTENs for title changes on a dedicated connection and applies them.
+    LISTEN starts before the initial load, so nothing committed during the
+    load is missed. Reconnects (and reloads) if the connection drops.
+    """
+    while not stop_event.is_set():
+        conn = None
+        try:
+            conn = open_dedicated_connection()
+            with conn.cursor() as cur:
+                cur.execute(f"LISTEN {CHANNEL}")
+            index.load()
+
+            while not stop_event.is_set():
+                if select.select([conn], [], [], poll_seconds) == ([], [], []):
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    notify = conn.notifies.pop(0)
+                    try:
+                        index.apply_change(json.loads(notify.payload))
+                    except (ValueError, KeyError):
+                        print(f"⚠️ Ignoring malformed title change: {notify.payload!r}")
+        except Exception:
+            print("❌ Title index listener failed; retrying")
+            traceback.print_exc()
+            stop_event.wait(5)
+        finally:
+            if conn is not None:
+                conn.close()
+
+
+def start_listener(index=title_index):
+    stop_event = threading.Event()
+    thread = threading.Thread(
+        target=run_listener, args=(index, stop_event), name="title-index", daemon=True
+    )
+    thread.start()
+    return thread, stop_event
@@ -0,0 +1,309 @@
+# services/title_page.py
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from decimal import Decimal
+
+from config.settings import TITLE_PAGE_CACHE_SIZE, TITLE_PAGE_CACHE_TTL
+from db.helpers import dict_cursor
+from services.actors import CAST_QUERIES, CREW_QUERIES
+from services.seasons import SEASON_MAP_QUERY, shape_season_map
+from services.title_utils import LIVE_RELATED_QUERIES, RELATED_QUERIES
+
+
+def _subquery(query):
+    return query.strip().rstrip(";")
+
+
+def _json_list(query):
+    return f"COALESCE((SELECT json_agg(q) FROM ({_subquery(query)}) q), '[]')"
+
+
+def _related_list(title_type):
+    """Stored neighbours, or the live query for titles not yet scored."""
+    return (
+        f"COALESCE("
+        f"(SELECT json_agg(q) FROM ({_subquery(RELATED_QUERIES[title_type])}) q), "
+        f"(SELECT json_agg(q) FROM ({_subquery(LIVE_RELATED_QUERIES[title_type])}) q), "
+        f"'[]')"
+    )
+
+
+MOVIE_PAGE_QUERY = f"""
+    SELECT json_build_object(
+        'title', (
+            SELECT row_to_json(t)
+            FROM (
+                SELECT
+                    m.movie_id,
+                    m.movie_id AS id,
+                    m.movie_title,
+                    m.movie_title AS title,
+                    'movie' AS type,
+                    m.original_title,
+                    m.overview,
+                    mm.release_year,
+                    m.release_date,
+                    mm.watched_date,
+                    m.runtime,
+                    m.vote_average,
+                    m.vote_count,
+                    m.poster_path,
+                    m.backdrop_path,
+                    sl.language_name,
+                    m.budget,
+                    m.revenue,
+                    m.homepage,
+                    mm.source,
+                    m.status,
+                    m.imdb_id,
+                    m.tagline,
+                    ARRAY(
+                        SELECT DISTINCT g.genre_name
+                        FROM movie_genres mg
+                        JOIN genres g ON g.genre_id = mg.genre_id
+                        WHERE mg.movie_id = m.movie_id AND g.genre_name IS NOT NULL
+                        ORDER BY g.genre_name
+                    ) AS genres
+                FROM movies m
+                JOIN movie_metadata mm ON mm.movie_id = m.movie_id
+                LEFT JOIN spoken_languages sl ON sl.iso_639_1 = m.original_language
+                WHERE m.movie_id = %s
+            ) t
+        ),
+        'personal_rating', (SELECT rating FROM movie_metadata WHERE movie_id = %s),
+        'cast', {_json_list(CAST_QUERIES["movie"])},
+        'crew', {_json_list(CREW_QUERIES["movie"])},
+        'related_titles', {_related_list("movie")},
+        'version', (SELECT to_json(last_updated) #>> '{{}}' FROM movies WHERE movie_id = %s)
+    )::text AS page
+"""
+
+SERIES_PAGE_QUERY = f"""
+    SELECT json_build_object(
+        'title', (
+            SELECT row_to_json(t)
+            FROM (
+                SELECT
+                    s.series_id,
+                    s.series_id AS id,
+                    s.series_name,
+                    s.series_name AS title,
+                    'tv' AS type,
+                    s.overview,
+                    s.first_air_date,
+                    s.last_air_date,
+                    s.number_of_seasons,
+                    s.number_of_episodes,
+                    s.popularity,
+                    s.vote_average,
+                    s.vote_count,
+                    s.poster_path,
+                    s.backdrop_path,
+                    s.original_language,
+                    s.status,
+                    s.homepage,
+                    s.imdb_id,
+                    ARRAY(
+                        SELECT DISTINCT g.genre_name
+                        FROM series_genres sg
+                        JOIN genres g ON g.genre_id = sg.genre_id
+                        WHERE sg.series_id = s.series_id AND g.genre_name IS NOT NULL
+                        ORDER BY g.genre_name
+                    ) AS genres,
+                    watch_range.first_watched_date,
+                    watch_range.last_watched_date
+                FROM series s
+                LEFT JOIN LATERAL (
+                    SELECT
+                        MIN(em.watched_date) AS first_watched_date,
+                        MAX(em.watched_date) AS last_watched_date
+                    FROM series_episodes se
+                    JOIN episode_metadata em ON em.episode_id = se.episode_id
+                    WHERE se.series_id = s.series_id
+                ) watch_range ON TRUE
+                WHERE s.series_id = %s
+            ) t
+        ),
+        'seasons', COALESCE(
+            (SELECT json_agg(sm ORDER BY sm.season_number) FROM ({_subquery(SEASON_MAP_QUERY)}) sm),
+            '[]'
+        ),
+        'cast', {_json_list(CAST_QUERIES["tv"])},
+        'crew', {_json_list(CREW_QUERIES["tv"])},
+        'related_titles', {_related_list("tv")},
+        'version', (SELECT to_json(last_updated) #>> '{{}}' FROM series WHERE series_id = %s)
+    )::text AS page
+"""
+
+# Placeholders in each page query, in order: title, [rating | seasons], cast,
+# crew, related (stored x1, live x3), version.
+PAGE_QUERIES = {
+    "movie": (MOVIE_PAGE_QUERY, 9),
+    "tv": (SERIES_PAGE_QUERY, 9),
+}
+
+# Versions are rendered by Postgres in both places so they compare exactly
+VERSION_QUERIES = {
+    "movie": "SELECT to_json(last_updated) #>> '{}' AS version FROM movies WHERE movie_id = %s",
+    "tv": "SELECT to_json(last_updated) #>> '{}' AS version FROM series WHERE series_id = %s",
+}
+
+TITLE_DATE_FIELDS = (
+    "release_date",
+    "watched_date",
+    "first_air_date",
+    "last_air_date",
+    "first_watched_date",
+    "last_watched_date",
+)
+
+# numeric columns that JSON may render without a fraction ("7" for 7)
+TITLE_NUMERIC_FIELDS = ("vote_average", "popularity")
+
+
+def _parse_json_date(value):
+    if not isinstance(value, str):
+        return value
+    try:
+        if len(value) == 10:
+            return date.fromisoformat(value)
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return value
+
+
+def page_params(title_type, title_id):
+    return (title_id,) * PAGE_QUERIES[title_type][1]
+
+
+def shape_title_page(title_type, page):
+    """
+    Turns the JSON page document into the context title_detail.html expects.
+    Numbers are read as Decimal, as psycopg2 returns numeric columns, and
+    dates come back from JSON as strings and are turned back into objects.
+    """
+    page = json.loads(page, parse_float=Decimal)
+    title = page.get("title")
+    if title:
+        for field in TITLE_DATE_FIELDS:
+            if field in title:
+                title[field] = _parse_json_date(title[field])
+        for field in TITLE_NUMERIC_FIELDS:
+            if isinstance(title.get(field), int):
+                title[field] = Decimal(title[field])
+
+    related = page.get("related_titles") or []
+    for item in related:
+        for field in ("release_date", "first_air_date"):
+            if field in item:
+                item[field] = _parse_json_date(item[field])
+
+    if title_type == "tv":
+        season_map, series_rating = shape_season_map(page.get("seasons") or [])
+    else:
+        season_map, series_rating = [], None
+
+    return {
+        "title": title,
+        "cast": page.get("cast") or [],
+        "crew": page.get("crew") or [],
+        "related_titles": related,
+        "personal_rating": page.get("personal_rating"),
+        "season_map": season_map,
+        "series_rating": series_rating,
+        "version": page.get("version"),
+        # Identifies this build of the page (fragment cache keys use it)
+        "built_at": time.time(),
+    }
+
+
+class TitlePageCache:
+    """
+    LRU of assembled title pages keyed by (type, id). An entry is only
+    served while the title's last_updated still matches the version it was
+    built from, and never past `ttl` seconds (ratings, cast and watch history
+    can change without touching last_updated).
+    """
+
+    def __init__(self, maxsize=TITLE_PAGE_CACHE_SIZE, ttl=TITLE_PAGE_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, version):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                cached_version, stored_at, page = entry
+                if cached_version == version and time.monotonic() - stored_at < self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return page
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, version, page):
+        with self._lock:
+            self._entries[key] = (version, time.monotonic(), page)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+page_cache = TitlePageCache()
+
+
+def get_title_version(title_type, title_id, conn=None):
+    """Cheap PK lookup of the title's last_updated, as a string."""
+    with dict_cursor(conn) as cursor:
+        cursor.execute(VERSION_QUERIES[title_type], (title_id,))
+        row = cursor.fetchone()
+    return row["version"] if row else None
+
+
+def get_title_page(title_type: str, title_id: int, conn=None):
+    """
+    Returns the full title page model, from cache when the title hasn't
+    changed since it was assembled. Raises ValueError for unknown types.
+    """
+    if title_type not in PAGE_QUERIES:
+        raise ValueError(f"Invalid title type: {title_type}")
+
+    key = (title_type, title_id)
+    with dict_cursor(conn) as cursor:
+        cursor.execute(VERSION_QUERIES[title_type], (title_id,))
+        row = cursor.fetchone()
+        version = row["version"] if row else None
+
+        if version is not None:
+            cached = page_cache.get(key, version)
+            if cached is not None:
+                return {**cached, "cached": True}
+
+        cursor.execute(PAGE_QUERIES[title_type][0], page_params(title_type, title_id))
+        page = shape_title_page(title_type, cursor.fetchone()["page"])
+
+    if page["title"] is not None and page["version"] is not None:
+        page_cache.put(key, page["version"], page)
+    return {**page, "cached": False}
@@ -1,50 +1,94 @@
-import psycopg2
-from db.connection import get_connection, release_connection
 from db.helpers import dict_cursor
 
-def get_related_titles(title_id: int, title_type: str):
-    if title_type == "movie":
-        query = """
-        SELECT DISTINCT m.movie_id, m.movie_title, m.release_date, m.poster_path
-        FROM movies m
-        JOIN movie_cast mc ON mc.movie_id = m.movie_id
-        WHERE mc.actor_id IN (
-            SELECT actor_id FROM movie_cast WHERE movie_id = %s
-        )
-        OR m.movie_id IN (
-            SELECT mg2.movie_id
-            FROM movie_genres mg1
-            JOIN movie_genres mg2 ON mg1.genre_id = mg2.genre_id
-            WHERE mg1.movie_id = %s AND mg2.movie_id != %s
-        )
-        AND m.movie_id != %s
-        ORDER BY m.release_date DESC
+# Precomputed by build_related.py (services/related.py). Overview/tagline
+# similarity ("content") counts half, so it mostly fills in for titles with
+# few shared credits.
+RELATED_QUERIES = {
+    "movie": """
+        SELECT m.movie_id, m.movie_title, m.release_date, m.poster_path
+        FROM (
+            SELECT n.neighbour_id, SUM(n.score * CASE n.method WHEN 'content' THEN 0.5 ELSE 1.0 END) AS score
+            FROM title_neighbours n
+            WHERE n.media_type = 'movie' AND n.title_id = %s
+            GROUP BY n.neighbour_id
+        ) r
+        JOIN movies m ON m.movie_id = r.neighbour_id
+        ORDER BY r.score DESC, m.movie_id
         LIMIT 12;
-        """
-        params = (title_id, title_id, title_id, title_id)
+        """,
+    "tv": """
+        SELECT s.series_id, s.series_name, s.first_air_date, s.poster_path
+        FROM (
+            SELECT n.neighbour_id, SUM(n.score * CASE n.method WHEN 'content' THEN 0.5 ELSE 1.0 END) AS score
+            FROM title_neighbours n
+            WHERE n.media_type = 'tv' AND n.title_id = %s
+            GROUP BY n.neighbour_id
+        ) r
+        JOIN series s ON s.series_id = r.neighbour_id
+        ORDER BY r.score DESC, s.series_id
+        LIMIT 12;
+        """,
+}
 
-    elif title_type == "tv":
-        query = """
-        SELECT DISTINCT s.series_id, s.series_name, s.first_air_date, s.poster_path
-        FROM series s
-        JOIN series_cast sc ON sc.series_id = s.series_id
-        WHERE sc.person_id IN (
-            SELECT person_id FROM series_cast WHERE series_id = %s
-        )
-        OR s.series_id IN (
-            SELECT sg2.series_id
-            FROM series_genres sg1
-            JOIN series_genres sg2 ON sg1.genre_id = sg2.genre_id
-            WHERE sg1.series_id = %s AND sg2.series_id != %s
-        )
-        AND s.series_id != %s
-        ORDER BY s.first_air_date DESC
+# Live fallback for titles the job hasn't scored yet: a shared cast member
+# counts 1, a shared genre 0.3, most popular first among equals
+LIVE_RELATED_QUERIES = {
+    "movie": """
+        SELECT m.movie_id, m.movie_title, m.release_date, m.poster_path
+        FROM (
+            SELECT shared.movie_id, SUM(shared.weight) AS score
+            FROM (
+                SELECT mc2.movie_id, 1.0 AS weight
+                FROM movie_cast mc1
+                JOIN movie_cast mc2 ON mc2.actor_id = mc1.actor_id
+                WHERE mc1.movie_id = %s
+                UNION ALL
+                SELECT mg2.movie_id, 0.3
+                FROM movie_genres mg1
+                JOIN movie_genres mg2 ON mg2.genre_id = mg1.genre_id
+                WHERE mg1.movie_id = %s
+            ) shared
+            WHERE shared.movie_id != %s
+            GROUP BY shared.movie_id
+        ) r
+        JOIN movies m ON m.movie_id = r.movie_id
+        ORDER BY r.score DESC, m.popularity DESC NULLS LAST, m.movie_id
+        LIMIT 12;
+        """,
+    "tv": """
+        SELECT s.series_id, s.series_name, s.first_air_date, s.poster_path
+        FROM (
+            SELECT shared.series_id, SUM(shared.weight) AS score
+            FROM (
+                SELECT sc2.series_id, 1.0 AS weight
+                FROM series_cast sc1
+                JOIN series_cast sc2 ON sc2.person_id = sc1.person_id
+                WHERE sc1.series_id = %s
+                UNION ALL
+                SELECT sg2.series_id, 0.3
+                FROM series_genres sg1
+                JOIN series_genres sg2 ON sg2.genre_id = sg1.genre_id
+                WHERE sg1.series_id = %s
+            ) shared
+            WHERE shared.series_id != %s
+            GROUP BY shared.series_id
+        ) r
+        JOIN series s ON s.series_id = r.series_id
+        ORDER BY r.score DESC, s.popularity DESC NULLS LAST, s.series_id
         LIMIT 12;
-        """
-        params = (title_id, title_id, title_id, title_id)
+        """,
+}
+
 
-    else:
+def get_related_titles(title_id: int, title_type: str, conn=None):
+    query = RELATED_QUERIES.get(title_type)
+    if query is None:
         return []
 
-    with dict_cursor() as cursor:
-        cursor.execute(query, params)
+    with dict_cursor(conn) as cursor:
+        cursor.execute(query, (title_id,))
+        rows = cursor.fetchall()
+        if not rows:
+            cursor.execute(LIVE_RELATED_QUERIES[title_type], (title_id,) * 3)
+            rows = cursor.fetchall()
+        return rows
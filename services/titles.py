@@ -1,11 +1,9 @@
-from db.connection import get_connection, release_connection
-import psycopg2.extras
-
+from config.settings import MISSING_PAGE_SIZE
 from db.helpers import dict_cursor
+from services.missing_titles import missing_condition, next_page
 
 
-def get_title_by_id(title_id: int):
-    query = """
+TITLE_BY_ID_QUERY = """
         SELECT
             m.movie_id,
             m.movie_title,
@@ -34,11 +32,17 @@ def get_title_by_id(title_id: int):
 		LEFT JOIN spoken_languages sl ON sl.iso_639_1 = m.original_language
         JOIN movie_metadata mm ON mm.movie_id = m.movie_id
         WHERE m.movie_id = %s
-    """
-    with dict_cursor() as cursor:
-        cursor.execute(query, (title_id,))
-        rows = cursor.fetchall()
+"""
+
+
+def get_title_by_id(title_id: int, conn=None):
+    with dict_cursor(conn) as cursor:
+        cursor.execute(TITLE_BY_ID_QUERY, (title_id,))
+        return shape_title(cursor.fetchall())
 
+
+def shape_title(rows):
+    """Folds the one-row-per-genre result into a single movie dict."""
     if not rows:
         return None
 
@@ -60,8 +64,7 @@ def get_title_by_id(title_id: int):
     return base
 
 
-def get_series_by_id(series_id: int):
-    query = """
+SERIES_BY_ID_QUERY = """
         SELECT
             s.series_id,
             s.series_name,
@@ -96,11 +99,17 @@ def get_series_by_id(series_id: int):
             GROUP BY se.series_id
         ) AS watch_range ON watch_range.series_id = s.series_id
         WHERE s.series_id = %s;
-    """
-    with dict_cursor() as cursor:
-        cursor.execute(query, (series_id,))
-        rows = cursor.fetchall()
+"""
+
+
+def get_series_by_id(series_id: int, conn=None):
+    with dict_cursor(conn) as cursor:
+        cursor.execute(SERIES_BY_ID_QUERY, (series_id,))
+        return shape_series(cursor.fetchall())
 
+
+def shape_series(rows):
+    """Folds the one-row-per-genre result into a single series dict."""
     if not rows:
         return None
 
@@ -121,27 +130,21 @@ def get_series_by_id(series_id: int):
     return base
 
 
-DATE_FIELDS = {"release_date", "first_air_date"}
-NUMERIC_FIELDS = {
-    "budget",
-    "revenue",
-    "runtime",
-    "vote_count",
-    "number_of_seasons",
-    "number_of_seasons",
-}
+PERSONAL_RATING_QUERY = """
+    SELECT rating
+    FROM movie_metadata
+    WHERE movie_id = %s
+"""
 
 
-def get_movie_titles_missing(field: str):
-    column = MOVIE_FIELD_MAP.get(field)
-    if not column:
-        raise ValueError(f"Invalid field: {field}")
+def get_personal_rating(movie_id: int, conn=None):
+    with dict_cursor(conn) as cursor:
+        cursor.execute(PERSONAL_RATING_QUERY, (movie_id,))
+        row = cursor.fetchone()
+    return row["rating"] if row and row["rating"] is not None else None
 
-    if column in NUMERIC_FIELDS or column in DATE_FIELDS:
-        condition = f"{column} IS NULL"
-    else:
-        condition = f"{column} IS NULL OR {column} = ''"
 
+def movie_missing_query(field: str):
     query = f"""
         SELECT
 	        movie_id,
@@ -156,36 +159,23 @@ def get_movie_titles_missing(field: str):
             budget,
             revenue,
             tagline
-        FROM movies
-        WHERE {condition}
+        FROM movies m
+        WHERE {missing_condition("movie", field, "m")}
+          AND movie_id > %(after)s
+        ORDER BY movie_id
+        LIMIT %(limit)s
     """
-    with dict_cursor() as cursor:
-        cursor.execute(query)
-
-MOVIE_FIELD_MAP = {
-    "missing_overview": "overview",
-    "missing_release_date": "release_date",
-    "missing_runtime": "runtime",
-    "missing_poster_path": "poster_path",
-    "missing_original_language": "original_language",
-    "missing_status": "status",
-    "missing_imdb": "imdb_id",
-    "missing_budget": "budget",
-    "missing_revenue": "revenue",
-    "missing_tagline": "tagline"
-}
-
-
-def get_tv_titles_missing(field: str):
-    column = TV_FIELD_MAP.get(field)
-    if not column:
-        raise ValueError(f"Invalid field: {field}")
-
-    if column in NUMERIC_FIELDS or column in DATE_FIELDS:
-        condition = f"{column} IS NULL"
-    else:
-        condition = f"{column} IS NULL OR {column} = ''"
+    return query
+
+
+def get_movie_titles_missing(field: str, conn=None, after=0, limit=MISSING_PAGE_SIZE):
+    query = movie_missing_query(field)
+    with dict_cursor(conn) as cursor:
+        cursor.execute(query, {"after": after, "limit": limit + 1})
+        return next_page(cursor.fetchall(), limit, "movie_id")
 
+
+def tv_missing_query(field: str):
     query = f"""
         SELECT
             series_id,
@@ -198,21 +188,18 @@ def get_tv_titles_missing(field: str):
 			imdb_id,
 			number_of_seasons,
 			number_of_episodes
-        FROM series
-        WHERE {condition}
+        FROM series s
+        WHERE {missing_condition("tv", field, "s")}
+          AND series_id > %(after)s
+        ORDER BY series_id
+        LIMIT %(limit)s
     """
-    with dict_cursor() as cursor:
-        cursor.execute(query)
-
-TV_FIELD_MAP = {
-    "missing_overview": "overview",
-    "missing_first_air_date": "first_air_date",
-    "missing_runtime": "episode_run_time",
-    "missing_poster_path": "poster_path",
-    "missing_original_language": "original_language",
-    "missing_status": "status",
-    "missing_imdb": "imdb_id",
-    "missing_network": "network",
-    "missing_number_of_episodes": "number_of_episodes",
-    "missing_number_of_seasons": "number_of_seasons",
-}
+    return query
+
+
+def get_tv_titles_missing(field: str, conn=None, after=0, limit=MISSING_PAGE_SIZE):
+    """One page of series missing `field`, by id. Returns (rows, next_after)."""
+    query = tv_missing_query(field)
+    with dict_cursor(conn) as cursor:
+        cursor.execute(query, {"after": after, "limit": limit + 1})
+        return next_page(cursor.fetchall(), limit, "series_id")
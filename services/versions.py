@@ -0,0 +1,61 @@
+# services/versions.py
+"""
+Cheap "has anything changed?" lookups used as HTTP validators (ETag /
+Last-Modified) before a page runs its real queries. Times come back as
+epoch seconds.
+"""
+
+from db.helpers import dict_cursor
+
+# Served by the last_updated indexes in queries/schema/page_versions.sql
+LIBRARY_VERSION_QUERY = """
+    SELECT
+        EXTRACT(EPOCH FROM (SELECT MAX(last_updated) FROM movies)::timestamptz) AS movies,
+        EXTRACT(EPOCH FROM (SELECT MAX(last_updated) FROM series)::timestamptz) AS series
+"""
+
+# The title row plus its stored related-title lists
+TITLE_VERSION_QUERIES = {
+    "movie": """
+        SELECT
+            EXTRACT(EPOCH FROM m.last_updated::timestamptz) AS updated,
+            (
+                SELECT EXTRACT(EPOCH FROM MAX(n.computed_at))
+                FROM title_neighbours n
+                WHERE n.media_type = 'movie' AND n.title_id = m.movie_id
+            ) AS related
+        FROM movies m
+        WHERE m.movie_id = %s
+    """,
+    "tv": """
+        SELECT
+            EXTRACT(EPOCH FROM s.last_updated::timestamptz) AS updated,
+            (
+                SELECT EXTRACT(EPOCH FROM MAX(n.computed_at))
+                FROM title_neighbours n
+                WHERE n.media_type = 'tv' AND n.title_id = s.series_id
+            ) AS related
+        FROM series s
+        WHERE s.series_id = %s
+    """,
+}
+
+
+def epoch(value):
+    return float(value) if value is not None else None
+
+
+def get_library_version(conn=None):
+    """(movies, series) latest last_updated, for pages listing many titles."""
+    with dict_cursor(conn) as cursor:
+        cursor.execute(LIBRARY_VERSION_QUERY)
+        row = cursor.fetchone()
+    return epoch(row["movies"]), epoch(row["series"])
+
+
+def get_title_version(title_type, title_id, conn=None):
+    """(updated, related) for one title, or None if it doesn't exist."""
+    with dict_cursor(conn) as cursor:
+        cursor.execute(TITLE_VERSION_QUERIES[title_type], (title_id,))
+        row = cursor.fetchone()
+    return (epoch(row["updated"]), epoch(row["related"])) if row else None
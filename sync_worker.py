@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Consumes the sync_jobs queue filled by /upload and /bulk-upload.
+Run as many copies as you like, on as many machines as you like:
+
+    python sync_worker.py            # run forever
+    python sync_worker.py --once     # drain the queue, then exit
+"""
+
+import argparse
+import os
+import socket
+import time
+import traceback
+
+from config.settings import SYNC_POLL_SECONDS, SYNC_JOB_LEASE_SECONDS
+from db.connection import get_connection, release_connection
+from services.stats import refresh_stats_snapshot
+from services.sync_jobs import (
+    claim_job,
+    complete_job,
+    fail_job,
+    requeue_expired_jobs,
+    set_job_stage,
+)
+from uploader import dimension_cache
+from uploader.media_processor import sync_title
+
+
+def worker_name():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def stage_reporter(job_id):
+    """
+    Progress callback for sync_title. Stages are written on their own
+    connection so they don't commit (or wait on) the sync's transaction.
+    """
+
+    def report(stage):
+        conn = get_connection()
+        try:
+            set_job_stage(conn, job_id, stage)
+        except Exception as e:
+            conn.rollback()
+            print(f"⚠️ Could not record stage {stage!r} for job {job_id}: {e}")
+        finally:
+            release_connection(conn)
+
+    return report
+
+
+def run_next_job(worker_id):
+    """
+    Claims and runs a single job. Returns False when the queue was empty.
+    """
+    conn = get_connection()
+    try:
+        job = claim_job(conn, worker_id)
+        if job is None:
+            return False
+
+        print(
+            f"🛠️ [{worker_id}] job {job['job_id']}: {job['media_type']} "
+            f"{job['tmdb_id']} (attempt {job['attempts']}/{job['max_attempts']})"
+        )
+
+        try:
+            result = sync_title(
+                conn,
+                job["tmdb_id"],
+                job["media_type"],
+                progress=stage_reporter(job["job_id"]),
+            )
+        except Exception as e:
+            traceback.print_exc()
+            conn.rollback()
+            dimension_cache.discard(conn)
+            status = fail_job(conn, job["job_id"], f"{type(e).__name__}: {e}")
+            print(f"❌ Job {job['job_id']} failed → {status}")
+        else:
+            complete_job(conn, job["job_id"], result)
+            print(f"✅ Job {job['job_id']} done: {result['message']}")
+
+        return True
+    finally:
+        release_connection(conn)
+
+
+def sweep_expired_leases():
+    conn = get_connection()
+    try:
+        count = requeue_expired_jobs(conn)
+        if count:
+            print(f"♻️ Requeued {count} job(s) with expired leases")
+    finally:
+        release_connection(conn)
+
+
+def refresh_stats():
+    conn = get_connection()
+    try:
+        refresh_stats_snapshot(conn)
+    except Exception as e:
+        conn.rollback()
+        print(f"⚠️ Stats snapshot refresh failed: {e}")
+    finally:
+        release_connection(conn)
+
+
+def run_worker(once=False, worker_id=None):
+    worker_id = worker_id or worker_name()
+    print(f"🚀 Sync worker {worker_id} started")
+
+    last_sweep = 0.0
+    processed = False
+    while True:
+        if time.monotonic() - last_sweep > SYNC_JOB_LEASE_SECONDS / 3:
+            sweep_expired_leases()
+            last_sweep = time.monotonic()
+
+        if run_next_job(worker_id):
+            processed = True
+            continue
+
+        # The queue just drained after a batch: bring dashboard stats up to date
+        if processed:
+            refresh_stats()
+            processed = False
+
+        if once:
+            print("✅ Queue drained.")
+            print(f"🗃️ Dimension cache: {dimension_cache.cache_stats()}")
+            return
+        time.sleep(SYNC_POLL_SECONDS)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Process queued TMDB syncs.")
+    parser.add_argument("--once", action="store_true", help="exit when the queue is empty")
+    args = parser.parse_args()
+
+    try:
+        run_worker(once=args.once)
+    except KeyboardInterrupt:
+        print("👋 Worker stopped.")
@@ -0,0 +1,100 @@
+# tmdb/client.py
+
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from config.settings import TMDB_API_KEY, TMDB_TIMEOUT, TMDB_MAX_WORKERS
+
+TMDB_BASE = "https://api.themoviedb.org/3"
+
+_session = None
+_executor = None
+_lock = threading.Lock()
+
+
+def get_session():
+    """
+    Returns the process-wide TMDB session. Keep-alive connections are pooled
+    and 429/5xx responses are retried with backoff (honouring Retry-After).
+    """
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                retry = Retry(
+                    total=3,
+                    backoff_factor=0.5,
+                    status_forcelist=(429, 500, 502, 503, 504),
+                    allowed_methods=("GET",),
+                    respect_retry_after_header=True,
+                    raise_on_status=False,
+                )
+                adapter = HTTPAdapter(
+                    pool_connections=4,
+                    pool_maxsize=TMDB_MAX_WORKERS * 2,
+                    max_retries=retry,
+                )
+                session = requests.Session()
+                session.mount("https://", adapter)
+                _session = session
+    return _session
+
+
+def tmdb_get(path, params=None, timeout=None):
+    """
+    GETs a TMDB v3 path (e.g. "/movie/550") and returns the parsed JSON.
+    Raises requests.HTTPError for non-2xx responses.
+    """
+    query = {"api_key": TMDB_API_KEY}
+    if params:
+        query.update(params)
+
+    response = get_session().get(
+        f"{TMDB_BASE}{path}", params=query, timeout=timeout or TMDB_TIMEOUT
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=TMDB_MAX_WORKERS, thread_name_prefix="tmdb"
+                )
+    return _executor
+
+
+def map_concurrent(fn, items, max_in_flight=None):
+    """
+    Runs fn(item) for every item on the shared TMDB executor and yields
+    (item, result, error) as each call finishes. At most max_in_flight calls
+    are queued at once, so huge item lists don't pile up in memory.
+    """
+    executor = get_executor()
+    max_in_flight = max_in_flight or TMDB_MAX_WORKERS * 2
+    items = iter(items)
+    pending = {}
+
+    def submit_next():
+        for item in items:
+            pending[executor.submit(fn, item)] = item
+            return True
+        return False
+
+    while len(pending) < max_in_flight and submit_next():
+        pass
+
+    while pending:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            item = pending.pop(future)
+            error = future.exception()
+            yield item, (None if error else future.result()), error
+            submit_next()
@@ -0,0 +1,149 @@
+# uploader/dimension_cache.py
+
+import threading
+from collections import OrderedDict
+
+from psycopg2 import sql
+
+from config.settings import DIMENSION_CACHE_SIZE
+
+# dimension → (table, key column)
+DIMENSIONS = {
+    "people": ("people", "person_id"),
+    "genres": ("genres", "genre_id"),
+    "production_companies": ("production_companies", "company_id"),
+    "spoken_languages": ("spoken_languages", "iso_639_1"),
+    "countries": ("countries", "iso_3166_1"),
+}
+
+
+class DimensionCache:
+    """
+    Bounded LRU set of keys known to exist in one dimension table.
+
+    Keys inserted by a connection stay private to it ("pending") until that
+    connection commits and calls confirm(); discard() drops them on rollback,
+    so a rolled-back insert can never be mistaken for an existing row.
+    """
+
+    def __init__(self, name, table, key_column, maxsize=DIMENSION_CACHE_SIZE):
+        self.name = name
+        self.table = table
+        self.key_column = key_column
+        self.maxsize = maxsize
+        self._keys = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.loaded = 0
+
+    def _add(self, key):
+        self._keys[key] = None
+        self._keys.move_to_end(key)
+        while len(self._keys) > self.maxsize:
+            self._keys.popitem(last=False)
+
+    def known(self, conn, key):
+        with self._lock:
+            if key in self._keys:
+                self._keys.move_to_end(key)
+                self.hits += 1
+                return True
+            if key in self._pending.get(id(conn), ()):
+                self.hits += 1
+                return True
+            self.misses += 1
+            return False
+
+    def prefetch(self, cur, keys):
+        """
+        Warms the cache for a batch of keys with a single lookup, so the
+        per-item known() checks that follow don't each go to the DB.
+        """
+        with self._lock:
+            pending = self._pending.get(id(cur.connection), ())
+            missing = list(
+                {
+                    k
+                    for k in keys
+                    if k is not None and k not in self._keys and k not in pending
+                }
+            )
+        if not missing:
+            return
+
+        cur.execute(
+            sql.SQL("SELECT {key} FROM {table} WHERE {key} = ANY(%s);").format(
+                key=sql.Identifier(self.key_column), table=sql.Identifier(self.table)
+            ),
+            (missing,),
+        )
+        found = [
+            row[self.key_column] if isinstance(row, dict) else row[0]
+            for row in cur.fetchall()
+        ]
+
+        with self._lock:
+            for key in found:
+                self._add(key)
+            self.loaded += len(found)
+
+    def remember(self, conn, key):
+        with self._lock:
+            self._pending.setdefault(id(conn), set()).add(key)
+
+    def confirm(self, conn):
+        with self._lock:
+            for key in self._pending.pop(id(conn), ()):
+                self._add(key)
+
+    def discard(self, conn):
+        with self._lock:
+            self._pending.pop(id(conn), None)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._keys),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "loaded": self.loaded,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            }
+
+
+_caches = {
+    name: DimensionCache(name, table, key_column)
+    for name, (table, key_column) in DIMENSIONS.items()
+}
+
+
+def prefetch(cur, dimension, keys):
+    _caches[dimension].prefetch(cur, keys)
+
+
+def known(cur, dimension, key):
+    return _caches[dimension].known(cur.connection, key)
+
+
+def remember(cur, dimension, key):
+    _caches[dimension].remember(cur.connection, key)
+
+
+def confirm(conn):
+    """Call after conn.commit(): keys inserted on conn become shared."""
+    for cache in _caches.values():
+        cache.confirm(conn)
+
+
+def discard(conn):
+    """Call after conn.rollback(): forget keys inserted on conn."""
+    for cache in _caches.values():
+        cache.discard(conn)
+
+
+def cache_stats():
+    return {name: cache.stats() for name, cache in _caches.items()}
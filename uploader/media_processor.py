@@ -1,8 +1,17 @@
 # uploader/media_processor.py
 
+from datetime import datetime
+
 from config.settings import TMDB_API_KEY
+from services.logs import (
+    get_previous_log_timestamp,
+    fetch_new_update_logs,
+    filter_changes,
+)
+from tmdb.search_api import get_tmdb_data
 from tmdb.movie_api import get_movie_data
 from tmdb.tv_api import fetch_series, fetch_all_episodes
+from uploader import dimension_cache
 from uploader.movie_uploader import insert_or_update_movie_data
 from uploader.tv_uploader import (
     insert_or_update_series_data,
@@ -11,15 +20,24 @@ from uploader.tv_uploader import (
 )
 
 
-def process_media_upload(conn, tmdb_id, media_type):
+def _report(progress, stage):
+    if progress is not None:
+        progress(stage)
+
+
+def process_media_upload(conn, tmdb_id, media_type, progress=None):
     """
     Handles uploading/syncing of movie or TV series data.
     Uses an existing DB connection (shared across bulk uploads).
+    `progress`, if given, is called with "fetched" once the TMDb data is in
+    hand and "written" once it is saved.
     """
 
     if media_type == "movie":
         movie_data = get_movie_data(tmdb_id)
+        _report(progress, "fetched")
         insert_or_update_movie_data(conn, movie_data, media_type)
+        _report(progress, "written")
 
         print(f"🎬 Movie '{movie_data.get('title')}' synced (id={movie_data['id']})")
 
@@ -31,30 +49,38 @@ def process_media_upload(conn, tmdb_id, media_type):
         series_data = fetch_series(tmdb_id)
         series_id = series_data.get("id")
         series_name = series_data.get("name")
+        _report(progress, "fetched")
 
         print(f"📺 Starting sync for TV Series '{series_name}' (id={series_id})")
 
-        # Insert/update series first
-        insert_or_update_series_data(conn, series_data, TMDB_API_KEY)
+        try:
+            # Insert/update series first
+            insert_or_update_series_data(conn, series_data, TMDB_API_KEY)
 
-        # Sync seasons
-        with conn.cursor() as cur:
-            sync_series_seasons(cur, series_data)
+            # Sync seasons
+            with conn.cursor() as cur:
+                sync_series_seasons(cur, series_data)
 
-        # Fetch episodes
-        episodes = fetch_all_episodes(series_id)
-        if not episodes:
-            print(f"⚠️ No episodes found for series_id={series_id}")
-        else:
-            print(f"📦 {len(episodes)} episodes fetched for series_id={series_id}")
+            # Fetch episodes
+            episodes = fetch_all_episodes(series_id)
+            if not episodes:
+                print(f"⚠️ No episodes found for series_id={series_id}")
+            else:
+                print(f"📦 {len(episodes)} episodes fetched for series_id={series_id}")
 
-        series_data["episodes"] = episodes
+            series_data["episodes"] = episodes
 
-        # Sync episodes
-        with conn.cursor() as cur:
-            sync_series_episodes(cur, series_id, series_data)
+            # Sync episodes
+            with conn.cursor() as cur:
+                sync_series_episodes(cur, series_id, series_data)
 
-        conn.commit()
+            conn.commit()
+            dimension_cache.confirm(conn)
+        except Exception:
+            conn.rollback()
+            dimension_cache.discard(conn)
+            raise
+        _report(progress, "written")
 
         print(f"✅ TV Series '{series_name}' synced successfully")
 
@@ -64,3 +90,54 @@ def process_media_upload(conn, tmdb_id, media_type):
 
     print(f"❌ Unsupported media type: {media_type}")
     return None, "❌ Invalid media type selected."
+
+
+def sync_title(conn, tmdb_id, media_type, progress=None):
+    """
+    Syncs one title and collects the update_logs rows it produced.
+    Returns a result dict with tmdb_id, content_id, title, message and changes.
+    `progress` is passed on to process_media_upload.
+    """
+    previous_max = get_previous_log_timestamp(conn, tmdb_id, media_type)
+    if previous_max is None:
+        previous_max = datetime.min
+
+    content_id, base_message = process_media_upload(
+        conn, tmdb_id, media_type, progress=progress
+    )
+
+    title = ""
+    filtered = []
+
+    if content_id:
+        changes = fetch_new_update_logs(conn, content_id, media_type, previous_max)
+        filtered = filter_changes(changes)
+
+        if filtered:
+            first = filtered[0]
+            title = (
+                first.get("title")
+                or first.get("movie_title")
+                or first.get("series_title")
+                or ""
+            )
+
+        if not title:
+            tmdb_data = get_tmdb_data(tmdb_id, media_type)
+            title = tmdb_data.get("title") or tmdb_data.get("name") or ""
+
+        message = (
+            base_message
+            if filtered
+            else f"{base_message} No changes needed — already up-to-date."
+        )
+    else:
+        message = f"{base_message} No movie ID returned — upload may have failed."
+
+    return {
+        "tmdb_id": tmdb_id,
+        "content_id": content_id,
+        "title": title or "Unknown Title",
+        "message": message,
+        "changes": filtered,
+    }
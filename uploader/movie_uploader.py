@@ -1,5 +1,6 @@
 from datetime import datetime
 from db.logger import log_update
+from uploader import dimension_cache
 from psycopg2 import sql
 import traceback
 import json
@@ -272,12 +273,14 @@ def insert_or_update_movie_data(conn, movie, media_type):
             insert_crew(cur, movie_id, movie)
 
         conn.commit()
+        dimension_cache.confirm(conn)
         print(f"✅ Movie ID {movie_id} processed successfully.")
 
     except Exception as e:
         print(f"❌ Failed to insert/update movie_id={movie_id}: {e}")
         traceback.print_exc()
         conn.rollback()
+        dimension_cache.discard(conn)
 
 
 def normalize_movie_payload(movie):
@@ -289,14 +292,19 @@ def normalize_movie_payload(movie):
 
 
 def insert_genres(cur, movie_id, movie):
-    for genre in movie.get("genres", []):
-        cur.execute(
-            """
-            INSERT INTO genres (genre_id, genre_name)
-            VALUES (%s, %s) ON CONFLICT DO NOTHING;
-        """,
-            (genre["id"], genre["name"]),
-        )
+    genres = movie.get("genres", [])
+    dimension_cache.prefetch(cur, "genres", [g["id"] for g in genres])
+
+    for genre in genres:
+        if not dimension_cache.known(cur, "genres", genre["id"]):
+            cur.execute(
+                """
+                INSERT INTO genres (genre_id, genre_name)
+                VALUES (%s, %s) ON CONFLICT DO NOTHING;
+            """,
+                (genre["id"], genre["name"]),
+            )
+            dimension_cache.remember(cur, "genres", genre["id"])
 
         cur.execute(
             """
@@ -340,19 +348,26 @@ def insert_genres(cur, movie_id, movie):
 
 
 def insert_production_companies(cur, movie_id, movie):
-    for company in movie.get("production_companies", []):
-        cur.execute(
-            """
-            INSERT INTO production_companies (company_id, company_name, logo_path, origin_country)
-            VALUES (%s, %s, %s, %s) ON CONFLICT DO NOTHING;
-        """,
-            (
-                company["id"],
-                company["name"],
-                company.get("logo_path"),
-                company.get("origin_country"),
-            ),
-        )
+    companies = movie.get("production_companies", [])
+    dimension_cache.prefetch(
+        cur, "production_companies", [c["id"] for c in companies]
+    )
+
+    for company in companies:
+        if not dimension_cache.known(cur, "production_companies", company["id"]):
+            cur.execute(
+                """
+                INSERT INTO production_companies (company_id, company_name, logo_path, origin_country)
+                VALUES (%s, %s, %s, %s) ON CONFLICT DO NOTHING;
+            """,
+                (
+                    company["id"],
+                    company["name"],
+                    company.get("logo_path"),
+                    company.get("origin_country"),
+                ),
+            )
+            dimension_cache.remember(cur, "production_companies", company["id"])
 
         cur.execute(
             """
@@ -398,14 +413,21 @@ def insert_production_companies(cur, movie_id, movie):
 
 
 def insert_spoken_languages(cur, movie_id, movie):
-    for lang in movie.get("spoken_languages", []):
-        cur.execute(
-            """
-            INSERT INTO spoken_languages (iso_639_1, language_name)
-            VALUES (%s, %s) ON CONFLICT DO NOTHING;
-        """,
-            (lang["iso_639_1"], lang["name"]),
-        )
+    languages = movie.get("spoken_languages", [])
+    dimension_cache.prefetch(
+        cur, "spoken_languages", [l["iso_639_1"] for l in languages]
+    )
+
+    for lang in languages:
+        if not dimension_cache.known(cur, "spoken_languages", lang["iso_639_1"]):
+            cur.execute(
+                """
+                INSERT INTO spoken_languages (iso_639_1, language_name)
+                VALUES (%s, %s) ON CONFLICT DO NOTHING;
+            """,
+                (lang["iso_639_1"], lang["name"]),
+            )
+            dimension_cache.remember(cur, "spoken_languages", lang["iso_639_1"])
 
         cur.execute(
             """
@@ -448,14 +470,19 @@ def insert_spoken_languages(cur, movie_id, movie):
 
 
 def insert_production_countries(cur, movie_id, movie):
-    for country in movie.get("production_countries", []):
-        cur.execute(
-            """
-            INSERT INTO countries (iso_3166_1, country_name)
-            VALUES (%s, %s) ON CONFLICT DO NOTHING;
-        """,
-            (country["iso_3166_1"], country["name"]),
-        )
+    countries = movie.get("production_countries", [])
+    dimension_cache.prefetch(cur, "countries", [c["iso_3166_1"] for c in countries])
+
+    for country in countries:
+        if not dimension_cache.known(cur, "countries", country["iso_3166_1"]):
+            cur.execute(
+                """
+                INSERT INTO countries (iso_3166_1, country_name)
+                VALUES (%s, %s) ON CONFLICT DO NOTHING;
+            """,
+                (country["iso_3166_1"], country["name"]),
+            )
+            dimension_cache.remember(cur, "countries", country["iso_3166_1"])
 
         cur.execute(
             """
@@ -501,21 +528,26 @@ def insert_production_countries(cur, movie_id, movie):
 
 
 def insert_cast(cur, movie_id, movie):
-    for cast in movie.get("credits", {}).get("cast", []):
-        cur.execute(
-            """
-            INSERT INTO people (person_id, name, gender, profile_path, known_for_department, popularity)
-            VALUES (%s, %s, %s, %s, %s, %s) ON CONFLICT DO NOTHING;
-        """,
-            (
-                cast["id"],
-                cast["name"],
-                cast["gender"],
-                cast.get("profile_path"),
-                cast.get("known_for_department"),
-                cast.get("popularity"),
-            ),
-        )
+    cast_list = movie.get("credits", {}).get("cast", [])
+    dimension_cache.prefetch(cur, "people", [p["id"] for p in cast_list])
+
+    for cast in cast_list:
+        if not dimension_cache.known(cur, "people", cast["id"]):
+            cur.execute(
+                """
+                INSERT INTO people (person_id, name, gender, profile_path, known_for_department, popularity)
+                VALUES (%s, %s, %s, %s, %s, %s) ON CONFLICT DO NOTHING;
+            """,
+                (
+                    cast["id"],
+                    cast["name"],
+                    cast["gender"],
+                    cast.get("profile_path"),
+                    cast.get("known_for_department"),
+                    cast.get("popularity"),
+                ),
+            )
+            dimension_cache.remember(cur, "people", cast["id"])
 
         cur.execute(
             """
@@ -560,21 +592,26 @@ def insert_cast(cur, movie_id, movie):
 
 
 def insert_crew(cur, movie_id, movie):
-    for crew in movie.get("credits", {}).get("crew", []):
-        cur.execute(
-            """
-            INSERT INTO people (person_id, name, gender, profile_path, known_for_department, popularity)
-            VALUES (%s, %s, %s, %s, %s, %s) ON CONFLICT DO NOTHING;
-        """,
-            (
-                crew["id"],
-                crew["name"],
-                crew["gender"],
-                crew.get("profile_path"),
-                crew.get("known_for_department"),
-                crew.get("popularity"),
-            ),
-        )
+    crew_list = movie.get("credits", {}).get("crew", [])
+    dimension_cache.prefetch(cur, "people", [p["id"] for p in crew_list])
+
+    for crew in crew_list:
+        if not dimension_cache.known(cur, "people", crew["id"]):
+            cur.execute(
+                """
+                INSERT INTO people (person_id, name, gender, profile_path, known_for_department, popularity)
+                VALUES (%s, %s, %s, %s, %s, %s) ON CONFLICT DO NOTHING;
+            """,
+                (
+                    crew["id"],
+                    crew["name"],
+                    crew["gender"],
+                    crew.get("profile_path"),
+                    crew.get("known_for_department"),
+                    crew.get("popularity"),
+                ),
+            )
+            dimension_cache.remember(cur, "people", crew["id"])
 
         cur.execute(
             """
@@ -1,5 +1,6 @@
 from datetime import datetime, date
 from db.logger import log_update
+from uploader import dimension_cache
 from utils import parse_date
 from utils.logging import safe_json_context
 import requests
@@ -316,22 +317,25 @@ def ensure_person_exists(cur, person):
         print(f"⚠️ Invalid person payload: {person}")
         return
 
-    cur.execute("SELECT 1 FROM people WHERE person_id = %s;", (person_id,))
-    if not cur.fetchone():
-        print(f"🧑 Adding person '{name}' to people table")
-        cur.execute(
-            """
-            INSERT INTO people (person_id, name, profile_path, popularity, last_updated)
-            VALUES (%s, %s, %s, %s, CURRENT_TIMESTAMP)
-            ON CONFLICT DO NOTHING;
-        """,
-            (
-                person_id,
-                name,
-                person.get("profile_path"),
-                float(person.get("popularity", 0)),
-            ),
-        )
+    if dimension_cache.known(cur, "people", person_id):
+        return
+
+    cur.execute(
+        """
+        INSERT INTO people (person_id, name, profile_path, popularity, last_updated)
+        VALUES (%s, %s, %s, %s, CURRENT_TIMESTAMP)
+        ON CONFLICT DO NOTHING;
+    """,
+        (
+            person_id,
+            name,
+            person.get("profile_path"),
+            float(person.get("popularity", 0)),
+        ),
+    )
+    if cur.rowcount:
+        print(f"🧑 Added person '{name}' to people table")
+    dimension_cache.remember(cur, "people", person_id)
 
 
 def insert_or_update_series_data(conn, series, tmdb_api_key):
@@ -373,12 +377,14 @@ def insert_or_update_series_data(conn, series, tmdb_api_key):
             sync_series_episodes(cur, series_id, series)
 
         conn.commit()
+        dimension_cache.confirm(conn)
         print(f"✅ Series ID {series_id} processed successfully.")
 
     except Exception as e:
         print(f"❌ Failed to insert/update series_id={series_id}: {e}")
         traceback.print_exc()
         conn.rollback()
+        dimension_cache.discard(conn)
 
 
 def normalize_series_payload(series):
@@ -425,6 +431,7 @@ def normalize_series_payload(series):
 
 def insert_series_cast(cur, series_id, series):
     cast_list = series.get("aggregate_credits", {}).get("cast", [])
+    dimension_cache.prefetch(cur, "people", [c.get("id") for c in cast_list])
 
     for cast in cast_list:
         ensure_person_exists(cur, cast)
@@ -494,6 +501,8 @@ def insert_series_crew(cur, series_id, series):
     if not crew_list:
         return
 
+    dimension_cache.prefetch(cur, "people", [c.get("id") for c in crew_list])
+
     for crew in crew_list:
         ensure_person_exists(cur, crew)
 
@@ -564,6 +573,7 @@ def insert_series_crew(cur, series_id, series):
 
 def insert_series_genres(cur, series_id, series):
     genres = series.get("genres", [])
+    dimension_cache.prefetch(cur, "genres", [g.get("id") for g in genres])
 
     for genre in genres:
         genre_id = genre.get("id")
@@ -574,14 +584,16 @@ def insert_series_genres(cur, series_id, series):
             continue
 
         # Ensure genre exists in the genres table
-        cur.execute(
-            """
-            INSERT INTO genres (genre_id, genre_name)
-            VALUES (%s, %s)
-            ON CONFLICT (genre_id) DO NOTHING;
-            """,
-            (genre_id, genre_name),
-        )
+        if not dimension_cache.known(cur, "genres", genre_id):
+            cur.execute(
+                """
+                INSERT INTO genres (genre_id, genre_name)
+                VALUES (%s, %s)
+                ON CONFLICT (genre_id) DO NOTHING;
+                """,
+                (genre_id, genre_name),
+            )
+            dimension_cache.remember(cur, "genres", genre_id)
 
         # Link genre to series if not already linked
         cur.execute(
@@ -623,19 +635,26 @@ def insert_series_genres(cur, series_id, series):
 
 
 def insert_series_companies(cur, series_id, series):
-    for company in series.get("production_companies", []):
-        cur.execute(
-            """
-            INSERT INTO production_companies (company_id, company_name, logo_path, origin_country)
-            VALUES (%s, %s, %s, %s) ON CONFLICT DO NOTHING;
-        """,
-            (
-                company["id"],
-                company["name"],
-                company.get("logo_path"),
-                company.get("origin_country"),
-            ),
-        )
+    companies = series.get("production_companies", [])
+    dimension_cache.prefetch(
+        cur, "production_companies", [c["id"] for c in companies]
+    )
+
+    for company in companies:
+        if not dimension_cache.known(cur, "production_companies", company["id"]):
+            cur.execute(
+                """
+                INSERT INTO production_companies (company_id, company_name, logo_path, origin_country)
+                VALUES (%s, %s, %s, %s) ON CONFLICT DO NOTHING;
+            """,
+                (
+                    company["id"],
+                    company["name"],
+                    company.get("logo_path"),
+                    company.get("origin_country"),
+                ),
+            )
+            dimension_cache.remember(cur, "production_companies", company["id"])
 
         cur.execute(
             """
@@ -678,14 +697,21 @@ def insert_series_companies(cur, series_id, series):
 
 
 def insert_series_languages(cur, series_id, series):
-    for lang in series.get("spoken_languages", []):
-        cur.execute(
-            """
-            INSERT INTO spoken_languages (iso_639_1, language_name)
-            VALUES (%s, %s) ON CONFLICT DO NOTHING;
-        """,
-            (lang["iso_639_1"], lang["name"]),
-        )
+    languages = series.get("spoken_languages", [])
+    dimension_cache.prefetch(
+        cur, "spoken_languages", [l["iso_639_1"] for l in languages]
+    )
+
+    for lang in languages:
+        if not dimension_cache.known(cur, "spoken_languages", lang["iso_639_1"]):
+            cur.execute(
+                """
+                INSERT INTO spoken_languages (iso_639_1, language_name)
+                VALUES (%s, %s) ON CONFLICT DO NOTHING;
+            """,
+                (lang["iso_639_1"], lang["name"]),
+            )
+            dimension_cache.remember(cur, "spoken_languages", lang["iso_639_1"])
 
         cur.execute(
             """
@@ -728,18 +754,23 @@ def insert_series_languages(cur, series_id, series):
 
 
 def insert_series_countries(cur, series_id, series):
-    for country_code in series.get("origin_country", []):
+    country_codes = series.get("origin_country", [])
+    dimension_cache.prefetch(cur, "countries", country_codes)
+
+    for country_code in country_codes:
         if not country_code:
             continue
 
         # Insert country code only (name may not be available)
-        cur.execute(
-            """
-            INSERT INTO countries (iso_3166_1)
-            VALUES (%s) ON CONFLICT DO NOTHING;
-            """,
-            (country_code,),
-        )
+        if not dimension_cache.known(cur, "countries", country_code):
+            cur.execute(
+                """
+                INSERT INTO countries (iso_3166_1)
+                VALUES (%s) ON CONFLICT DO NOTHING;
+                """,
+                (country_code,),
+            )
+            dimension_cache.remember(cur, "countries", country_code)
 
         cur.execute(
             """
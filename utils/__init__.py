@@ -1,2 +1,2 @@
-from .utils import parse_date
+from .utils import format_local, parse_date
 from .logging import safe_json_context
\ No newline at end of file
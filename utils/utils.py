@@ -1,6 +1,7 @@
 # shmdb_uploader/utils/utils.py
 
-from datetime import datetime
+from datetime import date, datetime
+from zoneinfo import ZoneInfo
 
 def parse_date(date_str):
     """
@@ -13,3 +14,21 @@ def parse_date(date_str):
         except ValueError:
             return None
     return date_str
+
+
+def format_local(dt, fmt="%d %b %Y, %H:%M"):
+    """
+    Formats a datetime, date or ISO string in Europe/London time.
+    Returns "Unknown" for anything it can't interpret.
+    """
+    if isinstance(dt, str):
+        try:
+            dt = datetime.fromisoformat(dt)
+        except ValueError:
+            return "Unknown"
+    elif isinstance(dt, date) and not isinstance(dt, datetime):
+        dt = datetime.combine(dt, datetime.min.time())
+    elif not isinstance(dt, datetime):
+        return "Unknown"
+
+    return dt.astimezone(ZoneInfo("Europe/London")).strftime(fmt)
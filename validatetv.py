@@ -1,5 +1,5 @@
 import psycopg2
-from db.connection import get_connection
+from db.connection import get_connection, release_connection
 
 def validate_episode_ids(episode_ids, output_path="missing_episode_ids.txt"):
     conn = get_connection()
@@ -11,7 +11,7 @@ def validate_episode_ids(episode_ids, output_path="missing_episode_ids.txt"):
             if not cur.fetchone():
                 missing_ids.append(eid)
 
-    conn.close()
+    release_connection(conn)
 
     if missing_ids:
         print(f"❌ Missing {len(missing_ids)} episode IDs. Writing to {output_path}...")
@@ -1,46 +1,81 @@
 # ─── Standard Library Imports ────────────────────────────────────────────────
+import asyncio
+import json
 import os
 import sys
-from datetime import datetime, timedelta, date
-from zoneinfo import ZoneInfo
+import time
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
 
 # ─── Third-Party Imports ─────────────────────────────────────────────────────
-from psycopg2.extras import RealDictCursor
 import requests
 from typing import Dict
+import anyio
 from dotenv import load_dotenv
-from fastapi import FastAPI, Request, APIRouter, Form
-from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi import FastAPI, Request, APIRouter, Depends, Form
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import (
+    HTMLResponse,
+    JSONResponse,
+    RedirectResponse,
+    StreamingResponse,
+)
 from fastapi.templating import Jinja2Templates
-import traceback
 
 # ─── Internal Project Imports ────────────────────────────────────────────────
-from config.settings import TMDB_API_KEY
-from db.connection import get_connection
+from config.settings import (
+    NEWS_REFRESH,
+    RELEASE_CALENDAR_REFRESH,
+    STATS_REFRESH,
+    SYNC_PROGRESS_POLL_SECONDS,
+    TITLE_INDEX_ENABLED,
+    TITLE_PAGE_CACHE_TTL,
+    TMDB_API_KEY,
+    WEB_THREADPOOL_SIZE,
+)
+from db.aio import async_pool_stats, close_async_pool
+from db.connection import close_pool, pool_stats
 from db.helpers import dict_cursor
+from db.session import DBSession
 from services.missing_titles import get_titles_missing
-from uploader.media_processor import process_media_upload
-from tmdb.person_api import search_person_tmdb
-from tmdb.search_api import search_tmdb_combined, get_tmdb_data
-from services.logs import (
-    get_previous_log_timestamp,
-    fetch_new_update_logs,
-    filter_changes,
-)
+from tmdb.search_api import search_tmdb_combined
 from services import stats
-from services.releases import get_cinema_releases, get_tv_releases
-from services.titles import (
-    get_title_by_id,
-    get_series_by_id,
-    get_tv_titles_missing,
+from services import api as feeds
+from services import freshness
+from services.dashboard import get_dashboard_counters
+from services.people import search_people
+from services.release_calendar import get_release_calendar
+from services.search import search_titles
+from services.title_index import start_listener as start_title_index_listener
+from services.title_index import title_index
+from services.titles import get_tv_titles_missing
+from services.aio import sync_jobs as aio_sync_jobs
+from services.aio import title_page as aio_title_page
+from services.aio import versions as aio_versions
+from services.diagnostics import wrap_query_async
+from services.title_page import page_cache as title_page_cache
+from services.sync_jobs import (
+    PRIORITY_INTERACTIVE,
+    enqueue_titles,
+    get_batch,
+    parse_id_list,
+)
+from services.versions import get_library_version
+from utils import format_local
+from web_ui.background import start_background_tasks, stop_background_tasks
+from web_ui.dependencies import get_db
+from web_ui.fragment_cache import FragmentCacheExtension, fragment_cache
+from web_ui.http_cache import (
+    VersionedStaticFiles,
+    not_modified,
+    page_etag,
+    static_url,
+    with_validators,
 )
-from services.diagnostics import wrap_query
 from web_ui.filters import datetimeformat, ago, to_timezone, timestamp_color
 from routes import news
-from services.news_fetcher import get_all_news
-from services.title_utils import get_related_titles
-from services.actors import get_cast_for_title, get_crew_for_title
+from services.news_fetcher import get_latest_news
 
 # ─── Environment Setup ───────────────────────────────────────────────────────
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
@@ -48,8 +83,39 @@ load_dotenv()
 APP_ENV = os.getenv("APP_ENV", "unknown")
 
 # ─── FastAPI App Initialization ──────────────────────────────────────────────
-app = FastAPI()
-app.mount("/static", StaticFiles(directory="static"), name="static")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Sync routes and blocking calls share this limiter; threads beyond the
+    # DB pool size simply queue for a connection.
+    anyio.to_thread.current_default_thread_limiter().total_tokens = (
+        WEB_THREADPOOL_SIZE
+    )
+    listener = start_title_index_listener() if TITLE_INDEX_ENABLED else None
+    tasks = start_background_tasks(
+        release_calendar=RELEASE_CALENDAR_REFRESH,
+        stats=STATS_REFRESH,
+        dashboard=STATS_REFRESH,
+        news=NEWS_REFRESH,
+    )
+    yield
+    await stop_background_tasks(tasks)
+    if listener is not None:
+        listener[1].set()
+    await close_async_pool()
+    close_pool()
+
+
+app = FastAPI(lifespan=lifespan)
+app.mount("/static", VersionedStaticFiles(directory="static"), name="static")
+
+
+@app.middleware("http")
+async def db_server_timing(request: Request, call_next):
+    response = await call_next(request)
+    session = getattr(request.state, "db", None)
+    if session is not None:
+        response.headers.append("Server-Timing", session.server_timing())
+    return response
 
 
 def currency(value, symbol="$"):
@@ -66,6 +132,8 @@ templates.env.filters["ago"] = ago
 templates.env.filters["to_timezone"] = to_timezone
 templates.env.filters["timestamp_color"] = timestamp_color
 templates.env.filters["currency"] = currency
+templates.env.globals["static_url"] = static_url
+templates.env.add_extension(FragmentCacheExtension)
 
 # ─── Router Setup ────────────────────────────────────────────────────────────
 router = APIRouter()
@@ -73,25 +141,73 @@ app.include_router(news.router)
 
 
 @app.get("/missing/{field}", name="missing_movies")
-async def missing_movies(request: Request, field: str):
-    movies = get_titles_missing(field)
-    return templates.TemplateResponse(
+def missing_movies(
+    request: Request, field: str, after: int = 0, db: DBSession = Depends(get_db)
+):
+    updated, _ = get_library_version(db)
+    etag = page_etag("missing_movies", field, after, updated)
+    cached = not_modified(request, etag, updated)
+    if cached is not None:
+        return cached
+
+    try:
+        movies, next_after = get_titles_missing(field, db, after=after)
+    except ValueError as e:
+        return HTMLResponse(content=str(e), status_code=404)
+    response = templates.TemplateResponse(
         "partials/missing_movies.html",
-        {"request": request, "field": field, "movies": movies},
+        {
+            "request": request,
+            "field": field,
+            "movies": movies,
+            "next_after": next_after,
+        },
     )
+    return with_validators(response, etag, updated)
 
 
 @app.get("/missing_tv/{field}", name="missing_tv")
-async def missing_tv(request: Request, field: str):
-    titles = get_tv_titles_missing(field)
-    return templates.TemplateResponse(
+def missing_tv(
+    request: Request, field: str, after: int = 0, db: DBSession = Depends(get_db)
+):
+    _, updated = get_library_version(db)
+    etag = page_etag("missing_tv", field, after, updated)
+    cached = not_modified(request, etag, updated)
+    if cached is not None:
+        return cached
+
+    try:
+        titles, next_after = get_tv_titles_missing(field, db, after=after)
+    except ValueError as e:
+        return HTMLResponse(content=str(e), status_code=404)
+    response = templates.TemplateResponse(
         "partials/missing_tv.html",
-        {"request": request, "field": field, "titles": titles},
+        {
+            "request": request,
+            "field": field,
+            "titles": titles,
+            "next_after": next_after,
+        },
     )
+    return with_validators(response, etag, updated)
 
 
 @router.get("/db_search", response_class=HTMLResponse)
-async def db_search_form(request: Request):
+def db_search_form(
+    request: Request, query: str = "", db: DBSession = Depends(get_db)
+):
+    # The search box in the top bar submits here as ?query=
+    if query.strip():
+        versions = get_library_version(db)
+        updated = max((v for v in versions if v is not None), default=None)
+        etag = page_etag("db_search", query.strip(), *versions)
+        cached = not_modified(request, etag, updated)
+        if cached is not None:
+            return cached
+        return with_validators(
+            render_db_search(request, query, "", "", db), etag, updated
+        )
+
     return templates.TemplateResponse(
         "db_search.html",
         {"request": request, "now": datetime.now(), "app_env": APP_ENV},
@@ -99,308 +215,230 @@ async def db_search_form(request: Request):
 
 
 @router.post("/db_search", response_class=HTMLResponse)
-async def db_search_results(
-    request: Request, title: str = Form(""), year: str = Form("")
+def db_search_results(
+    request: Request,
+    title: str = Form(""),
+    year: str = Form(""),
+    cursor: str = Form(""),
+    db: DBSession = Depends(get_db),
 ):
-    title = title.strip()
-    year = year.strip()
-
-    params = []
-    movie_conditions = []
-    series_conditions = []
+    return render_db_search(request, title, year, cursor, db)
 
-    if title:
-        movie_conditions.append("m.movie_title ILIKE %s")
-        series_conditions.append("s.series_name ILIKE %s")
-        params.extend([f"%{title}%", f"%{title}%"])
 
-    if year:
-        try:
-            year_int = int(year)
-            movie_conditions.append("mm.release_year = %s")
-            series_conditions.append("DATE_PART('year', s.first_air_date) = %s")
-            params.extend([year_int, year_int])
-        except ValueError:
-            return templates.TemplateResponse(
-                "db_search_results.html",
-                {
-                    "request": request,
-                    "results": [],
-                    "query": {"title": title, "year": year},
-                    "error": "Year must be a valid number",
-                    "now": datetime.now(),
-                },
-            )
-
-    movie_where = " AND ".join(movie_conditions) if movie_conditions else "TRUE"
-    series_where = " AND ".join(series_conditions) if series_conditions else "TRUE"
-
-    query = f"""
-        SELECT m.movie_id AS id, m.movie_title AS title, mm.release_year, 'movie' AS type
-        FROM movies m
-        JOIN movie_metadata mm ON mm.movie_id = m.movie_id
-        WHERE {movie_where}
+def render_db_search(request: Request, title: str, year: str, cursor: str, db):
+    title = title.strip()
+    year = year.strip()
 
-        UNION
+    def render(results, error=None, next_cursor=None):
+        return templates.TemplateResponse(
+            "db_search_results.html",
+            {
+                "request": request,
+                "app_env": APP_ENV,
+                "results": results,
+                "query": {"title": title, "year": year},
+                "error": error,
+                "next_cursor": next_cursor,
+                "now": datetime.now(),
+            },
+        )
 
-        SELECT s.series_id AS id, s.series_name AS title,
-               DATE_PART('year', s.first_air_date) AS release_year, 'tv' AS type
-        FROM series s
-        WHERE {series_where}
-    """
+    try:
+        year_int = int(year) if year else None
+    except ValueError:
+        return render([], error="Year must be a valid number")
 
-    with dict_cursor() as cursor:
-        cursor.execute(query, params)
-        results = cursor.fetchall()
+    try:
+        results, next_cursor = search_titles(
+            title, year=year_int, cursor=cursor or None, conn=db
+        )
+    except ValueError as e:
+        return render([], error=str(e))
 
-    if len(results) == 1:
+    if len(results) == 1 and not cursor:
         return RedirectResponse(
             url=f"/title/{results[0]['type']}/{results[0]['id']}", status_code=303
         )
 
-    return templates.TemplateResponse(
-        "db_search_results.html",
-        {
-            "request": request,
-            "app_env": APP_ENV,
-            "results": results,
-            "query": {"title": title, "year": year},
-            "now": datetime.now(),
-        },
-    )
-
+    return render(results, next_cursor=next_cursor)
 
-@router.get("/title/{title_type}/{title_id}", response_class=HTMLResponse)
-async def title_detail(request: Request, title_type: str, title_id: int):
-    db = get_connection()
 
-    season_map = []
-    series_rating = None
-    personal_rating = None
+@router.get("/api/search")
+def api_search(
+    q: str = "",
+    year: int = None,
+    type: str = None,
+    limit: int = 10,
+    cursor: str = None,
+    db: DBSession = Depends(get_db),
+):
+    """Ranked title search as JSON, for typeahead and scripts."""
+    try:
+        results, next_cursor = search_titles(
+            q, year=year, media_type=type, limit=limit, cursor=cursor, conn=db
+        )
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
 
-    if title_type == "movie":
-        diagnostics = wrap_query("get_title_by_id", lambda: [get_title_by_id(title_id)])
+    return {
+        "results": [{**r, "score": float(r["score"])} for r in results],
+        "next_cursor": next_cursor,
+    }
 
-        with dict_cursor() as cur:
-            cur.execute(
-                """
-                SELECT rating
-                FROM movie_metadata
-                WHERE movie_id = %s
-            """,
-                (title_id,),
-            )
-            result = cur.fetchone()
-            personal_rating = (
-                result["rating"] if result and result["rating"] is not None else None
-            )
 
-    elif title_type == "tv":
-        diagnostics = wrap_query(
-            "get_series_by_id", lambda: [get_series_by_id(title_id)]
-        )
-        title = diagnostics["data"][0] if diagnostics["record_count"] else None
+@router.get("/api/suggest")
+async def api_suggest(q: str = "", type: str = None, limit: int = 10):
+    """Typeahead from the in-memory title index; never queries Postgres."""
+    started = time.perf_counter()
+    results = title_index.suggest(q, limit=max(1, min(limit, 50)), media_type=type)
+    return {
+        "results": results,
+        "ready": title_index.ready,
+        "took_us": round((time.perf_counter() - started) * 1_000_000),
+    }
 
-        with db.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute(
-                """
-                SELECT season_id, season_number, air_date, poster_path, season_name, overview
-                FROM series_seasons
-                WHERE series_id = %s
-                ORDER BY season_number
-            """,
-                (title_id,),
-            )
-            seasons = cur.fetchall()
-
-            season_map = []
-            for season in seasons:
-                cur.execute(
-                    """
-                    SELECT
-                        e.episode_id,
-                        e.episode_number,
-                        e.episode_name,
-                        e.overview,
-                        e.air_date,
-                        m.rating,
-                        m.watched_date
-                    FROM series_episodes e
-                    LEFT JOIN episode_metadata m ON m.episode_id = e.episode_id
-                    WHERE e.season_id = %s
-                    ORDER BY e.episode_number
-                """,
-                    (season["season_id"],),
-                )
-                season["episodes"] = cur.fetchall()
 
-                season["air_date_formatted"] = format_local(
-                    season.get("air_date"), "%-d %B %Y"
-                )
+def json_page(sql, params, fields, limit, cursor):
+    return StreamingResponse(
+        feeds.stream_page(sql, params, fields, limit, cursor=cursor),
+        media_type="application/json",
+    )
 
-                for ep in season["episodes"]:
-                    ep["air_date_formatted"] = format_local(
-                        ep.get("air_date"), "%-d %B %Y"
-                    )
-                    ep["watched_date_formatted"] = format_local(
-                        ep.get("watched_date"), "%-d %B %Y"
-                    )
-
-                dates = [
-                    ep["air_date"] for ep in season["episodes"] if ep.get("air_date")
-                ]
-                if dates:
-                    season["date_from"] = format_local(min(dates), "%-d %B %Y")
-                    season["date_to"] = format_local(max(dates), "%-d %B %Y")
-                else:
-                    season["date_from"] = season["date_to"] = None
-
-                cur.execute(
-                    """
-                    SELECT ROUND(AVG(m.rating)::numeric, 2) AS average_rating
-                    FROM series_episodes e
-                    JOIN episode_metadata m ON m.episode_id = e.episode_id
-                    WHERE e.season_id = %s
-                """,
-                    (season["season_id"],),
-                )
-                season["average_rating"] = cur.fetchone()["average_rating"]
 
-                season_map.append(season)
+@router.get("/api/titles")
+def api_titles(
+    type: str = None,
+    updated_since: datetime = None,
+    fields: str = None,
+    limit: int = feeds.DEFAULT_LIMIT,
+    cursor: str = None,
+):
+    """Movies and series in last_updated order, paged by cursor."""
+    try:
+        columns = feeds.parse_fields(
+            fields, feeds.TITLE_FIELDS["movie"], feeds.TITLE_DEFAULT_FIELDS
+        )
+        sql, params = feeds.titles_query(
+            columns, media_type=type, since=updated_since, cursor=cursor, limit=limit
+        )
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+    return json_page(sql, params, columns, limit, cursor)
+
+
+@router.get("/api/series/{series_id}/episodes")
+def api_series_episodes(
+    series_id: int,
+    fields: str = None,
+    limit: int = feeds.DEFAULT_LIMIT,
+    cursor: str = None,
+    db: DBSession = Depends(get_db),
+):
+    """A series' episodes in season/episode order, paged by cursor."""
+    try:
+        columns = feeds.parse_fields(
+            fields, feeds.EPISODE_FIELDS, feeds.EPISODE_DEFAULT_FIELDS
+        )
+        sql, params = feeds.episodes_query(
+            series_id, columns, cursor=cursor, limit=limit
+        )
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+    if not feeds.series_exists(series_id, conn=db):
+        return JSONResponse({"error": "Series not found"}, status_code=404)
+    return json_page(sql, params, columns, limit, cursor)
+
+
+@router.get("/api/logs")
+def api_logs(
+    content_type: str = None,
+    content_id: int = None,
+    since: datetime = None,
+    fields: str = None,
+    limit: int = feeds.DEFAULT_LIMIT,
+    cursor: str = None,
+):
+    """update_logs oldest first, paged by cursor; poll with the last cursor."""
+    try:
+        columns = feeds.parse_fields(fields, feeds.LOG_FIELDS, feeds.LOG_DEFAULT_FIELDS)
+        sql, params = feeds.logs_query(
+            columns,
+            content_type=content_type,
+            content_id=content_id,
+            since=since,
+            cursor=cursor,
+            limit=limit,
+        )
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+    return json_page(sql, params, columns, limit, cursor)
 
-            cur.execute(
-                """
-                SELECT ROUND(AVG(m.rating)::numeric, 2) AS series_average_rating
-                FROM series_episodes e
-                JOIN episode_metadata m ON m.episode_id = e.episode_id
-                WHERE e.series_id = %s
-            """,
-                (title_id,),
-            )
-            series_rating = cur.fetchone()["series_average_rating"]
 
-    else:
+@router.get("/title/{title_type}/{title_id}", response_class=HTMLResponse)
+async def title_detail(request: Request, title_type: str, title_id: int):
+    if title_type not in ("movie", "tv"):
         return HTMLResponse(content="Invalid title type", status_code=400)
 
-    if title_type == "movie":
-        title = diagnostics["data"][0] if diagnostics["record_count"] else None
+    # Ratings and watch history change without touching last_updated, so
+    # validators also roll over with the page cache's TTL
+    version = await aio_versions.get_title_version(title_type, title_id)
+    etag = None
+    if version is not None:
+        window = int(time.time() // TITLE_PAGE_CACHE_TTL)
+        updated = max(
+            [v for v in version if v is not None] + [window * TITLE_PAGE_CACHE_TTL]
+        )
+        etag = page_etag("title", title_type, title_id, *version, window)
+        cached = not_modified(request, etag, updated)
+        if cached is not None:
+            return cached
+
+    page = {}
 
-    cast = get_cast_for_title(title_id, title_type)
-    crew = get_crew_for_title(title_id, title_type)
-    related_titles = get_related_titles(title_id, title_type)
+    async def load_title():
+        page.update(await aio_title_page.get_title_page(title_type, title_id))
+        return [page["title"]]
 
-    return templates.TemplateResponse(
+    diagnostics = await wrap_query_async("get_title_page", load_title)
+    title = diagnostics["data"][0] if diagnostics["record_count"] else None
+
+    response = templates.TemplateResponse(
         "title_detail.html",
         {
             "request": request,
             "app_env": APP_ENV,
             "title": title,
-            "cast": cast,
-            "crew": crew,
-            "season_map": season_map,
-            "series_rating": series_rating,
+            "cast": page.get("cast", []),
+            "crew": page.get("crew", []),
+            "season_map": page.get("season_map", []),
+            "series_rating": page.get("series_rating"),
             "diagnostics": diagnostics,
-            "personal_rating": personal_rating,
-            "related_titles": related_titles,
+            "personal_rating": page.get("personal_rating"),
+            "related_titles": page.get("related_titles", []),
+            "page_version": page.get("version"),
+            "page_built_at": page.get("built_at"),
             "now": datetime.now(),
         },
     )
-
-
-def get_seasons_for_series(series_id: int):
-    query = """
-        SELECT
-            season_id,
-            season_number,
-            air_date,
-            poster_path,
-            season_name,
-            overview
-        FROM series_seasons
-        WHERE series_id = %s
-        ORDER BY season_number
-    """
-    with dict_cursor() as cursor:
-        cursor.execute(query, (series_id,))
-        return cursor.fetchall()
-
-
-def get_episodes_for_season(season_id: int):
-    query = """
-        SELECT
-            e.episode_id,
-            e.season_id,
-            e.episode_number,
-            e.name,
-            e.overview,
-            e.air_date,
-            m.rating,
-            m.watched_date
-        FROM series_episodes e
-        LEFT JOIN episode_metadata m ON m.episode_id = e.episode_id
-        WHERE e.season_id = %s
-        ORDER BY e.episode_number
-    """
-    db = get_connection()
-    with db.cursor(cursor_factory=RealDictCursor) as cursor:
-        cursor.execute(query, (season_id,))
-        return cursor.fetchall()
-
-
-def get_season_episode_map(series_id: int):
-    seasons = get_seasons_for_series(series_id)
-    for season in seasons:
-        season["episodes"] = get_episodes_for_season(season["season_id"])
-    return seasons
-
-
-def get_average_ratings(series_id: int):
-    db = get_connection()
-    with db.cursor(cursor_factory=RealDictCursor) as cur:
-        cur.execute(
-            """
-            SELECT
-                s.season_id,
-                s.season_number,
-                ROUND(AVG(m.rating)::numeric, 2) AS average_rating
-            FROM series_seasons s
-            JOIN series_episodes e ON e.season_id = s.season_id
-            JOIN episode_metadata m ON m.episode_id = e.episode_id
-            WHERE s.series_id = %s
-            GROUP BY s.season_id, s.season_number
-            ORDER BY s.season_number;
-        """,
-            (series_id,),
-        )
-        season_ratings = cur.fetchall()
-
-        cur.execute(
-            """
-            SELECT ROUND(AVG(m.rating)::numeric, 2) AS average_rating
-            FROM series_episodes e
-            JOIN episode_metadata m ON m.episode_id = e.episode_id
-            WHERE e.series_id = %s
-        """,
-            (series_id,),
-        )
-        series_rating = cur.fetchone()["average_rating"]
-
-    return season_ratings, series_rating
+    if etag is None or title is None:
+        return response
+    return with_validators(response, etag, updated)
 
 
 @app.get("/", response_class=HTMLResponse, name="index")
-async def index(request: Request):
+def index(request: Request, db: DBSession = Depends(get_db)):
     now = datetime.now()
     next_month = (now.replace(day=1) + timedelta(days=32)).replace(day=1)
 
-    current_releases = get_cinema_releases(month=now.month, year=now.year)
-    next_month_releases = get_cinema_releases(
-        month=next_month.month, year=next_month.year
+    # Filled by the background refresh in web_ui/background.py
+    current_releases = get_release_calendar("movie", now.year, now.month, db)
+    next_month_releases = get_release_calendar(
+        "movie", next_month.year, next_month.month, db
     )
-    tv_releases = get_tv_releases(month=now.month, year=now.year)
+    tv_releases = get_release_calendar("tv", now.year, now.month, db)
 
     context = {
-        **get_stats_context(request),
+        **get_stats_context(request, db),
         "app_env": APP_ENV,
         "app_version": "0.1.0",
         "now": now,
@@ -408,32 +446,49 @@ async def index(request: Request):
         "current_releases": current_releases,
         "next_month_releases": next_month_releases,
         "tv_releases": tv_releases,
+        "articles": get_latest_news(conn=db),
     }
 
     return templates.TemplateResponse("index.html", context)
 
 
 @router.get("/statistics", response_class=HTMLResponse, name="statistics")
-async def statistics(request: Request):
-    return templates.TemplateResponse("statistics.html", get_stats_context(request))
+def statistics(request: Request, db: DBSession = Depends(get_db)):
+    return templates.TemplateResponse(
+        "statistics.html", get_stats_context(request, db)
+    )
 
 
 @router.get("/uploader", response_class=HTMLResponse, name="uploader")
-async def uploader(request: Request):
-    return templates.TemplateResponse("uploader.html", get_stats_context(request))
+def uploader(request: Request, db: DBSession = Depends(get_db)):
+    return templates.TemplateResponse("uploader.html", get_stats_context(request, db))
 
 
-@app.get("/news")
-def news_page(request: Request):
-    articles = get_all_news(api_key="pub_000738d4a1274d798638038b9633580c")
+@app.get("/news", response_class=HTMLResponse, name="news")
+def news_page(request: Request, db: DBSession = Depends(get_db)):
+    # Filled by the background refresh in web_ui/background.py
     return templates.TemplateResponse(
-        "news.html", {"request": request, "articles": articles}
+        "news.html",
+        {
+            "request": request,
+            "now": datetime.now(),
+            "articles": get_latest_news(limit=50, conn=db),
+        },
     )
 
-def get_stats_context(request: Request):
-    # Cache stats for the duration of this request to avoid multiple DB calls
+def get_stats_context(request: Request, db=None):
+    # Stats come from the background-refreshed snapshot, read once per request
     if not hasattr(request.state, "stats_blob"):
-        request.state.stats_blob = stats.get_all_stats()
+        (
+            request.state.stats_blob,
+            request.state.stats_refreshed_at,
+            request.state.stats_age_seconds,
+        ) = stats.get_stats_snapshot(db)
+        # Cheap counters are maintained incrementally and always current
+        request.state.stats_blob = {
+            **request.state.stats_blob,
+            **get_dashboard_counters(db),
+        }
 
     stats_blob = request.state.stats_blob
 
@@ -468,6 +523,8 @@ def get_stats_context(request: Request):
         "movies_missing_fields": stats_blob.get("movies_missing_fields"),
         "series_missing_fields": stats_blob.get("series_missing_fields"),
         "freshness": stats_blob.get("freshness"),
+        "stats_refreshed_at": request.state.stats_refreshed_at,
+        "stats_age_seconds": request.state.stats_age_seconds,
 
         # Full blob for anything else the template might reference
         "stats": stats_blob,
@@ -475,41 +532,80 @@ def get_stats_context(request: Request):
 
 app.include_router(router)
 
-def classify_freshness(lastupdated):
-    if not lastupdated:
-        return "stale"
-    now = datetime.utcnow()
-    delta = now - lastupdated
-    if delta <= timedelta(days=7):
+def classify_freshness(bucket):
+    """Badge class for a freshness bucket: the newest is fresh, old/never stale."""
+    if bucket == freshness.BUCKET_NAMES[0]:
         return "fresh"
-    elif delta <= timedelta(days=30):
-        return "moderate"
-    else:
+    if bucket in ("old", "never"):
         return "stale"
+    return "moderate"
+
+
+@app.get("/freshness", response_class=HTMLResponse, name="freshness")
+def freshness_report(
+    request: Request,
+    type: str = None,
+    cursor: str = None,
+    db: DBSession = Depends(get_db),
+):
+    """Titles per freshness bucket, then every title stalest first."""
+    try:
+        titles, next_cursor = freshness.get_stalest_titles(
+            media_type=type or None, cursor=cursor, conn=db
+        )
+    except ValueError as e:
+        return HTMLResponse(content=str(e), status_code=400)
+
+    return templates.TemplateResponse(
+        "freshness.html",
+        {
+            "request": request,
+            "now": datetime.now(),
+            "summary": freshness.get_freshness_summary(db),
+            "buckets": freshness.BUCKET_NAMES,
+            "bucket_hours": dict(freshness.BUCKETS),
+            "titles": titles,
+            "media_type": type or "",
+            "next_cursor": next_cursor,
+        },
+    )
+
+
+@app.get("/freshness.csv", name="freshness_csv")
+def freshness_csv(type: str = None):
+    """The full freshness report as CSV, streamed stalest first."""
+    if type not in (None, "", *freshness.TABLES):
+        return HTMLResponse(content=f"Invalid title type: {type}", status_code=400)
+
+    return StreamingResponse(
+        freshness.stream_freshness_csv(media_type=type or None),
+        media_type="text/csv",
+        headers={"Content-Disposition": 'attachment; filename="freshness.csv"'},
+    )
 
 
 @app.api_route("/search_person", methods=["GET", "POST"], response_class=HTMLResponse)
 async def search_person(request: Request):
-    if request.method == "POST":
-        form = await request.form()
-        name = form.get("person_name")
-        people = search_person_tmdb(name)
-    else:
-        name = request.query_params.get("person_name")
-        people = search_person_tmdb(name) if name else []
+    params = await request.form() if request.method == "POST" else request.query_params
+    name = (params.get("person_name") or "").strip()
+    # Answered from the people/credits tables; TMDb only when asked for
+    tmdb = params.get("tmdb") == "1"
+    people = await run_in_threadpool(search_people, name, tmdb) if name else []
 
     return templates.TemplateResponse(
         "person_results.html",
         {
             "request": request,
             "people": people,
+            "person_name": name,
+            "tmdb": tmdb,
             "now": datetime.now(),
         },
     )
 
 
 @app.post("/tmdb_search", response_class=HTMLResponse)
-async def tmdb_search(request: Request):
+async def tmdb_search(request: Request, db: DBSession = Depends(get_db)):
     form = await request.form()
     tmdb_id = form.get("tmdb_id")
     name = form.get("name")
@@ -520,8 +616,10 @@ async def tmdb_search(request: Request):
             url=f"/upload?tmdb_id={tmdb_id}&media_type={media_type}", status_code=303
         )
 
-    results = search_tmdb_combined(name)
-    annotated_results = annotate_results_with_db_status(results)
+    results = await run_in_threadpool(search_tmdb_combined, name)
+    annotated_results = await run_in_threadpool(
+        annotate_results_with_db_status, results, db
+    )
 
     return templates.TemplateResponse(
         "tmdb_search_results.html",
@@ -529,8 +627,8 @@ async def tmdb_search(request: Request):
     )
 
 
-def annotate_results_with_db_status(results):
-    with dict_cursor() as cur:
+def annotate_results_with_db_status(results, conn=None):
+    with dict_cursor(conn) as cur:
         annotated = []
         for result in results:
             annotated.append(annotate_result(cur, result))
@@ -544,24 +642,30 @@ def annotate_result(cur, result):
     try:
         if media_type == "movie":
             cur.execute(
-                "SELECT last_updated FROM movies WHERE movie_id = %s;", (tmdb_id,)
+                f"SELECT last_updated, {freshness.bucket_sql('last_updated')} AS bucket "
+                "FROM movies WHERE movie_id = %s;",
+                (tmdb_id,),
             )
         elif media_type == "tv":
             cur.execute(
-                "SELECT last_updated FROM series WHERE series_id = %s;", (tmdb_id,)
+                f"SELECT last_updated, {freshness.bucket_sql('last_updated')} AS bucket "
+                "FROM series WHERE series_id = %s;",
+                (tmdb_id,),
             )
         else:
             return {**result, "exists": False, "last_updated": None}
 
         row = cur.fetchone()
         last_updated = row["last_updated"] if row else None
+        bucket = row["bucket"] if row else "never"
 
         return {
             **result,
             "exists": bool(row),
             "last_updated": last_updated,
             "last_updated_local": format_local(last_updated),
-            "freshness": classify_freshness(last_updated),
+            "freshness": classify_freshness(bucket),
+            "freshness_bucket": bucket,
         }
 
     except Exception as e:
@@ -570,62 +674,18 @@ def annotate_result(cur, result):
 
 
 @app.get("/upload", response_class=HTMLResponse)
-async def upload(request: Request, tmdb_id: int, media_type: str):
-    conn = None
-    filtered_changes = []
-    message = ""
-    title = ""
-    content_id = None
-    changes = []
-
-    try:
-        conn = get_connection()
-        previous_max = get_previous_log_timestamp(conn, tmdb_id, media_type)
-        if previous_max is None:
-            print("🧪 No previous log found — defaulting to datetime.min")
-            previous_max = datetime.min
-
-        content_id, base_message = process_media_upload(conn, tmdb_id, media_type)
-
-        if content_id:
-            print("🧪 Forcing log fetch...")
-            changes = fetch_new_update_logs(conn, content_id, media_type, previous_max)
-
-            filtered_changes = filter_changes(changes)
-
-            if filtered_changes:
-                title = filtered_changes[0].get("title") or filtered_changes[0].get(
-                    "movie_title", ""
-                )
-
-            message = (
-                base_message
-                if filtered_changes
-                else f"{base_message} No changes needed — already up-to-date."
-            )
-        else:
-            message = f"{base_message} No movie ID returned — upload may have failed."
-
-    except Exception as e:
-        message = f"❌ Error occurred: {str(e)}"
+def upload(
+    request: Request, tmdb_id: int, media_type: str, db: DBSession = Depends(get_db)
+):
+    if media_type not in ("movie", "tv"):
+        return HTMLResponse(content="❌ Invalid media type selected.", status_code=400)
 
-    finally:
-        if conn:
-            conn.close()
+    batch_id, _ = enqueue_titles(
+        db, [tmdb_id], media_type, priority=PRIORITY_INTERACTIVE
+    )
 
-    return templates.TemplateResponse(
-        "result.html",
-        {
-            "request": request,
-            "message": message,
-            "changes": filtered_changes,
-            "title": title,
-            "content_id": content_id,
-            "media_type": media_type,
-            "upload_status": "Upload complete",
-            "raw_changes": changes,
-            "now": datetime.now(),
-        },
+    return RedirectResponse(
+        url=request.url_for("sync_batch", batch_id=batch_id), status_code=303
     )
 
 
@@ -641,101 +701,180 @@ async def bulk_upload_form(request: Request):
 
 
 @app.post("/bulk-upload", response_class=HTMLResponse)
-async def bulk_upload(
-    request: Request, media_type: str = Form(...), id_list: str = Form(...)
+def bulk_upload(
+    request: Request,
+    media_type: str = Form(...),
+    id_list: str = Form(...),
+    db: DBSession = Depends(get_db),
 ):
-    conn = None
-    grouped_results = []
-    now = datetime.now()
+    if media_type not in ("movie", "tv"):
+        return HTMLResponse(content="❌ Invalid media type selected.", status_code=400)
+
+    ids, invalid = parse_id_list(id_list)
+    for raw in invalid:
+        print(f"⚠️ Ignoring non-numeric TMDb ID: {raw!r}")
+
+    batch_id, _ = enqueue_titles(db, ids, media_type)
+
+    return RedirectResponse(
+        url=request.url_for("sync_batch", batch_id=batch_id), status_code=303
+    )
+
 
+def is_batch_id(batch_id):
+    # Batch ids are UUIDs; anything else would fail the query's ::uuid cast
     try:
-        conn = get_connection()
-        ids = [i.strip() for i in id_list.replace(",", "\n").splitlines() if i.strip()]
-        ids = ids[:100]
-
-        for tmdb_id in ids:
-            try:
-                previous_max = get_previous_log_timestamp(conn, tmdb_id, media_type)
-                if previous_max is None:
-                    previous_max = datetime.min
-
-                content_id, base_message = process_media_upload(
-                    conn, tmdb_id, media_type
-                )
+        uuid.UUID(batch_id)
+    except ValueError:
+        return False
+    return True
 
-                title = ""
-                filtered = []
-                message = ""
-
-                if content_id:
-                    changes = fetch_new_update_logs(
-                        conn, content_id, media_type, previous_max
-                    )
-                    filtered = filter_changes(changes)
-
-                    if filtered:
-                        first = filtered[0]
-                        title = (
-                            first.get("title")
-                            or first.get("movie_title")
-                            or first.get("series_title")
-                            or ""
-                        )
-
-                    if not title:
-                        tmdb_data = get_tmdb_data(tmdb_id, media_type)
-                        title = (
-                            tmdb_data.get("title")
-                            or tmdb_data.get("name")
-                            or "Unknown Title"
-                        )
-
-                    message = (
-                        base_message
-                        if filtered
-                        else f"{base_message} No changes needed — already up-to-date."
-                    )
-                else:
-                    message = (
-                        f"{base_message} No movie ID returned — upload may have failed."
-                    )
-
-                grouped_results.append(
-                    {
-                        "tmdb_id": tmdb_id,
-                        "title": title or "Unknown Title",
-                        "message": message,
-                        "changes": filtered,
-                    }
-                )
 
-            except Exception as e:
-                grouped_results.append(
-                    {
-                        "tmdb_id": tmdb_id,
-                        "title": "Error",
-                        "message": f"❌ Error processing ID {tmdb_id}: {str(e)}",
-                        "changes": [],
-                    }
-                )
-                traceback.print_exc()
+@app.get("/jobs/{batch_id}", response_class=HTMLResponse, name="sync_batch")
+def sync_batch(request: Request, batch_id: str, db: DBSession = Depends(get_db)):
+    if not is_batch_id(batch_id):
+        return HTMLResponse(content="Unknown upload batch", status_code=404)
+
+    batch = get_batch(db, batch_id)
+
+    if batch is None:
+        return HTMLResponse(content="Unknown upload batch", status_code=404)
 
-    finally:
-        if conn:
-            conn.close()
+    results = [describe_job(job) for job in batch["jobs"]]
 
     return templates.TemplateResponse(
         "bulk_result.html",
         {
             "request": request,
-            "results": grouped_results,
-            "media_type": media_type,
-            "upload_status": "Bulk upload complete",
-            "now": now,
+            "results": results,
+            "media_type": batch["media_type"],
+            "upload_status": describe_batch(batch),
+            "refresh": bool(batch["pending"]),
+            "events_url": request.url_for("sync_batch_events", batch_id=batch_id),
+            "now": datetime.now(),
         },
     )
 
 
+@app.get("/jobs/{batch_id}/events", name="sync_batch_events")
+async def sync_batch_events(request: Request, batch_id: str):
+    """
+    Server-Sent Events for a batch: a "job" event with the re-rendered panel
+    whenever a job's status or stage changes, then "done" once nothing is
+    pending.
+    """
+    if not is_batch_id(batch_id) or await aio_sync_jobs.get_batch(batch_id) is None:
+        return HTMLResponse(content="Unknown upload batch", status_code=404)
+
+    job_template = templates.get_template("partials/_sync_job.html")
+
+    def sse(event, data):
+        return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+    async def stream():
+        seen = {}
+        idle = 0.0
+        while not await request.is_disconnected():
+            batch = await aio_sync_jobs.get_batch(batch_id)
+            status = describe_batch(batch)
+
+            for job in batch["jobs"]:
+                state = (job["status"], job["stage"], job["attempts"], job["updated_at"])
+                if seen.get(job["job_id"]) == state:
+                    continue
+                seen[job["job_id"]] = state
+                result = describe_job(job)
+                yield sse(
+                    "job",
+                    {
+                        "job_id": job["job_id"],
+                        "status": job["status"],
+                        "stage": job["stage"],
+                        "changes": len(result["changes"]),
+                        "html": job_template.render(result=result),
+                        "upload_status": status,
+                    },
+                )
+                idle = 0.0
+
+            if not batch["pending"]:
+                yield sse("done", {"upload_status": status})
+                return
+
+            # Comment line, so proxies don't close an idle stream
+            if idle >= 15:
+                yield ": keep-alive\n\n"
+                idle = 0.0
+            await asyncio.sleep(SYNC_PROGRESS_POLL_SECONDS)
+            idle += SYNC_PROGRESS_POLL_SECONDS
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get("/health/db")
+async def db_health():
+    return {
+        "pool": pool_stats(),
+        "async_pool": async_pool_stats(),
+        "title_page_cache": title_page_cache.stats(),
+        "fragment_cache": fragment_cache.stats(),
+        "title_index": title_index.stats(),
+    }
+
+
+STAGE_MESSAGES = {
+    "fetched": "fetched from TMDb, saving",
+    "written": "saved, collecting changes",
+}
+
+
+def describe_batch(batch):
+    total = len(batch["jobs"])
+    if not batch["pending"]:
+        return "Bulk upload complete"
+    return f"⏳ Processing — {total - batch['pending']} of {total} complete"
+
+
+def describe_job(job):
+    """
+    Shapes a sync_jobs row for partials/_sync_job.html.
+    """
+    if job["status"] == "done" and job["result"]:
+        return {**job["result"], "job_id": job["job_id"], "status": job["status"]}
+
+    if job["status"] == "dead":
+        message = (
+            f"❌ Error processing ID {job['tmdb_id']} after {job['attempts']} "
+            f"attempts: {job['last_error']}"
+        )
+    elif job["status"] == "running":
+        stage = STAGE_MESSAGES.get(job.get("stage"), "fetching from TMDb")
+        message = (
+            f"🔄 Syncing — {stage} "
+            f"(attempt {job['attempts']} of {job['max_attempts']})..."
+        )
+    elif job["attempts"]:
+        message = (
+            f"⚠️ Attempt {job['attempts']} failed ({job['last_error']}). "
+            f"Retrying at {format_local(job['run_after'], '%H:%M:%S')}."
+        )
+    else:
+        message = "⏳ Queued"
+
+    return {
+        "job_id": job["job_id"],
+        "status": job["status"],
+        "tmdb_id": job["tmdb_id"],
+        "title": "Error" if job["status"] == "dead" else "",
+        "message": message,
+        "changes": [],
+    }
+
+
 TMDB_BASE = "https://api.themoviedb.org/3"
 
 _movie_genres = None
@@ -771,20 +910,6 @@ def get_english_language_info(movie_id: int) -> Dict:
     return {}
 
 
-def format_local(dt, fmt="%d %b %Y, %H:%M"):
-    if isinstance(dt, str):
-        try:
-            dt = datetime.fromisoformat(dt)
-        except ValueError:
-            return "Unknown"
-    elif isinstance(dt, date) and not isinstance(dt, datetime):
-        dt = datetime.combine(dt, datetime.min.time())
-    elif not isinstance(dt, datetime):
-        return "Unknown"
-
-    return dt.astimezone(ZoneInfo("Europe/London")).strftime(fmt)
-
-
 BASE_URL = "https://api.themoviedb.org/3"
 
 
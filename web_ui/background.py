@@ -0,0 +1,122 @@
+# web_ui/background.py
+"""
+Periodic jobs that run inside the web app, started and stopped by the
+FastAPI lifespan. Blocking work runs in the threadpool so the event loop
+keeps serving requests.
+"""
+
+import asyncio
+import traceback
+
+from starlette.concurrency import run_in_threadpool
+
+from config.settings import (
+    DASHBOARD_COMPACT_INTERVAL,
+    DASHBOARD_RECONCILE_INTERVAL,
+    NEWS_INTERVAL,
+    RELEASE_CALENDAR_INTERVAL,
+    STATS_MAX_AGE,
+)
+from db.connection import get_connection, release_connection
+from services.dashboard import compact_counter_deltas, reconcile_dashboard_counters
+from services.news_fetcher import refresh_news
+from services.release_calendar import refresh_release_calendar
+from services.stats import refresh_if_stale
+
+
+def run_with_connection(job, *args, **kwargs):
+    conn = get_connection()
+    try:
+        return job(conn, *args, **kwargs)
+    finally:
+        release_connection(conn)
+
+
+def refresh_calendar_once(force=False):
+    return run_with_connection(refresh_release_calendar, force=force)
+
+
+def refresh_news_once(force=False):
+    return run_with_connection(refresh_news, force=force)
+
+
+def refresh_stats_once():
+    return run_with_connection(refresh_if_stale)
+
+
+def compact_counters_once():
+    return run_with_connection(compact_counter_deltas)
+
+
+def reconcile_counters_once():
+    drift = run_with_connection(reconcile_dashboard_counters)
+    for d in drift:
+        print(f"⚠️ Dashboard counter {d['metric']}/{d['key']} drifted by {d['drift']:+}")
+    return drift
+
+
+async def run_periodically(name, job, interval, initial_delay=0):
+    await asyncio.sleep(initial_delay)
+    while True:
+        try:
+            await run_in_threadpool(job)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            print(f"❌ Background job {name} failed")
+            traceback.print_exc()
+        await asyncio.sleep(interval)
+
+
+def start_background_tasks(
+    release_calendar=True, stats=True, dashboard=True, news=True
+):
+    tasks = []
+    if release_calendar:
+        tasks.append(
+            asyncio.create_task(
+                run_periodically(
+                    "release_calendar", refresh_calendar_once, RELEASE_CALENDAR_INTERVAL
+                )
+            )
+        )
+    if news:
+        # Only sources older than NEWS_MAX_AGE are polled on each pass
+        tasks.append(
+            asyncio.create_task(
+                run_periodically("news", refresh_news_once, NEWS_INTERVAL)
+            )
+        )
+    if stats:
+        # Check a few times per STATS_MAX_AGE; only a stale snapshot is rebuilt
+        tasks.append(
+            asyncio.create_task(
+                run_periodically("stats", refresh_stats_once, max(STATS_MAX_AGE / 4, 5))
+            )
+        )
+    if dashboard:
+        tasks.append(
+            asyncio.create_task(
+                run_periodically(
+                    "dashboard_compact", compact_counters_once, DASHBOARD_COMPACT_INTERVAL
+                )
+            )
+        )
+        # Full recount; not at startup, the counters were seeded or are current
+        tasks.append(
+            asyncio.create_task(
+                run_periodically(
+                    "dashboard_reconcile",
+                    reconcile_counters_once,
+                    DASHBOARD_RECONCILE_INTERVAL,
+                    initial_delay=DASHBOARD_RECONCILE_INTERVAL,
+                )
+            )
+        )
+    return tasks
+
+
+async def stop_background_tasks(tasks):
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,19 @@
+# web_ui/dependencies.py
+
+from fastapi import Request
+
+from db.session import DBSession
+
+
+def get_db(request: Request):
+    """
+    Request-scoped DB session: at most one pooled connection per request,
+    always returned to the pool when the request finishes. The session is
+    also left on request.state so middleware can report its timings.
+    """
+    session = DBSession()
+    request.state.db = session
+    try:
+        yield session
+    finally:
+        session.close()
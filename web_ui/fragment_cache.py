@@ -0,0 +1,137 @@
+# web_ui/fragment_cache.py
+"""
+Cache for rendered template fragments.
+
+Templates opt in with a {% cache %} block naming the fragment and the
+version of the data it shows:
+
+    {% cache "cast", title.type, title.id, page_version %}
+      {% include "partials/title/_cast_grid.html" %}
+    {% endcache %}
+
+The first argument names the fragment and the rest identify the data
+version, so a fragment is re-rendered only when its data changed. If any
+part is None (no version known) the block is rendered without caching.
+Entries are evicted least-recently-used once their total size passes the
+byte cap.
+"""
+
+import threading
+from collections import OrderedDict
+
+from jinja2 import nodes
+from jinja2.ext import Extension
+
+from config.settings import FRAGMENT_CACHE_MAX_BYTES
+
+
+class FragmentCache:
+    """
+    LRU of rendered fragments, capped by total size in bytes. `listeners`
+    are called as listener(event, name, size) for "hit", "miss", "store"
+    and "evict", for anything that wants to export metrics.
+    """
+
+    def __init__(self, max_bytes=FRAGMENT_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.listeners = []
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+
+    def _notify(self, event, key, size):
+        for listener in self.listeners:
+            listener(event, key[0], size)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        if entry is None:
+            self._notify("miss", key, 0)
+            return None
+        self._notify("hit", key, entry[1])
+        return entry[0]
+
+    def put(self, key, html):
+        size = len(html.encode())
+        if size > self.max_bytes:
+            return
+
+        evicted = []
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size_bytes -= previous[1]
+            self._entries[key] = (html, size)
+            self.size_bytes += size
+            while self.size_bytes > self.max_bytes:
+                old_key, (_, old_size) = self._entries.popitem(last=False)
+                self.size_bytes -= old_size
+                self.evictions += 1
+                evicted.append((old_key, old_size))
+
+        self._notify("store", key, size)
+        for old_key, old_size in evicted:
+            self._notify("evict", old_key, old_size)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size_bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "size_bytes": self.size_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+fragment_cache = FragmentCache()
+
+
+class FragmentCacheExtension(Extension):
+    """Adds {% cache name, version... %} ... {% endcache %} to Jinja."""
+
+    tags = {"cache"}
+
+    def __init__(self, environment):
+        super().__init__(environment)
+        environment.extend(fragment_cache=fragment_cache)
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        parts = [parser.parse_expression()]
+        while parser.stream.skip_if("comma"):
+            parts.append(parser.parse_expression())
+        body = parser.parse_statements(("name:endcache",), drop_needle=True)
+        return nodes.CallBlock(
+            self.call_method("_render", [nodes.List(parts)]), [], [], body
+        ).set_lineno(lineno)
+
+    def _render(self, parts, caller):
+        cache = self.environment.fragment_cache
+        if cache.max_bytes <= 0 or any(part is None for part in parts):
+            return caller()
+
+        key = tuple(parts)
+        html = cache.get(key)
+        if html is None:
+            html = caller()
+            cache.put(key, html)
+        return html
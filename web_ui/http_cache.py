@@ -0,0 +1,124 @@
+# web_ui/http_cache.py
+"""
+Conditional GET for rendered pages and long-lived caching for /static.
+
+Pages compute a validator from services/versions.py before doing any real
+work; if the browser already holds that version it gets a bare 304.
+Static files are linked through static_url(), which appends a content hash
+(?v=...), so they can be cached for a year and still change on deploy.
+"""
+
+import hashlib
+from email.utils import formatdate, parsedate_to_datetime
+from functools import lru_cache
+from pathlib import Path
+
+from fastapi import Request, Response
+from fastapi.staticfiles import StaticFiles
+
+STATIC_DIR = Path("static")
+TEMPLATE_DIR = Path("web_ui/templates")
+
+# Browsers keep the page but must revalidate before showing it again
+PAGE_CACHE_CONTROL = "private, no-cache"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+STATIC_CACHE_CONTROL = "public, max-age=3600"
+
+
+def _tree_digest(*roots):
+    digest = hashlib.sha1()
+    for root in roots:
+        for path in sorted(root.rglob("*")):
+            if path.is_file():
+                digest.update(str(path).encode())
+                digest.update(path.read_bytes())
+    return digest.hexdigest()[:12]
+
+
+# Part of every page ETag, so a deploy that changes templates or assets
+# (and so the hashed URLs in the markup) doesn't leave old pages cached
+ASSET_VERSION = _tree_digest(TEMPLATE_DIR, STATIC_DIR)
+
+
+@lru_cache(maxsize=None)
+def static_hash(path):
+    file = STATIC_DIR / path
+    if not file.is_file():
+        return None
+    return hashlib.sha1(file.read_bytes()).hexdigest()[:10]
+
+
+def static_url(path):
+    """/static URL for `path` with a content hash, for use in templates."""
+    path = path.lstrip("/")
+    version = static_hash(path)
+    return f"/static/{path}?v={version}" if version else f"/static/{path}"
+
+
+def page_etag(*parts):
+    """Weak ETag over the page's version parts and ASSET_VERSION."""
+    digest = hashlib.sha1(repr((ASSET_VERSION,) + parts).encode())
+    return f'W/"{digest.hexdigest()[:20]}"'
+
+
+def _etag_matches(header, etag):
+    if header.strip() == "*":
+        return True
+    # Weak comparison: W/"x" and "x" are the same representation
+    wanted = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == wanted for tag in header.split(","))
+
+
+def not_modified(request: Request, etag, last_modified=None):
+    """
+    A 304 response if the request's validators match, else None.
+    If-None-Match wins over If-Modified-Since when both are sent.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        matched = _etag_matches(if_none_match, etag)
+    elif last_modified is not None and "if-modified-since" in request.headers:
+        try:
+            since = parsedate_to_datetime(request.headers["if-modified-since"])
+            matched = int(last_modified) <= since.timestamp()
+        except (TypeError, ValueError):
+            matched = False
+    else:
+        matched = False
+
+    if not matched:
+        return None
+    response = Response(status_code=304)
+    return with_validators(response, etag, last_modified)
+
+
+def with_validators(response, etag, last_modified=None):
+    response.headers["ETag"] = etag
+    if last_modified is not None:
+        response.headers["Last-Modified"] = formatdate(last_modified, usegmt=True)
+    response.headers["Cache-Control"] = PAGE_CACHE_CONTROL
+    return response
+
+
+class VersionedStaticFiles(StaticFiles):
+    """
+    StaticFiles (which already handles ETag / If-None-Match per file) plus
+    Cache-Control: a year when the URL carries the file's current hash,
+    an hour otherwise.
+    """
+
+    async def get_response(self, path, scope):
+        response = await super().get_response(path, scope)
+        if response.status_code in (200, 304):
+            version = None
+            for pair in scope.get("query_string", b"").decode().split("&"):
+                key, _, value = pair.partition("=")
+                if key == "v":
+                    version = value
+            current = static_hash(path.replace("\\", "/"))
+            response.headers["Cache-Control"] = (
+                IMMUTABLE_CACHE_CONTROL
+                if version and version == current
+                else STATIC_CACHE_CONTROL
+            )
+        return response